@@ -7,7 +7,7 @@ import heapq
 import math
 from collections.abc import Callable, Container, Generator, Iterable, Iterator, Sequence
 from copy import copy, deepcopy
-from itertools import chain
+from itertools import chain, product
 from typing import Any
 
 import numpy as np
@@ -131,6 +131,10 @@ class AnnotationIR:
 
             return shapes[drop_count:]
 
+        def copy_interpolated_shape(shape):
+            # Interpolated shapes can share attributes with each other
+            return dict(shape, attributes=faster_deepcopy(shape["attributes"]))
+
         track = deepcopy(track_)
         segment_shapes = filter_track_shapes(deepcopy(track["shapes"]))
 
@@ -148,9 +152,9 @@ class AnnotationIR:
             if scoped_shapes:
                 last_key = max(shape["frame"] for shape in track["shapes"])
                 if not scoped_shapes[0]["keyframe"]:
-                    segment_shapes.insert(0, scoped_shapes[0])
+                    segment_shapes.insert(0, copy_interpolated_shape(scoped_shapes[0]))
                 if last_key >= stop and scoped_shapes[-1]["points"] != segment_shapes[-1]["points"]:
-                    segment_shapes.append(scoped_shapes[-1])
+                    segment_shapes.append(copy_interpolated_shape(scoped_shapes[-1]))
                 elif (
                     scoped_shapes[-1]["keyframe"]
                     and scoped_shapes[-1]["outside"]
@@ -159,11 +163,11 @@ class AnnotationIR:
                         or scoped_shapes[-1]["frame"] > segment_shapes[-1]["frame"]
                     )
                 ):
-                    segment_shapes.append(scoped_shapes[-1])
+                    segment_shapes.append(copy_interpolated_shape(scoped_shapes[-1]))
                 elif (
                     stop + 1 < len(interpolated_shapes) and interpolated_shapes[stop + 1]["outside"]
                 ):
-                    segment_shapes.append(interpolated_shapes[stop + 1])
+                    segment_shapes.append(copy_interpolated_shape(interpolated_shapes[stop + 1]))
 
             for shape in segment_shapes:
                 shape.pop("keyframe", None)
@@ -183,23 +187,39 @@ class AnnotationIR:
             and (interval["stop"] is None or interval["stop"] <= stop + 1)
         )
 
+    def slice_tracks(self, start: int, stop: int) -> list[dict]:
+        # makes a copy of the tracks clipped to the specified frame interval
+        return self._slice_tracks(self.tracks, start, stop)
+
+    def _slice_tracks(self, tracks: Iterable[dict], start: int, stop: int) -> list[dict]:
+        splitted_tracks = []
+        for t in tracks:
+            if self._is_track_inside(t, start, stop):
+                track = self._slice_track(t, start, stop, self.dimension)
+                if 0 < len(track["shapes"]):
+                    splitted_tracks.append(track)
+
+        return splitted_tracks
+
     def slice(self, start, stop):
         assert not self.is_stream, "Not allowed to slice when streaming"
+        return self._slice(self.tags, self.shapes, self.tracks, start, stop)
+
+    def _slice(
+        self,
+        tags: Iterable[dict],
+        shapes: Iterable[dict],
+        tracks: Iterable[dict],
+        start: int,
+        stop: int,
+    ) -> "AnnotationIR":
         # makes a data copy from specified frame interval
         splitted_data = AnnotationIR(self.dimension)
-        splitted_data.tags = [
-            deepcopy(t) for t in self.tags if self._is_shape_inside(t, start, stop)
-        ]
+        splitted_data.tags = [deepcopy(t) for t in tags if self._is_shape_inside(t, start, stop)]
         splitted_data.shapes = [
-            deepcopy(s) for s in self.shapes if self._is_shape_inside(s, start, stop)
+            deepcopy(s) for s in shapes if self._is_shape_inside(s, start, stop)
         ]
-        splitted_tracks = []
-        for t in self.tracks:
-            if self._is_track_inside(t, start, stop):
-                track = self._slice_track(t, start, stop, self.dimension)
-                if 0 < len(track["shapes"]):
-                    splitted_tracks.append(track)
-        splitted_data.tracks = splitted_tracks
+        splitted_data.tracks = self._slice_tracks(tracks, start, stop)
 
         if self.intervals:
             for interval in self.intervals:
@@ -225,6 +245,87 @@ class AnnotationIR:
         return not isinstance(self.shapes, list)
 
 
+class _FrameRangeIndex:
+    """
+    Finds the objects that can be visible in a frame range by binary search.
+    Each object is described by the inclusive range of frames it can be visible on.
+    """
+
+    def __init__(self, frame_ranges: Sequence[tuple[float, float]]):
+        first_frames = np.array([first for first, _ in frame_ranges], dtype=float)
+        last_frames = np.array([last for _, last in frame_ranges], dtype=float)
+
+        self._order = np.argsort(first_frames, kind="stable")
+        self._first_frames = first_frames[self._order]
+        self._last_frames = last_frames[self._order]
+
+        # Objects starting before the range can be visible in it,
+        # the longest object limits how far back they have to be searched
+        self._max_length = float(np.max(last_frames - first_frames, initial=0))
+
+    def find(self, start: int, stop: int) -> list[int]:
+        """Returns the ordered indices of the objects that can be visible in the frame range"""
+
+        lower = 0
+        if not math.isinf(self._max_length):
+            lower = np.searchsorted(self._first_frames, start - self._max_length, side="left")
+        upper = np.searchsorted(self._first_frames, stop, side="right")
+
+        candidates = self._order[lower:upper][self._last_frames[lower:upper] >= start]
+        return np.sort(candidates).tolist()
+
+
+class AnnotationFrameIndex:
+    """
+    An index for slicing the same annotations into many frame ranges,
+    e.g. into job segments. Each slice is the same as AnnotationIR.slice() returns,
+    but only the annotations near the range are checked.
+    The annotations must not be changed while the index is used.
+    """
+
+    def __init__(self, annotations: AnnotationIR):
+        assert not annotations.is_stream, "Not allowed to index when streaming"
+
+        self._annotations = annotations
+        self._tags = _FrameRangeIndex([(int(t["frame"]),) * 2 for t in annotations.tags])
+        self._shapes = _FrameRangeIndex([(int(s["frame"]),) * 2 for s in annotations.shapes])
+        self._tracks = _FrameRangeIndex(
+            [self._get_track_frame_range(t) for t in annotations.tracks]
+        )
+
+    @staticmethod
+    def _get_track_frame_range(track: dict) -> tuple[float, float]:
+        # Keep in sync with AnnotationIR._is_track_inside()
+        first_frame = math.inf
+        last_frame = -math.inf
+
+        # skeleton tracks are checked by their elements
+        for t in track.get("elements") or [track]:
+            shapes = t["shapes"]
+            if not shapes:
+                continue
+
+            first_frame = min(first_frame, min(shape["frame"] for shape in shapes))
+
+            if shapes[-1]["outside"]:
+                last_frame = max(last_frame, max(shape["frame"] for shape in shapes))
+            else:
+                # the track continues after the last shape
+                last_frame = math.inf
+
+        return first_frame, last_frame
+
+    def slice(self, start: int, stop: int) -> AnnotationIR:
+        annotations = self._annotations
+        return annotations._slice(
+            [annotations.tags[i] for i in self._tags.find(start, stop)],
+            [annotations.shapes[i] for i in self._shapes.find(start, stop)],
+            [annotations.tracks[i] for i in self._tracks.find(start, stop)],
+            start,
+            stop,
+        )
+
+
 class AnnotationManager:
     def __init__(self, data: AnnotationIR, *, dimension: DimensionType):
         self.data = data
@@ -460,6 +561,18 @@ class ObjectManager:
                 # We don't have old objects on the frame. Let's add all new ones.
                 self.objects.extend(int_objects_by_frame[frame])
 
+    def _calc_cost_matrix(
+        self, int_objects: list, old_objects: list, start_frame: int, overlap: int
+    ) -> np.ndarray:
+        cost_matrix = np.empty(shape=(len(int_objects), len(old_objects)), dtype=float)
+        for i, int_obj in enumerate(int_objects):
+            for j, old_obj in enumerate(old_objects):
+                cost_matrix[i][j] = 1 - self._calc_objects_similarity(
+                    int_obj, old_obj, start_frame, overlap, self.dimension
+                )
+
+        return cost_matrix
+
     def _merge_objects_on_one_frame(
         self, int_objects: list, old_objects: list, start_frame: int, overlap: int
     ):
@@ -469,13 +582,8 @@ class ObjectManager:
         new_objects = []
 
         min_cost_thresh = self._get_cost_threshold()
-        cost_matrix = np.empty(shape=(len(int_objects), len(old_objects)), dtype=float)
         # 5.1 Construct cost matrix for the frame.
-        for i, int_obj in enumerate(int_objects):
-            for j, old_obj in enumerate(old_objects):
-                cost_matrix[i][j] = 1 - self._calc_objects_similarity(
-                    int_obj, old_obj, start_frame, overlap, self.dimension
-                )
+        cost_matrix = self._calc_cost_matrix(int_objects, old_objects, start_frame, overlap)
 
         # 6. Find optimal solution using Hungarian algorithm.
         row_ind, col_ind = linear_sum_assignment(cost_matrix)
@@ -636,6 +744,94 @@ class ShapeManager(ObjectManager):
                 )
         return 0
 
+    @staticmethod
+    def _get_bboxes(objects: list[dict]) -> np.ndarray:
+        # returns [[x_min, y_min, x_max, y_max], ...]
+        bboxes = np.empty((len(objects), 4), dtype=float)
+        for i, obj in enumerate(objects):
+            points = np.asarray(obj["points"], dtype=float)
+            xs = points[0::2]
+            ys = points[1::2]
+            bboxes[i] = (xs.min(), ys.min(), xs.max(), ys.max())
+
+        return bboxes
+
+    @staticmethod
+    def _calc_bbox_intersections(bboxes0: np.ndarray, bboxes1: np.ndarray) -> np.ndarray:
+        # returns the matrix of the pairwise intersection areas
+        widths = np.minimum(bboxes0[:, None, 2], bboxes1[None, :, 2]) - np.maximum(
+            bboxes0[:, None, 0], bboxes1[None, :, 0]
+        )
+        heights = np.minimum(bboxes0[:, None, 3], bboxes1[None, :, 3]) - np.maximum(
+            bboxes0[:, None, 1], bboxes1[None, :, 1]
+        )
+        return np.clip(widths, 0, None) * np.clip(heights, 0, None)
+
+    @classmethod
+    def _calc_rectangles_similarity(cls, bboxes0: np.ndarray, bboxes1: np.ndarray) -> np.ndarray:
+        # The same as _calc_objects_similarity() for rectangles, computed for all the pairs at once
+        intersections = cls._calc_bbox_intersections(bboxes0, bboxes1)
+
+        areas0 = (bboxes0[:, 2] - bboxes0[:, 0]) * (bboxes0[:, 3] - bboxes0[:, 1])
+        areas1 = (bboxes1[:, 2] - bboxes1[:, 0]) * (bboxes1[:, 3] - bboxes1[:, 1])
+        unions = areas0[:, None] + areas1[None, :] - intersections
+
+        # empty rectangles are invalid or have zero area, their similarity is 0
+        return np.divide(
+            intersections,
+            unions,
+            out=np.zeros_like(intersections),
+            where=(areas0[:, None] > 0) & (areas1[None, :] > 0),
+        )
+
+    def _calc_cost_matrix(
+        self, int_objects: list, old_objects: list, start_frame: int, overlap: int
+    ) -> np.ndarray:
+        # Dense frames can have hundreds of shapes, so the pairwise comparison with shapely
+        # is avoided where possible. Only the shapes of the same type and label can be similar.
+        cost_matrix = np.ones(shape=(len(int_objects), len(old_objects)), dtype=float)
+
+        old_objects_by_key = {}
+        for j, old_obj in enumerate(old_objects):
+            old_objects_by_key.setdefault((old_obj["type"], old_obj.get("label_id")), []).append(j)
+
+        int_objects_by_key = {}
+        for i, int_obj in enumerate(int_objects):
+            int_objects_by_key.setdefault((int_obj["type"], int_obj.get("label_id")), []).append(i)
+
+        for key, int_indices in int_objects_by_key.items():
+            old_indices = old_objects_by_key.get(key)
+            if not old_indices:
+                continue
+
+            shape_type = key[0]
+            if shape_type == ShapeType.RECTANGLE:
+                similarity = self._calc_rectangles_similarity(
+                    self._get_bboxes([int_objects[i] for i in int_indices]),
+                    self._get_bboxes([old_objects[j] for j in old_indices]),
+                )
+                cost_matrix[np.ix_(int_indices, old_indices)] = 1 - similarity
+            elif shape_type == ShapeType.POLYGON or (
+                shape_type == ShapeType.CUBOID and self.dimension == DimensionType.DIM_3D
+            ):
+                candidate_pairs = product(range(len(int_indices)), range(len(old_indices)))
+                if shape_type == ShapeType.POLYGON:
+                    # polygons can't intersect if their bounding boxes don't intersect
+                    intersections = self._calc_bbox_intersections(
+                        self._get_bboxes([int_objects[i] for i in int_indices]),
+                        self._get_bboxes([old_objects[j] for j in old_indices]),
+                    )
+                    candidate_pairs = zip(*np.nonzero(intersections))
+
+                for i, j in candidate_pairs:
+                    int_obj = int_objects[int_indices[i]]
+                    old_obj = old_objects[old_indices[j]]
+                    cost_matrix[int_indices[i], old_indices[j]] = 1 - self._calc_objects_similarity(
+                        int_obj, old_obj, start_frame, overlap, self.dimension
+                    )
+
+        return cost_matrix
+
     @staticmethod
     def _unite_objects(obj0, obj1):
         # TODO: improve the trivial implementation
@@ -816,9 +1012,12 @@ class TrackManager(ObjectManager):
         # to produce the requested track frames.
         deleted_frames = deleted_frames or []
 
-        def copy_shape(source, frame, points=None, rotation=None):
+        def copy_shape(source, frame, points=None, rotation=None, *, attributes=None):
             copied = source.copy()
-            copied["attributes"] = faster_deepcopy(source["attributes"])
+
+            if attributes is None:
+                attributes = faster_deepcopy(source["attributes"])
+            copied["attributes"] = attributes
 
             copied["keyframe"] = False
             copied["frame"] = frame
@@ -827,16 +1026,27 @@ class TrackManager(ObjectManager):
 
             if points is None:
                 points = copied["points"]
-
-            if isinstance(points, np.ndarray):
+                if not isinstance(points, tuple):
+                    points = points.copy()
+            elif isinstance(points, np.ndarray):
                 points = points.tolist()
-            elif not isinstance(points, tuple):
-                points = points.copy()
 
             copied["points"] = points
 
             return copied
 
+        def get_interpolated_frames(shape0, shape1) -> list[int]:
+            # The frames after end_frame are not included in the results anyway
+            return [
+                frame
+                for frame in range(shape0["frame"] + 1, min(shape1["frame"], end_frame))
+                if included_frames is None or frame in included_frames
+            ]
+
+        def get_interpolation_offsets(shape0, shape1, frames: list[int]) -> np.ndarray:
+            distance = shape1["frame"] - shape0["frame"]
+            return (np.array(frames, dtype=int) - shape0["frame"]) / distance
+
         def find_angle_diff(right_angle, left_angle):
             angle_diff = right_angle - left_angle
             angle_diff = ((angle_diff + 180) % 360) - 180
@@ -848,20 +1058,23 @@ class TrackManager(ObjectManager):
             return angle_diff
 
         def simple_interpolation(shape0, shape1):
-            distance = shape1["frame"] - shape0["frame"]
             diff = np.subtract(shape1["points"], shape0["points"])
 
-            for frame in range(shape0["frame"] + 1, shape1["frame"]):
-                offset = (frame - shape0["frame"]) / distance
-                rotation = (
-                    shape0["rotation"]
-                    + find_angle_diff(shape1["rotation"], shape0["rotation"]) * offset
-                    + 360
-                ) % 360
-                points = shape0["points"] + diff * offset
+            frames = get_interpolated_frames(shape0, shape1)
+            if not frames:
+                return
+
+            # Points on all the frames are computed at once, a row per frame
+            offsets = get_interpolation_offsets(shape0, shape1, frames)
+            points = (shape0["points"] + diff * offsets[:, np.newaxis]).tolist()
+
+            angle_diff = find_angle_diff(shape1["rotation"], shape0["rotation"])
+            attributes = faster_deepcopy(shape0["attributes"])
 
-                if included_frames is None or frame in included_frames:
-                    yield copy_shape(shape0, frame, points, rotation)
+            for frame, offset, frame_points in zip(frames, offsets.tolist(), points):
+                rotation = (shape0["rotation"] + angle_diff * offset + 360) % 360
+
+                yield copy_shape(shape0, frame, frame_points, rotation, attributes=attributes)
 
         def simple_3d_interpolation(shape0, shape1):
             angles = shape0["points"][3:6] + shape1["points"][3:6]
@@ -883,11 +1096,13 @@ class TrackManager(ObjectManager):
             if len(shape0["points"]) == 2 and len(shape1["points"]) == 2:
                 yield from simple_interpolation(shape0, shape1)
             else:
-                for frame in range(shape0["frame"] + 1, shape1["frame"]):
-                    if included_frames is None or frame in included_frames:
-                        yield copy_shape(shape0, frame)
+                attributes = faster_deepcopy(shape0["attributes"])
+                for frame in get_interpolated_frames(shape0, shape1):
+                    yield copy_shape(shape0, frame, attributes=attributes)
 
-        def interpolate_position(left_position, right_position, offset):
+        def interpolate_positions(
+            left_position, right_position, offsets: np.ndarray
+        ) -> list[list[float]]:
             def to_array(points):
                 return np.asarray([[point["x"], point["y"]] for point in points]).flatten()
 
@@ -1058,22 +1273,32 @@ class TrackManager(ObjectManager):
             matching = match_left_right(left_offset_vec, right_offset_vec)
             completed_matching = match_right_left(left_offset_vec, right_offset_vec, matching)
 
-            interpolated_points = []
-            for left_point_index, left_point in enumerate(left_points):
+            # The matching doesn't depend on the offset,
+            # so the matched points are interpolated for all the offsets at once
+            left_indices = []
+            right_indices = []
+            for left_point_index in range(len(left_points)):
                 for right_point_index in completed_matching[left_point_index]:
-                    right_point = right_points[right_point_index]
-                    interpolated_points.append(
-                        {
-                            "x": left_point["x"] + (right_point["x"] - left_point["x"]) * offset,
-                            "y": left_point["y"] + (right_point["y"] - left_point["y"]) * offset,
-                        }
-                    )
+                    left_indices.append(left_point_index)
+                    right_indices.append(right_point_index)
 
-            reducedPoints = reduce_interpolation(
-                interpolated_points, completed_matching, left_points, right_points
+            left_array = np.asarray(left_position["points"]).reshape(-1, 2)[left_indices]
+            right_array = np.asarray(right_position["points"]).reshape(-1, 2)[right_indices]
+            interpolated_arrays = left_array + (right_array - left_array) * offsets.reshape(
+                -1, 1, 1
             )
 
-            return to_array(reducedPoints).tolist()
+            results = []
+            for interpolated_array in interpolated_arrays:
+                interpolated_points = [{"x": x, "y": y} for x, y in interpolated_array]
+
+                reducedPoints = reduce_interpolation(
+                    interpolated_points, completed_matching, left_points, right_points
+                )
+
+                results.append(to_array(reducedPoints).tolist())
+
+            return results
 
         def polyshape_interpolation(shape0, shape1):
             is_polygon = shape0["type"] == ShapeType.POLYGON
@@ -1084,27 +1309,19 @@ class TrackManager(ObjectManager):
                 shape0["points"] = shape0["points"] + shape0["points"][:2]
                 shape1["points"] = shape1["points"] + shape1["points"][:2]
 
-            distance = shape1["frame"] - shape0["frame"]
-
-            def generate_shapes():
-                for frame in range(shape0["frame"] + 1, shape1["frame"]):
-                    offset = (frame - shape0["frame"]) / distance
-                    points = interpolate_position(shape0, shape1, offset)
-
-                    if included_frames is None or frame in included_frames:
-                        yield copy_shape(shape0, frame, points)
-
-            shapes = generate_shapes()
-
-            if is_polygon:
+            frames = get_interpolated_frames(shape0, shape1)
+            if not frames:
+                return
 
-                def remove_extra_point_added(shape):
-                    shape["points"] = shape["points"][:-2]
-                    return shape
+            offsets = get_interpolation_offsets(shape0, shape1, frames)
+            attributes = faster_deepcopy(shape0["attributes"])
 
-                shapes = map(remove_extra_point_added, shapes)
+            for frame, points in zip(frames, interpolate_positions(shape0, shape1, offsets)):
+                if is_polygon:
+                    # Remove the extra point added
+                    points = points[:-2]
 
-            yield from shapes
+                yield copy_shape(shape0, frame, points, attributes=attributes)
 
         def interpolate(shape0, shape1):
             is_same_type = shape0["type"] == shape1["type"]
@@ -1131,8 +1348,9 @@ class TrackManager(ObjectManager):
                 raise NotImplementedError()
 
         def propagate(shape: dict, end_frame, *, included_frames=None):
+            attributes = faster_deepcopy(shape["attributes"])
             yield from (
-                copy_shape(shape, i)
+                copy_shape(shape, i, attributes=attributes)
                 for i in range(shape["frame"] + 1, end_frame)
                 if included_frames is None or i in included_frames
             )
@@ -5,13 +5,15 @@
 
 from __future__ import annotations
 
+import io
 import os.path as osp
 import re
 import sys
-from collections import defaultdict
-from collections.abc import Callable, Generator, Iterable, Iterator, Mapping, Sequence
+import time
+from collections import OrderedDict, defaultdict
+from collections.abc import Callable, Collection, Generator, Iterable, Iterator, Mapping, Sequence
 from datetime import timedelta
-from functools import partial, reduce
+from functools import lru_cache, partial, reduce
 from operator import add
 from pathlib import Path
 from types import SimpleNamespace
@@ -349,7 +351,8 @@ class CommonData(InstanceLabelData):
         self._annotation_ir = annotation_ir
         self._host = host
         self._create_callback = create_callback
-        self._MAX_ANNO_SIZE = 30000
+        self._MAX_ANNO_SIZE = settings.ANNOTATION_IMPORT_BATCH_SIZE
+        self._pending_anno_size = 0
         self._frame_info = {}
         self._frame_mapping: dict[str, int] = {}
         self._frame_step = db_task.data.get_frame_step()
@@ -537,7 +540,8 @@ class CommonData(InstanceLabelData):
             track, 0, self.stop + 1, self._annotation_ir.dimension
         )
         for tracked_shape in tracked_shapes:
-            tracked_shape["attributes"] += track["attributes"]
+            # Attributes can be shared between interpolated shapes, they must not be modified
+            tracked_shape["attributes"] = tracked_shape["attributes"] + track["attributes"]
             tracked_shape["track_id"] = track["track_id"] if self._use_server_track_ids else idx
             tracked_shape["group"] = track["group"]
             tracked_shape["source"] = track["source"]
@@ -816,10 +820,14 @@ class CommonData(InstanceLabelData):
                 shape["points"] = tuple(map(float, points))
                 return
 
-    def _call_callback(self):
-        if self._len() > self._MAX_ANNO_SIZE:
+    def _call_callback(self, added_size: int = 1):
+        # The imported annotations are saved in batches to limit the memory use.
+        # The size is counted incrementally, recounting all the batch annotations is slow.
+        self._pending_anno_size += added_size
+        if self._pending_anno_size > self._MAX_ANNO_SIZE:
             self._create_callback(self._annotation_ir.serialize())
             self._annotation_ir.reset()
+            self._pending_anno_size = 0
 
     def add_tag(self, tag):
         imported_tag = self._import_tag(tag)
@@ -837,7 +845,7 @@ class CommonData(InstanceLabelData):
         imported_track = self._import_track(track)
         if imported_track["label_id"]:
             self._annotation_ir.add_track(imported_track)
-            self._call_callback()
+            self._call_callback(len(imported_track["shapes"]))
 
     def add_interval(self, interval: LabeledInterval):
         imported_interval = self._import_interval(interval)
@@ -849,13 +857,6 @@ class CommonData(InstanceLabelData):
     def data(self):
         return self._annotation_ir
 
-    def _len(self):
-        track_len = 0
-        for track in self._annotation_ir.tracks:
-            track_len += len(track["shapes"])
-
-        return len(self._annotation_ir.tags) + len(self._annotation_ir.shapes) + track_len
-
     @property
     def frame_info(self):
         return self._frame_info
@@ -1452,7 +1453,8 @@ class ProjectData(InstanceLabelData):
             track, 0, task_size, self._annotation_irs[task_id].dimension
         )
         for tracked_shape in tracked_shapes:
-            tracked_shape["attributes"] += track["attributes"]
+            # Attributes can be shared between interpolated shapes, they must not be modified
+            tracked_shape["attributes"] = tracked_shape["attributes"] + track["attributes"]
             tracked_shape["track_id"] = track["track_id"] if self._use_server_track_ids else idx
             tracked_shape["group"] = track["group"]
             tracked_shape["source"] = track["source"]
@@ -1590,7 +1592,7 @@ class ProjectData(InstanceLabelData):
                 else None
             ),
         )
-        task_data._MAX_ANNO_SIZE //= len(self._db_tasks)
+        task_data._MAX_ANNO_SIZE = max(1, task_data._MAX_ANNO_SIZE // len(self._db_tasks))
         task_data.soft_attribute_import = self.soft_attribute_import
         self._tasks_data[task_id] = task_data
 
@@ -1658,6 +1660,9 @@ class ProjectData(InstanceLabelData):
 class MediaSource:
     db_task: Task
 
+    frames: Collection[int] | None = None
+    "The frames expected to be requested. If specified, the frames are read in batches"
+
     @property
     def is_video(self) -> bool:
         return self.db_task.mode == models.TaskMode.INTERPOLATION
@@ -1671,11 +1676,86 @@ class MediaProvider:
         pass
 
 
+class _FrameReader:
+    """
+    Reads the task frames in the frame order, chunk by chunk.
+    The original image files are read directly, if they can be used instead of the frames.
+    The last read frames are kept in a bounded buffer, so the frames requested
+    slightly out of order don't require reading the chunks again.
+    The frames are converted into the output type only when requested,
+    so the frames skipped by the reader are not decoded.
+    """
+
+    def __init__(
+        self,
+        frame_provider: TaskFrameProvider,
+        frames: Collection[int],
+        *,
+        out_type: FrameOutputType,
+        max_buffered_frames: int,
+    ) -> None:
+        self._frame_provider = frame_provider
+        self._out_type = out_type
+        self._max_buffered_frames = max_buffered_frames
+
+        self._original_image_paths: dict[int, Path] = {}
+        if out_type == FrameOutputType.BUFFER:
+            # the original files can be read as is, without reading the chunks
+            self._original_image_paths = frame_provider.get_original_image_paths(frames)
+
+        self._frames = set(frames) - self._original_image_paths.keys()
+
+        self._frame_loaders = frame_provider.get_frame_loaders(
+            self._frames, quality=FrameQuality.ORIGINAL, out_type=out_type
+        )
+        self._last_read_frame = -1
+        self._buffer: OrderedDict[int, Callable[[], Any]] = OrderedDict()
+
+    def get_frame(self, frame_number: int) -> Any:
+        if image_path := self._original_image_paths.get(frame_number):
+            return io.BytesIO(image_path.read_bytes())
+
+        frame_loader = self._buffer.get(frame_number)
+        if frame_loader is None:
+            if frame_number <= self._last_read_frame or frame_number not in self._frames:
+                return self._frame_provider.get_frame(
+                    frame_number, quality=FrameQuality.ORIGINAL, out_type=self._out_type
+                ).data
+
+            frame_loader = self._read_until(frame_number)
+
+        return frame_loader().data
+
+    def _read_until(self, frame_number: int) -> Callable[[], Any]:
+        for read_frame_number, read_frame_loader in self._frame_loaders:
+            self._last_read_frame = read_frame_number
+
+            # the frame can be requested several times, it's converted only once
+            read_frame_loader = lru_cache(maxsize=1)(read_frame_loader)
+
+            self._buffer[read_frame_number] = read_frame_loader
+            if self._max_buffered_frames < len(self._buffer):
+                self._buffer.popitem(last=False)
+
+            if read_frame_number == frame_number:
+                return read_frame_loader
+
+        assert False, f"Frame {frame_number} was not read"
+
+    def close(self) -> None:
+        self._frame_loaders.close()
+        self._buffer.clear()
+
+
 class MediaProvider2D(MediaProvider):
     def __init__(self, sources: dict[int, MediaSource]) -> None:
         super().__init__(sources)
         self._current_source_id = None
         self._frame_provider = None
+        self._frame_readers: dict[FrameOutputType, _FrameReader] = {}
+
+        self._read_frames = 0
+        self._read_time = 0.0
 
     def unload(self) -> None:
         self._unload_source()
@@ -1686,27 +1766,52 @@ class MediaProvider2D(MediaProvider):
         if source.is_video:
 
             def video_frame_loader():
-                self._load_source(source_id, source)
-
                 # optimization for videos: use numpy arrays instead of bytes
                 # some formats or transforms can require image data
-                return self._frame_provider.get_frame(
-                    frame_index, quality=FrameQuality.ORIGINAL, out_type=FrameOutputType.NUMPY_ARRAY
-                ).data
+                return self._read_frame(
+                    source_id, source, frame_index, out_type=FrameOutputType.NUMPY_ARRAY
+                )
 
             return dm.Image.from_numpy(data=video_frame_loader, **image_kwargs)
         else:
 
             def image_loader():
-                self._load_source(source_id, source)
-
                 # for images use encoded data to avoid recoding
-                return self._frame_provider.get_frame(
-                    frame_index, quality=FrameQuality.ORIGINAL, out_type=FrameOutputType.BUFFER
-                ).data.getvalue()
+                return self._read_frame(
+                    source_id, source, frame_index, out_type=FrameOutputType.BUFFER
+                ).getvalue()
 
             return dm.Image.from_bytes(data=image_loader, **image_kwargs)
 
+    def _read_frame(
+        self, source_id: int, source: MediaSource, frame_index: int, *, out_type: FrameOutputType
+    ) -> Any:
+        self._load_source(source_id, source)
+
+        read_start_time = time.perf_counter()
+
+        if source.frames is None:
+            frame = self._frame_provider.get_frame(
+                frame_index, quality=FrameQuality.ORIGINAL, out_type=out_type
+            ).data
+        else:
+            frame_reader = self._frame_readers.get(out_type)
+            if not frame_reader:
+                frame_reader = _FrameReader(
+                    self._frame_provider,
+                    source.frames,
+                    out_type=out_type,
+                    max_buffered_frames=settings.EXPORT_FRAME_BUFFER_SIZE,
+                )
+                self._frame_readers[out_type] = frame_reader
+
+            frame = frame_reader.get_frame(frame_index)
+
+        self._read_time += time.perf_counter() - read_start_time
+        self._read_frames += 1
+
+        return frame
+
     def _load_source(self, source_id: int, source: MediaSource) -> None:
         if self._current_source_id == source_id:
             return
@@ -1716,11 +1821,31 @@ class MediaProvider2D(MediaProvider):
         self._current_source_id = source_id
 
     def _unload_source(self) -> None:
+        if self._current_source_id is not None and self._read_frames:
+            self._log_read_stats()
+
+        for frame_reader in self._frame_readers.values():
+            frame_reader.close()
+        self._frame_readers.clear()
+
         if self._frame_provider:
             self._frame_provider.unload()
             self._frame_provider = None
 
         self._current_source_id = None
+        self._read_frames = 0
+        self._read_time = 0.0
+
+    def _log_read_stats(self) -> None:
+        rq_job = rq.get_current_job()
+        slogger.task[self._current_source_id].info(
+            "{}Read {} frames in {:.2f}s ({:.2f} frames/s)".format(
+                f"[{rq_job.id}] " if rq_job else "",
+                self._read_frames,
+                self._read_time,
+                self._read_frames / self._read_time if self._read_time else 0,
+            )
+        )
 
 
 class MediaProvider3D(MediaProvider):
@@ -1942,8 +2067,22 @@ class CvatDataExtractor(dm.DatasetBase, CVATDataExtractorMixin):
             assert False
 
         if self._dimension == DimensionType.DIM_3D or include_images:
+            frames_per_task = {}
+            if self._dimension == DimensionType.DIM_2D:
+                # allow reading the frames in batches
+                if isinstance(instance_data, ProjectData):
+                    frames_per_task = {
+                        task_data.db_instance.id: task_data.get_included_frames()
+                        for task_data in instance_data.all_task_data
+                    }
+                else:
+                    frames_per_task = {db_tasks[0].id: instance_data.get_included_frames()}
+
             self._media_provider = MEDIA_PROVIDERS_BY_DIMENSION[self._dimension](
-                {task.id: MediaSource(task) for task in db_tasks}
+                {
+                    task.id: MediaSource(task, frames=frames_per_task.get(task.id))
+                    for task in db_tasks
+                }
             )
 
         self._ext_per_task: dict[int, str] = {
@@ -3,13 +3,13 @@
 #
 # SPDX-License-Identifier: MIT
 
-import os
 import os.path as osp
 import zipfile
 from collections import OrderedDict
 from collections.abc import Callable
+from contextlib import closing
 from glob import glob
-from io import BufferedWriter
+from io import BufferedIOBase
 
 from datumaro.components.annotation import (
     AnnotationType,
@@ -39,8 +39,7 @@ from cvat.apps.dataset_manager.bindings import (
     import_dm_annotations,
     match_dm_item,
 )
-from cvat.apps.dataset_manager.util import make_zip_archive
-from cvat.apps.engine.media_io.frame_provider import FrameOutputType, make_frame_provider
+from cvat.apps.engine.media_io.frame_provider import FrameOutputType, TaskFrameProvider
 from cvat.apps.engine.models import FrameQuality, TaskMode
 
 from .registry import dm_env, exporter, importer
@@ -1556,7 +1555,7 @@ def dump_task_or_job_anno(dst_file, instance_data, callback):
     dumper.close_document()
 
 
-def dump_project_anno(dst_file: BufferedWriter, project_data: ProjectData, callback: Callable):
+def dump_project_anno(dst_file: BufferedIOBase, project_data: ProjectData, callback: Callable):
     dumper = create_xml_dumper(dst_file)
     dumper.open_document()
     callback(dumper, project_data)
@@ -1564,65 +1563,74 @@ def dump_project_anno(dst_file: BufferedWriter, project_data: ProjectData, callb
 
 
 def dump_media_files(
-    instance_data: TaskData | JobData, img_dir: str, project_data: ProjectData = None
+    instance_data: TaskData | JobData,
+    archive: zipfile.ZipFile,
+    img_dir: str,
+    project_data: ProjectData = None,
 ):
-    frame_provider = make_frame_provider(instance_data.db_instance)
+    if isinstance(instance_data, JobData):
+        db_task = instance_data.db_instance.segment.task
+    else:
+        db_task = instance_data.db_instance
+
+    frame_provider = TaskFrameProvider(db_task)
 
     ext = ""
     if instance_data.meta[instance_data.META_FIELD]["mode"] == TaskMode.INTERPOLATION:
         ext = frame_provider.VIDEO_FRAME_EXT
 
-    frames = frame_provider.iterate_frames(
-        start_frame=instance_data.start,
-        stop_frame=instance_data.stop,
+    # exclude deleted frames and honeypots
+    included_frames = instance_data.get_included_frames()
+
+    # the original files can be added to the archive as is, without reading the chunks
+    original_image_paths = frame_provider.get_original_image_paths(included_frames)
+    frames = frame_provider.get_frames(
+        included_frames - original_image_paths.keys(),
         quality=FrameQuality.ORIGINAL,
         out_type=FrameOutputType.BUFFER,
     )
-    included_frames = instance_data.get_included_frames()
 
-    for frame_id, frame in zip(instance_data.rel_range, frames):
-        # exclude deleted frames and honeypots
-        if frame_id not in included_frames:
-            continue
-        frame_name = (
-            instance_data.frame_info[frame_id]["path"]
-            if project_data is None
-            else project_data.frame_info[(instance_data.db_instance.id, frame_id)]["path"]
-        )
-        img_path = osp.join(img_dir, frame_name + ext)
-        os.makedirs(osp.dirname(img_path), exist_ok=True)
-        with open(img_path, "wb") as f:
-            f.write(frame.data.getvalue())
+    with closing(frames):
+        for frame_id in sorted(included_frames):
+            frame_name = (
+                instance_data.frame_info[frame_id]["path"]
+                if project_data is None
+                else project_data.frame_info[(instance_data.db_instance.id, frame_id)]["path"]
+            )
+            img_path = osp.join(img_dir, frame_name + ext)
 
+            if image_path := original_image_paths.get(frame_id):
+                archive.write(image_path, img_path)
+            else:
+                _, frame = next(frames)
+                archive.writestr(img_path, frame.data.getvalue())
 
-def _export_task_or_job(dst_file, temp_dir, instance_data, anno_callback, save_images=False):
-    with open(osp.join(temp_dir, "annotations.xml"), "wb") as f:
-        dump_task_or_job_anno(f, instance_data, anno_callback)
 
-    if save_images:
-        dump_media_files(instance_data, osp.join(temp_dir, "images"))
+def _export_task_or_job(dst_file, instance_data, anno_callback, save_images=False):
+    # The entries are written directly into the resulting archive,
+    # so the exported data is not duplicated in a temporary directory
+    with zipfile.ZipFile(dst_file, "w") as archive:
+        with archive.open("annotations.xml", "w", force_zip64=True) as f:
+            dump_task_or_job_anno(f, instance_data, anno_callback)
 
-    make_zip_archive(temp_dir, dst_file)
+        if save_images:
+            dump_media_files(instance_data, archive, "images")
 
 
 def _export_project(
     dst_file: str,
-    temp_dir: str,
     project_data: ProjectData,
     anno_callback: Callable,
     save_images: bool = False,
 ):
-    with open(osp.join(temp_dir, "annotations.xml"), "wb") as f:
-        dump_project_anno(f, project_data, anno_callback)
-
-    if save_images:
-        for task_data in project_data.all_task_data:
-            subset = get_defaulted_subset(task_data.db_instance.subset, project_data.subsets)
-            subset_dir = osp.join(temp_dir, "images", subset)
-            os.makedirs(subset_dir, exist_ok=True)
-            dump_media_files(task_data, subset_dir, project_data)
+    with zipfile.ZipFile(dst_file, "w") as archive:
+        with archive.open("annotations.xml", "w", force_zip64=True) as f:
+            dump_project_anno(f, project_data, anno_callback)
 
-    make_zip_archive(temp_dir, dst_file)
+        if save_images:
+            for task_data in project_data.all_task_data:
+                subset = get_defaulted_subset(task_data.db_instance.subset, project_data.subsets)
+                dump_media_files(task_data, archive, osp.join("images", subset), project_data)
 
 
 @exporter(name="CVAT for video", ext="ZIP", version="1.1")
@@ -1630,7 +1638,6 @@ def _export_video(dst_file, temp_dir, instance_data, save_images=False):
     if isinstance(instance_data, ProjectData):
         _export_project(
             dst_file,
-            temp_dir,
             instance_data,
             anno_callback=dump_as_cvat_interpolation,
             save_images=save_images,
@@ -1638,7 +1645,6 @@ def _export_video(dst_file, temp_dir, instance_data, save_images=False):
     else:
         _export_task_or_job(
             dst_file,
-            temp_dir,
             instance_data,
             anno_callback=dump_as_cvat_interpolation,
             save_images=save_images,
@@ -1650,7 +1656,6 @@ def _export_images(dst_file, temp_dir, instance_data, save_images=False):
     if isinstance(instance_data, ProjectData):
         _export_project(
             dst_file,
-            temp_dir,
             instance_data,
             anno_callback=dump_as_cvat_annotation,
             save_images=save_images,
@@ -1658,7 +1663,6 @@ def _export_images(dst_file, temp_dir, instance_data, save_images=False):
     else:
         _export_task_or_job(
             dst_file,
-            temp_dir,
             instance_data,
             anno_callback=dump_as_cvat_annotation,
             save_images=save_images,
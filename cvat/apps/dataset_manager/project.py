@@ -3,21 +3,36 @@
 #
 # SPDX-License-Identifier: MIT
 
+import hashlib
 import io
-from collections.abc import Callable, Mapping
+import json
+import os
+import os.path as osp
+import shutil
+from collections.abc import Callable, Collection, Iterator, Mapping
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from contextlib import nullcontext
-from typing import Any
+from typing import IO, Any
 
 import rq
 from datumaro.components.errors import DatasetError, DatasetImportError, DatasetNotFoundError
 from django.conf import settings
-from django.db import transaction
+from django.db import connections, transaction
+from django.utils import timezone
 
 from cvat.apps.dataset_manager.task import TaskAnnotation
-from cvat.apps.dataset_manager.util import TmpDirManager, format_import_exception
+from cvat.apps.dataset_manager.util import (
+    ExportCacheManager,
+    LockNotAvailableError,
+    TmpDirManager,
+    extend_export_file_lifetime,
+    format_import_exception,
+    get_export_cache_lock,
+)
 from cvat.apps.engine import models
 from cvat.apps.engine.log import DatasetLogManager
-from cvat.apps.engine.rq import ImportRQMeta
+from cvat.apps.engine.media_io.frame_provider import TaskFrameProvider
+from cvat.apps.engine.rq import ExportRQMeta, ImportRQMeta
 from cvat.apps.engine.serializers import DataSerializer, TaskWriteSerializer
 from cvat.apps.engine.task import initialize_task
 from cvat.apps.engine.utils import av_scan_paths
@@ -42,13 +57,142 @@ def export_project(
     from .formats.registry import make_exporter
 
     project = ProjectAnnotation(project_id)
-    project.init_from_db(streaming=True)
+    project.init_for_export()
 
     exporter = make_exporter(format_name)
     with open(dst_file, "wb") as f:
         project.export(f, exporter, host=server_url, save_images=save_images, temp_dir=temp_dir)
 
 
+def _prepare_task_media(db_task: models.Task, frames: Collection[int]) -> None:
+    frame_provider = TaskFrameProvider(db_task)
+
+    # the original files are exported as is, no chunks are needed for them
+    frames = set(frames) - frame_provider.get_original_image_paths(frames).keys()
+    if frames:
+        frame_provider.prepare_frame_chunks(frames)
+
+
+def _prepare_task_media_in_thread(db_task: models.Task, frames: Collection[int]) -> None:
+    try:
+        _prepare_task_media(db_task, frames)
+    finally:
+        # The function is called in a separate thread, which has its own DB connection
+        connections.close_all()
+
+
+class _TaskAnnotationsFragment:
+    """
+    The task annotations stored in the export cache.
+
+    The fragment is reused by the next project exports while the task is not changed,
+    so only the changed tasks are read from the DB. The annotations are written and read
+    as a stream of JSON lines, to avoid keeping all the shapes of the task in memory.
+    """
+
+    def __init__(self, db_task: models.Task, *, labels_signature: str):
+        self.db_task = db_task
+        self.path = ExportCacheManager.make_annotations_fragment_file_path(
+            instance_type=db_task.__class__.__name__,
+            instance_id=db_task.id,
+            instance_timestamp=timezone.localtime(db_task.updated_date).timestamp(),
+            labels_signature=labels_signature,
+        )
+
+    @staticmethod
+    def _lock(path: str):
+        return get_export_cache_lock(
+            path,
+            ttl=settings.EXPORT_CACHE_LOCK_TTL,
+            acquire_timeout=settings.EXPORT_CACHE_LOCK_ACQUISITION_TIMEOUT,
+        )
+
+    def _read(self, f: IO[str]) -> AnnotationIR:
+        annotation_ir = AnnotationIR(self.db_task.dimension)
+        annotation_ir.data = {**json.loads(f.readline()), "shapes": []}
+
+        def _read_shapes() -> Iterator[dict]:
+            with f:
+                for line in f:
+                    yield json.loads(line)
+
+        annotation_ir.shapes = _read_shapes()
+        return annotation_ir
+
+    def _write(self, annotation_ir: AnnotationIR, f: IO[str]) -> None:
+        json.dump(
+            {
+                "version": annotation_ir.version,
+                "tags": annotation_ir.tags,
+                "tracks": annotation_ir.tracks,
+                "intervals": annotation_ir.intervals,
+            },
+            f,
+        )
+        f.write("\n")
+
+        for shape in annotation_ir.shapes:
+            json.dump(shape, f)
+            f.write("\n")
+
+    def _remove_previous_versions(self) -> None:
+        for path in ExportCacheManager.find_annotations_fragment_files(
+            instance_type=self.db_task.__class__.__name__, instance_id=self.db_task.id
+        ):
+            if path == self.path:
+                continue
+
+            try:
+                with self._lock(path):
+                    # The readers keep the opened files readable after removal
+                    os.remove(path)
+            except (LockNotAvailableError, FileNotFoundError):
+                pass
+
+    def load(self) -> AnnotationIR | None:
+        "Returns the stored annotations, if the fragment is available"
+
+        try:
+            with self._lock(self.path):
+                if not osp.exists(self.path):
+                    return None
+
+                extend_export_file_lifetime(self.path)
+
+                # The file can be removed by the cleanup after the lock is released,
+                # the opened file remains readable
+                f = open(self.path, "r")
+        except LockNotAvailableError:
+            return None
+
+        return self._read(f)
+
+    def save(self, annotation_ir: AnnotationIR) -> AnnotationIR:
+        """
+        Stores the annotations. Returns the same annotations,
+        read back from the fragment if the annotations are streamed.
+        """
+
+        with TmpDirManager.get_tmp_directory_for_export(
+            instance_type=self.db_task.__class__.__name__
+        ) as temp_dir:
+            temp_path = osp.join(temp_dir, "fragment")
+            with open(temp_path, "w") as f:
+                self._write(annotation_ir, f)
+
+            f = open(temp_path, "r")
+
+            try:
+                with self._lock(self.path):
+                    shutil.move(temp_path, self.path)
+            except LockNotAvailableError:
+                pass
+            else:
+                self._remove_previous_versions()
+
+        return self._read(f)
+
+
 class ProjectAnnotation:
     def __init__(self, pk: int):
         self.db_project = models.Project.objects.get(id=pk)
@@ -145,6 +289,88 @@ class ProjectAnnotation:
         for task in self.db_tasks:
             self._init_task_from_db(task.id, streaming=streaming)
 
+    def _get_labels_signature(self) -> str:
+        """
+        Returns a signature of the project labels and attributes.
+        The label changes affect the task annotations, but don't change the task updated date.
+        """
+
+        labels = models.Label.objects.filter(project_id=self.db_project.id).order_by("id")
+        attributes = models.AttributeSpec.objects.filter(
+            label__project_id=self.db_project.id
+        ).order_by("id")
+
+        signature = hashlib.blake2b(digest_size=8)
+        signature.update(repr(list(labels.values_list("id", flat=True))).encode())
+        signature.update(
+            repr(list(attributes.values_list("id", "mutable", "default_value"))).encode()
+        )
+        return signature.hexdigest()
+
+    def init_for_export(self):
+        """
+        Loads the task annotations for export, in the streaming mode.
+        The annotations of the tasks not changed since the previous project export
+        are read from the export cache.
+        """
+
+        self.reset()
+
+        labels_signature = self._get_labels_signature()
+        for db_task in self.db_tasks:
+            fragment = _TaskAnnotationsFragment(db_task, labels_signature=labels_signature)
+            annotation_ir = fragment.load()
+            if annotation_ir is None:
+                self._init_task_from_db(db_task.id, streaming=True)
+                annotation_ir = fragment.save(self.annotation_irs[db_task.id])
+
+            self.annotation_irs[db_task.id] = annotation_ir
+
+    def _prepare_media(self, project_data: ProjectData) -> None:
+        """
+        Prepares the media of all the project tasks before the dataset is exported.
+        The tasks are processed in parallel, so the missing media chunks can be created
+        by several chunk workers at once. The progress is reported in the current RQ job.
+        """
+
+        db_tasks_with_frames = [
+            (task_data.db_instance, task_data.get_included_frames())
+            for task_data in project_data.all_task_data
+        ]
+
+        rq_job = rq.get_current_job()
+
+        def _update_progress(prepared_tasks: int) -> None:
+            if not rq_job:
+                return
+
+            rq_job_meta = ExportRQMeta.for_job(rq_job)
+            rq_job_meta.status = "Task media is being prepared..."
+            rq_job_meta.progress = prepared_tasks / len(db_tasks_with_frames)
+            rq_job_meta.save()
+
+        concurrency = min(settings.PROJECT_EXPORT_CONCURRENCY, len(db_tasks_with_frames))
+        if concurrency <= 1:
+            for prepared_tasks, (db_task, frames) in enumerate(db_tasks_with_frames, start=1):
+                _prepare_task_media(db_task, frames)
+                _update_progress(prepared_tasks)
+
+            return
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            futures = [
+                executor.submit(_prepare_task_media_in_thread, db_task, frames)
+                for db_task, frames in db_tasks_with_frames
+            ]
+
+            try:
+                for prepared_tasks, future in enumerate(as_completed(futures), start=1):
+                    future.result()
+                    _update_progress(prepared_tasks)
+            except BaseException:
+                executor.shutdown(cancel_futures=True)
+                raise
+
     def export(
         self,
         dst_file: io.BufferedWriter,
@@ -158,6 +384,9 @@ class ProjectAnnotation:
             annotation_irs=self.annotation_irs, db_project=self.db_project, host=host
         )
 
+        if options.get("save_images"):
+            self._prepare_media(project_data)
+
         with (
             TmpDirManager.get_tmp_directory_for_export(
                 instance_type=self.db_project.__class__.__name__,
@@ -3,21 +3,30 @@
 #
 # SPDX-License-Identifier: MIT
 
+import gzip
 import io
 import itertools
 from collections import OrderedDict, defaultdict
-from collections.abc import Callable, Generator, Sequence
+from collections.abc import Callable, Collection, Generator, Sequence
 from contextlib import nullcontext
 from copy import deepcopy
+from datetime import datetime, timedelta, timezone
 from enum import Enum
+from typing import NamedTuple
 
 from datumaro.components.errors import DatasetError, DatasetImportError, DatasetNotFoundError
 from django.conf import settings
+from django.core.cache import caches
 from django.db import transaction
+from django.db.models import Exists, Model, OuterRef, Q, Subquery
 from django.db.models.query import Prefetch, QuerySet
 from rest_framework.exceptions import ValidationError
 
-from cvat.apps.dataset_manager.annotation import AnnotationIR, AnnotationManager
+from cvat.apps.dataset_manager.annotation import (
+    AnnotationFrameIndex,
+    AnnotationIR,
+    AnnotationManager,
+)
 from cvat.apps.dataset_manager.bindings import (
     CvatDatasetNotFoundError,
     CvatImportError,
@@ -75,6 +84,161 @@ class AnnotationImportMode(str, Enum):
         return self.value
 
 
+class AnnotationsVersionConflictError(Exception):
+    def __init__(self, current_version: int):
+        super().__init__(
+            "The job annotations have been changed by another request, "
+            f"the current annotations version is {current_version}"
+        )
+        self.current_version = current_version
+
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def get_annotations_version(db_job: models.Job) -> int:
+    """
+    Returns the version of the job annotations.
+    The version is changed each time the job annotations are changed,
+    other job changes don't affect it.
+    """
+
+    # The date is changed on each annotation change, see _set_updated_date().
+    # The job updated date is used for the jobs not changed since the field was added,
+    # it was changed on annotation changes as well.
+    annotations_updated_date = db_job.annotations_updated_date or db_job.updated_date
+    return (annotations_updated_date - _EPOCH) // timedelta(microseconds=1)
+
+
+def _bulk_create_annotations(db_model: type[Model], objs: list[Model]) -> list[Model]:
+    # COPY is considerably faster for big annotation imports on PostgreSQL
+    copy_threshold = settings.ANNOTATION_DB_COPY_THRESHOLD
+    if copy_threshold and copy_threshold <= len(objs):
+        return db_utils.copy_bulk_create(db_model, objs)
+
+    return db_utils.bulk_create(db_model, objs)
+
+
+class JobAnnotationsResponseCache:
+    """
+    Keeps serialized job annotations for repeated annotation requests.
+    The items are keyed by the job id and the annotations version,
+    so the outdated annotations are never returned.
+    """
+
+    _CACHE_NAME = "default"
+    _KEY_PREFIX = "job_annotations"
+
+    GZIP_ENCODING = "gzip"
+
+    @classmethod
+    def _cache(cls):
+        return caches[cls._CACHE_NAME]
+
+    @classmethod
+    def _make_key(cls, job_id: int, version: int) -> str:
+        return f"{cls._KEY_PREFIX}:{job_id}:{version}"
+
+    @classmethod
+    def is_enabled(cls) -> bool:
+        return settings.ANNOTATIONS_RESPONSE_CACHE_TTL > 0
+
+    @classmethod
+    def get(cls, job_id: int, version: int) -> tuple[bytes, str | None] | None:
+        """
+        Returns the cached content and its encoding, if there is an item for this version
+        """
+
+        if not cls.is_enabled():
+            return None
+
+        return cls._cache().get(cls._make_key(job_id, version))
+
+    @classmethod
+    def set(cls, job_id: int, version: int, content: bytes) -> tuple[bytes, str | None]:
+        """
+        Saves the serialized annotations for the version.
+        Returns the stored content and its encoding.
+        """
+
+        encoding = None
+        if settings.ANNOTATIONS_RESPONSE_CACHE_COMPRESSION:
+            content = gzip.compress(content, compresslevel=6)
+            encoding = cls.GZIP_ENCODING
+
+        item = (content, encoding)
+        if cls.is_enabled() and len(content) <= settings.ANNOTATIONS_RESPONSE_CACHE_MAX_ITEM_SIZE:
+            cls._cache().set(
+                cls._make_key(job_id, version),
+                item,
+                timeout=settings.ANNOTATIONS_RESPONSE_CACHE_TTL,
+            )
+
+        return item
+
+    @classmethod
+    def invalidate(cls, job_id: int, version: int) -> None:
+        if not cls.is_enabled():
+            return
+
+        cls._cache().delete(cls._make_key(job_id, version))
+
+
+class _AnnotationTable(NamedTuple):
+    model: type[models.Annotation]
+    attribute_model: type[models.AttributeVal]
+    attribute_fk: str
+    fields: tuple[str, ...]
+    has_parent: bool = False
+
+
+# Annotations of these types can be updated without recreation
+_IN_PLACE_UPDATABLE_TABLES = {
+    "tags": _AnnotationTable(
+        model=models.LabeledImage,
+        attribute_model=models.LabeledImageAttributeVal,
+        attribute_fk="image",
+        fields=("label_id", "frame", "group", "source"),
+    ),
+    "shapes": _AnnotationTable(
+        model=models.LabeledShape,
+        attribute_model=models.LabeledShapeAttributeVal,
+        attribute_fk="shape",
+        fields=(
+            "label_id",
+            "type",
+            "frame",
+            "group",
+            "source",
+            "score",
+            "occluded",
+            "outside",
+            "z_order",
+            "rotation",
+            "points",
+        ),
+        has_parent=True,
+    ),
+    "intervals": _AnnotationTable(
+        model=models.LabeledInterval,
+        attribute_model=models.LabeledIntervalAttributeVal,
+        attribute_fk="interval",
+        fields=("label_id", "start", "stop", "group", "source", "score"),
+    ),
+}
+
+
+class _InPlaceUpdate:
+    "Row changes required to update the existing annotations in place"
+
+    def __init__(self):
+        # (model, updated fields) -> rows
+        self.updated_rows: defaultdict[tuple, list[models.Annotation]] = defaultdict(list)
+        self.updated_attributes: defaultdict[type, list[models.AttributeVal]] = defaultdict(list)
+        self.created_attributes: defaultdict[type, list[models.AttributeVal]] = defaultdict(list)
+        self.deleted_attribute_ids: defaultdict[type, list[int]] = defaultdict(list)
+
+
 def _receive_attributes_from_db(related_manager, foreign_key: str) -> defaultdict[int, list]:
     attributes = defaultdict(list)
     for attr in related_manager.values(
@@ -95,6 +259,64 @@ def _receive_attributes_from_db(related_manager, foreign_key: str) -> defaultdic
     return attributes
 
 
+def _filter_by_frame_range(
+    queryset: QuerySet, frame_field: str, frame_range: tuple[int, int] | None
+) -> QuerySet:
+    if frame_range is None:
+        return queryset
+
+    return queryset.filter(**{f"{frame_field}__range": frame_range})
+
+
+def _filter_tracks_by_stop_frame(
+    queryset: QuerySet, track_field_prefix: str, stop_frame: int | None
+) -> QuerySet:
+    if stop_frame is None:
+        return queryset
+
+    # skeleton elements are selected by the skeleton track
+    return queryset.filter(
+        Q(
+            **{
+                f"{track_field_prefix}parent__isnull": True,
+                f"{track_field_prefix}frame__lte": stop_frame,
+            }
+        )
+        | Q(**{f"{track_field_prefix}parent__frame__lte": stop_frame})
+    )
+
+
+def _get_finished_tracks(tracks: QuerySet, start_frame: int) -> QuerySet:
+    """
+    Returns the tracks that are outside since a frame before the start frame,
+    so they have no visible shapes since this frame. Skeleton tracks are finished
+    when all their elements are finished.
+    """
+
+    last_shapes = models.TrackedShape.objects.filter(track_id=OuterRef("id")).order_by("-frame")
+    finished_tracks = tracks.annotate(
+        last_frame=Subquery(last_shapes.values("frame")[:1]),
+        last_outside=Subquery(last_shapes.values("outside")[:1]),
+    ).filter(last_frame__lt=start_frame, last_outside=True)
+
+    elements = tracks.filter(parent_id=OuterRef("id"))
+    unfinished_elements = elements.exclude(id__in=finished_tracks.values("id"))
+    return tracks.filter(parent__isnull=True).filter(
+        Q(Exists(elements), ~Exists(unfinished_elements))
+        | Q(~Exists(elements), id__in=finished_tracks.values("id"))
+    )
+
+
+def _exclude_finished_tracks(
+    queryset: QuerySet, track_field_prefix: str, finished_tracks: QuerySet
+) -> QuerySet:
+    # skeleton elements are excluded by the skeleton track
+    finished_track_ids = finished_tracks.values("id")
+    return queryset.exclude(**{f"{track_field_prefix}id__in": finished_track_ids}).exclude(
+        **{f"{track_field_prefix}parent__in": finished_track_ids}
+    )
+
+
 def merge_table_rows(rows, keys_for_merge, field_id):
     # It is necessary to keep a stable order of original rows
     # (e.g. for tracked boxes). Otherwise prev_box.frame can be bigger
@@ -382,22 +604,22 @@ class JobAnnotation:
                 if elements or parent_track is None:
                     track["elements"] = elements
 
-            db_tracks = db_utils.bulk_create(models.LabeledTrack, db_tracks)
+            db_tracks = _bulk_create_annotations(models.LabeledTrack, db_tracks)
 
             for db_attr_val in db_track_attr_vals:
                 db_attr_val.track_id = db_tracks[db_attr_val.track_id].id
 
-            db_utils.bulk_create(models.LabeledTrackAttributeVal, db_track_attr_vals)
+            _bulk_create_annotations(models.LabeledTrackAttributeVal, db_track_attr_vals)
 
             for db_shape in db_shapes:
                 db_shape.track_id = db_tracks[db_shape.track_id].id
 
-            db_shapes = db_utils.bulk_create(models.TrackedShape, db_shapes)
+            db_shapes = _bulk_create_annotations(models.TrackedShape, db_shapes)
 
             for db_attr_val in db_shape_attr_vals:
                 db_attr_val.shape_id = db_shapes[db_attr_val.shape_id].id
 
-            db_utils.bulk_create(models.TrackedShapeAttributeVal, db_shape_attr_vals)
+            _bulk_create_annotations(models.TrackedShapeAttributeVal, db_shape_attr_vals)
 
             shape_idx = 0
             for track, db_track in zip(tracks, db_tracks):
@@ -439,12 +661,12 @@ class JobAnnotation:
                 if shape_elements or parent_shape is None:
                     shape["elements"] = shape_elements
 
-            db_shapes = db_utils.bulk_create(models.LabeledShape, db_shapes)
+            db_shapes = _bulk_create_annotations(models.LabeledShape, db_shapes)
 
             for db_attr_val in db_attr_vals:
                 db_attr_val.shape_id = db_shapes[db_attr_val.shape_id].id
 
-            db_utils.bulk_create(models.LabeledShapeAttributeVal, db_attr_vals)
+            _bulk_create_annotations(models.LabeledShapeAttributeVal, db_attr_vals)
 
             for shape, db_shape in zip(shapes, db_shapes):
                 shape["id"] = db_shape.id
@@ -524,10 +746,253 @@ class JobAnnotation:
 
         self.ir_data.intervals = intervals
 
+    def _get_db_rows_for_update(
+        self, table: _AnnotationTable, ids: Sequence[int], *, by_parent: bool = False
+    ) -> dict[int, dict]:
+        id_field = "parent_id" if by_parent else "id"
+        fields = ["id", *table.fields]
+        if table.has_parent:
+            fields.append("parent_id")
+
+        rows = {}
+        for ids_chunk in take_by(ids, chunk_size=1000):
+            for row in table.model.objects.filter(
+                job_id=self.db_job.id, **{f"{id_field}__in": ids_chunk}
+            ).values(*fields):
+                rows[row["id"]] = row
+
+        return rows
+
+    def _get_db_attributes_for_update(
+        self, table: _AnnotationTable, ids: Sequence[int]
+    ) -> defaultdict[int, list[dict]]:
+        fk_field = f"{table.attribute_fk}_id"
+
+        attributes = defaultdict(list)
+        for ids_chunk in take_by(ids, chunk_size=1000):
+            for attr in table.attribute_model.objects.filter(
+                **{f"{fk_field}__in": ids_chunk}
+            ).values("id", "spec_id", "value", fk_field):
+                attributes[attr[fk_field]].append(attr)
+
+        return attributes
+
+    def _can_update_in_place(self, obj: dict, table: _AnnotationTable) -> bool:
+        return obj.get("id") is not None and obj.keys() <= {
+            "id",
+            "attributes",
+            "elements",
+            *table.fields,
+        }
+
+    def _plan_object_update(
+        self,
+        obj: dict,
+        db_row: dict,
+        db_attributes: list[dict],
+        *,
+        table: _AnnotationTable,
+        update: _InPlaceUpdate,
+    ) -> bool:
+        values = {}
+        for field in table.fields:
+            if field in obj:
+                values[field] = obj[field]
+            else:
+                values[field] = table.model._meta.get_field(field).get_default()
+
+        self._validate_label_for_existence(values["label_id"])
+
+        changed_fields = tuple(
+            field
+            for field in table.fields
+            if (
+                list(values[field]) != list(db_row[field])
+                if field == "points"
+                else values[field] != db_row[field]
+            )
+        )
+        if changed_fields:
+            row_values = {field: db_row[field] for field in table.fields}
+            row_values.update(values)
+            if table.has_parent:
+                row_values["parent_id"] = db_row["parent_id"]
+
+            update.updated_rows[(table.model, changed_fields)].append(
+                table.model(id=obj["id"], job_id=self.db_job.id, **row_values)
+            )
+
+        attributes = obj.get("attributes", [])
+        for attr in attributes:
+            self._validate_attribute_for_existence(dotdict(attr), values["label_id"], "all")
+
+        def make_db_attribute(attr: dict, **kwargs) -> models.AttributeVal:
+            return table.attribute_model(
+                spec_id=attr["spec_id"],
+                value=attr["value"],
+                job_id=self.db_job.id,
+                **{f"{table.attribute_fk}_id": obj["id"]},
+                **kwargs,
+            )
+
+        input_values = {attr["spec_id"]: attr["value"] for attr in attributes}
+        db_attrs_by_spec = {db_attr["spec_id"]: db_attr for db_attr in db_attributes}
+        if len(input_values) != len(attributes) or len(db_attrs_by_spec) != len(db_attributes):
+            # Repeated attributes can't be matched, so they are replaced
+            if sorted((a["spec_id"], a["value"]) for a in attributes) == sorted(
+                (a["spec_id"], a["value"]) for a in db_attributes
+            ):
+                return bool(changed_fields)
+
+            update.deleted_attribute_ids[table.attribute_model].extend(
+                db_attr["id"] for db_attr in db_attributes
+            )
+            update.created_attributes[table.attribute_model].extend(
+                make_db_attribute(attr) for attr in attributes
+            )
+            return True
+
+        has_changed_attributes = False
+        for spec_id, value in input_values.items():
+            db_attr = db_attrs_by_spec.get(spec_id)
+            if db_attr is None:
+                update.created_attributes[table.attribute_model].append(
+                    make_db_attribute({"spec_id": spec_id, "value": value})
+                )
+                has_changed_attributes = True
+            elif db_attr["value"] != value:
+                update.updated_attributes[table.attribute_model].append(
+                    make_db_attribute({"spec_id": spec_id, "value": value}, id=db_attr["id"])
+                )
+                has_changed_attributes = True
+
+        for spec_id, db_attr in db_attrs_by_spec.items():
+            if spec_id not in input_values:
+                update.deleted_attribute_ids[table.attribute_model].append(db_attr["id"])
+                has_changed_attributes = True
+
+        return bool(changed_fields) or has_changed_attributes
+
+    def _plan_in_place_update(self, data: AnnotationIR) -> tuple[_InPlaceUpdate, dict, dict]:
+        """
+        Finds the input annotations, which can be updated without recreation.
+        These are the tags, shapes and intervals, which exist in the job and keep
+        the same skeleton elements. Only the changed rows and attribute values
+        of such annotations are updated. Tracks are always recreated, because
+        their shapes are synchronized with the track frame on saving.
+
+        Returns the planned row changes, the changed annotations
+        and the annotations, which have to be recreated.
+        """
+
+        update = _InPlaceUpdate()
+        changed_data = {"version": data.version, "tracks": data.tracks}
+        recreated_data = {"version": data.version, "tracks": data.tracks}
+
+        for kind, table in _IN_PLACE_UPDATABLE_TABLES.items():
+            objects = data[kind]
+            changed_data[kind] = []
+            recreated_data[kind] = []
+
+            candidates = [obj for obj in objects if self._can_update_in_place(obj, table)]
+            db_rows = self._get_db_rows_for_update(table, [obj["id"] for obj in candidates])
+            db_elements = defaultdict(dict)
+            if table.has_parent:
+                for db_element in self._get_db_rows_for_update(
+                    table, list(db_rows), by_parent=True
+                ).values():
+                    db_elements[db_element["parent_id"]][db_element["id"]] = db_element
+
+            def can_update_elements(obj: dict) -> bool:
+                elements = obj.get("elements", [])
+                return all(
+                    self._can_update_in_place(element, table) and not element.get("elements")
+                    for element in elements
+                ) and {element["id"] for element in elements} == set(db_elements[obj["id"]])
+
+            updated_objects = []
+            updated_object_ids = set()
+            for obj in objects:
+                db_row = db_rows.get(obj.get("id"))
+                if (
+                    db_row is not None
+                    and obj["id"] not in updated_object_ids
+                    and (not table.has_parent or db_row["parent_id"] is None)
+                    and self._can_update_in_place(obj, table)
+                    and can_update_elements(obj)
+                ):
+                    updated_objects.append(obj)
+                    updated_object_ids.add(obj["id"])
+                else:
+                    recreated_data[kind].append(obj)
+
+            updated_ids = [obj["id"] for obj in updated_objects]
+            updated_ids.extend(
+                element["id"] for obj in updated_objects for element in obj.get("elements", [])
+            )
+            db_attributes = self._get_db_attributes_for_update(table, updated_ids)
+
+            for obj in updated_objects:
+                is_changed = self._plan_object_update(
+                    obj, db_rows[obj["id"]], db_attributes[obj["id"]], table=table, update=update
+                )
+
+                for element in obj.get("elements", []):
+                    is_changed |= self._plan_object_update(
+                        element,
+                        db_elements[obj["id"]][element["id"]],
+                        db_attributes[element["id"]],
+                        table=table,
+                        update=update,
+                    )
+
+                if is_changed:
+                    changed_data[kind].append(obj)
+
+            changed_data[kind].extend(recreated_data[kind])
+
+        return update, changed_data, recreated_data
+
+    def _apply_in_place_update(self, update: _InPlaceUpdate):
+        # The django generated bulk_update() query is too slow, so we use bulk_create() instead
+        for (model, fields), rows in update.updated_rows.items():
+            db_utils.bulk_create(
+                model, rows, update_conflicts=True, update_fields=fields, unique_fields=["id"]
+            )
+
+        for model, ids in update.deleted_attribute_ids.items():
+            for ids_chunk in take_by(ids, chunk_size=1000):
+                model.objects.filter(id__in=ids_chunk).delete()
+
+        for model, attributes in update.updated_attributes.items():
+            db_utils.bulk_create(
+                model,
+                attributes,
+                update_conflicts=True,
+                update_fields=["value"],
+                unique_fields=["id"],
+            )
+
+        for model, attributes in update.created_attributes.items():
+            db_utils.bulk_create(model, attributes)
+
     def _set_updated_date(self):
         db_task = self.db_job.segment.task
         with transaction.atomic():
-            self.db_job.touch()
+            # Changes the annotations version, the cached annotations become outdated
+            outdated_version = get_annotations_version(self.db_job)
+            transaction.on_commit(
+                lambda: JobAnnotationsResponseCache.invalidate(self.db_job.id, outdated_version)
+            )
+
+            # The version must be changed, even if the clock has not advanced
+            # since the previous change or it's behind the clock of another server
+            self.db_job.annotations_updated_date = max(
+                datetime.now(timezone.utc),
+                (self.db_job.annotations_updated_date or self.db_job.updated_date)
+                + timedelta(microseconds=1),
+            )
+            self.db_job.save(update_fields=["annotations_updated_date", "updated_date"])
             db_task.touch()
             if db_project := db_task.project:
                 db_project.touch()
@@ -552,6 +1017,8 @@ class JobAnnotation:
         if not self._data_is_empty(self.data):
             self._set_updated_date()
 
+        self._init_version_from_db()
+
     def put(self, data):
         data = self._validate_input_annotations(data)
 
@@ -566,18 +1033,33 @@ class JobAnnotation:
         if not deleted_data_is_empty or not self._data_is_empty(self.data):
             self._set_updated_date()
 
+        self._init_version_from_db()
+
     def update(self, data):
         data = self._validate_input_annotations(data)
 
+        in_place_update, changed_data, recreated_data = self._plan_in_place_update(data)
+
         # in case with "update" must be called prior any annotations in database changes
-        # as this annotations are used to count removed/added shapes
-        handle_annotations_change(self.db_job, data.data, "update")
-        self._delete(data)
-        self._create(data)
+        # as this annotations are used to count removed/added shapes.
+        # The annotations without changes are not reported.
+        handle_annotations_change(self.db_job, changed_data, "update")
+        self._apply_in_place_update(in_place_update)
+        self._delete(recreated_data)
+        self._create(recreated_data)
 
-        if not self._data_is_empty(self.data):
+        # keep the input order of annotations in the result
+        for kind in _IN_PLACE_UPDATABLE_TABLES:
+            self.ir_data[kind] = data[kind]
+
+        for shape in self.ir_data.shapes:
+            shape.setdefault("elements", [])
+
+        if not self._data_is_empty(changed_data):
             self._set_updated_date()
 
+        self._init_version_from_db()
+
     def _validate_input_annotations(self, data: AnnotationIR | dict) -> AnnotationIR:
         db_task = self.db_job.segment.task
         return _validate_input_annotations(
@@ -685,6 +1167,8 @@ class JobAnnotation:
         if not self._data_is_empty(deleted_data):
             self._set_updated_date()
 
+        deleted_data["version"] = get_annotations_version(self.db_job)
+
         handle_annotations_change(self.db_job, deleted_data, "delete")
         return deleted_data
 
@@ -702,10 +1186,11 @@ class JobAnnotation:
                     )
                 )
 
-    def _init_tags_from_db(self):
+    def _init_tags_from_db(self, *, frame_range: tuple[int, int] | None = None):
         db_tags = [
             dotdict(row)
-            for row in self.db_job.labeledimage_set.values(
+            for row in _filter_by_frame_range(self.db_job.labeledimage_set, "frame", frame_range)
+            .values(
                 "id",
                 "frame",
                 "label_id",
@@ -717,7 +1202,9 @@ class JobAnnotation:
         ]
 
         labeledimage_attributes = _receive_attributes_from_db(
-            self.db_job.labeledimageattributeval_set,
+            _filter_by_frame_range(
+                self.db_job.labeledimageattributeval_set, "image__frame", frame_range
+            ),
             "image_id",
         )
 
@@ -730,10 +1217,14 @@ class JobAnnotation:
         serializer = serializers.LabeledImageSerializerFromDB(db_tags, many=True)
         self.ir_data.tags = serializer.data
 
-    def _init_shapes_from_db(self, *, streaming: bool = False):
+    def _init_shapes_from_db(
+        self, *, streaming: bool = False, frame_range: tuple[int, int] | None = None
+    ):
+        # skeleton elements are always on the frame of the skeleton
         db_shapes = (
             dotdict(row)
-            for row in self.db_job.labeledshape_set.values(
+            for row in _filter_by_frame_range(self.db_job.labeledshape_set, "frame", frame_range)
+            .values(
                 "id",
                 "label_id",
                 "type",
@@ -753,7 +1244,9 @@ class JobAnnotation:
         )
 
         labeledshape_attributes = _receive_attributes_from_db(
-            self.db_job.labeledshapeattributeval_set,
+            _filter_by_frame_range(
+                self.db_job.labeledshapeattributeval_set, "shape__frame", frame_range
+            ),
             "shape_id",
         )
 
@@ -808,10 +1301,29 @@ class JobAnnotation:
         else:
             self.ir_data.shapes = list(generate_shapes())
 
-    def _init_tracks_from_db(self):
+    def _init_tracks_from_db(
+        self, *, start_frame: int | None = None, stop_frame: int | None = None
+    ):
+        """
+        Reads the tracks starting before the stop frame, if specified.
+        If the start frame is specified, the tracks finished before this frame are skipped.
+        """
+
+        def _filter_tracks(queryset: QuerySet, track_field_prefix: str) -> QuerySet:
+            queryset = _filter_tracks_by_stop_frame(queryset, track_field_prefix, stop_frame)
+            if start_frame is not None:
+                queryset = _exclude_finished_tracks(
+                    queryset,
+                    track_field_prefix,
+                    _get_finished_tracks(self.db_job.labeledtrack_set.all(), start_frame),
+                )
+
+            return queryset
+
         db_tracks = [
             dotdict(row)
-            for row in self.db_job.labeledtrack_set.values(
+            for row in _filter_tracks(self.db_job.labeledtrack_set, "")
+            .values(
                 "id",
                 "frame",
                 "label_id",
@@ -854,11 +1366,11 @@ class JobAnnotation:
                 tracks_by_id[track_id].shapes.append(dotdict(db_shape))
 
         labeledtrack_attributes = _receive_attributes_from_db(
-            self.db_job.labeledtrackattributeval_set,
+            _filter_tracks(self.db_job.labeledtrackattributeval_set, "track__"),
             "track_id",
         )
         trackedshape_attributes = _receive_attributes_from_db(
-            self.db_job.trackedshapeattributeval_set,
+            _filter_tracks(self.db_job.trackedshapeattributeval_set, "shape__track__"),
             "shape_id",
         )
 
@@ -901,10 +1413,11 @@ class JobAnnotation:
         serializer = serializers.LabeledTrackSerializerFromDB(list(tracks.values()), many=True)
         self.ir_data.tracks = serializer.data
 
-    def _init_intervals_from_db(self):
+    def _init_intervals_from_db(self, *, frame_range: tuple[int, int] | None = None):
         db_intervals = (
             dotdict(row)
-            for row in self.db_job.labeledinterval_set.values(
+            for row in _filter_by_frame_range(self.db_job.labeledinterval_set, "start", frame_range)
+            .values(
                 "id",
                 "label_id",
                 "start",
@@ -918,7 +1431,9 @@ class JobAnnotation:
         )
 
         db_attributes = _receive_attributes_from_db(
-            self.db_job.labeledintervalattributeval_set,
+            _filter_by_frame_range(
+                self.db_job.labeledintervalattributeval_set, "interval__start", frame_range
+            ),
             "interval_id",
         )
 
@@ -946,15 +1461,39 @@ class JobAnnotation:
         self.ir_data.intervals = list(generate_annotations())
 
     def _init_version_from_db(self):
-        self.ir_data.version = 0  # FIXME: should be removed in the future
+        self.ir_data.version = get_annotations_version(self.db_job)
 
-    def init_from_db(self, *, streaming: bool = False):
-        self._init_tags_from_db()
-        self._init_shapes_from_db(streaming=streaming)
-        self._init_tracks_from_db()
-        self._init_intervals_from_db()
+    def init_from_db(
+        self,
+        *,
+        streaming: bool = False,
+        frame_range: tuple[int, int] | None = None,
+        slice_tracks: bool = True,
+    ):
+        """
+        Reads the job annotations from the DB.
+
+        If frame_range is specified, only the annotations on the frames
+        in this inclusive range are read. Intervals are selected by their start frame.
+        Tracks are clipped to the range, the same way as in AnnotationIR.slice().
+        If slice_tracks is False, all the tracks starting before the range end are returned as is,
+        including the tracks finished before the range start, as they can be merged
+        with the tracks of the overlapping jobs.
+        """
+
+        self._init_tags_from_db(frame_range=frame_range)
+        self._init_shapes_from_db(streaming=streaming, frame_range=frame_range)
+        self._init_tracks_from_db(
+            # the tracks finished before the range are removed by slicing anyway
+            start_frame=frame_range[0] if frame_range and slice_tracks else None,
+            stop_frame=frame_range[1] if frame_range else None,
+        )
+        self._init_intervals_from_db(frame_range=frame_range)
         self._init_version_from_db()
 
+        if frame_range is not None and slice_tracks:
+            self.ir_data.tracks = self.ir_data.slice_tracks(*frame_range)
+
     @property
     def data(self):
         return self.ir_data.data
@@ -1054,12 +1593,13 @@ class TaskAnnotation:
 
         splitted_data = {}
         jobs = {}
+        frame_index = AnnotationFrameIndex(data)
         for db_job in self.db_jobs:
             jid = db_job.id
             start = db_job.segment.start_frame
             stop = db_job.segment.stop_frame
             jobs[jid] = {"start": start, "stop": stop}
-            splitted_data[jid] = (data.slice(start, stop), db_job)
+            splitted_data[jid] = (frame_index.slice(start, stop), db_job)
 
         for jid, (job_data, db_job) in splitted_data.items():
             data = AnnotationIR(self.db_task.dimension)
@@ -1182,7 +1722,15 @@ class TaskAnnotation:
             for db_job in self.db_jobs:
                 delete_job_data(db_job.id, db_job=db_job)
 
-    def init_from_db(self, *, streaming: bool = False):
+    def init_from_db(self, *, streaming: bool = False, frame_range: tuple[int, int] | None = None):
+        """
+        Reads the task annotations from the DB.
+
+        If frame_range is specified, only the annotations on the frames
+        in this inclusive range are read, the same way as in JobAnnotation.
+        Only the jobs intersecting the range are read.
+        """
+
         self.reset()
 
         db_jobs = self.db_jobs
@@ -1195,13 +1743,28 @@ class TaskAnnotation:
             ):
                 continue
 
+            if frame_range is not None and not (
+                db_job.segment.start_frame <= frame_range[1]
+                and frame_range[0] <= db_job.segment.stop_frame
+            ):
+                # the version is computed for the whole task
+                self.ir_data.version = max(self.ir_data.version, get_annotations_version(db_job))
+                continue
+
             annotation = JobAnnotation(db_job.id, db_job=db_job)
-            annotation.init_from_db(streaming=streaming)
+            # Tracks from overlapping jobs are merged by their shapes in the overlap,
+            # so they are clipped after merging
+            annotation.init_from_db(
+                streaming=streaming, frame_range=frame_range, slice_tracks=False
+            )
             if annotation.ir_data.version > self.ir_data.version:
                 self.ir_data.version = annotation.ir_data.version
 
             self._merge_data(annotation.ir_data, start_frame=db_job.segment.start_frame)
 
+        if frame_range is not None:
+            self.ir_data.tracks = self.ir_data.slice_tracks(*frame_range)
+
     def export(
         self,
         dst_file: io.BufferedWriter,
@@ -1271,16 +1834,39 @@ class TaskAnnotation:
 
 @silk_profile(name="GET job data")
 @transaction.atomic
-def get_job_data(pk, *, streaming: bool = False):
+def get_job_data(pk, *, streaming: bool = False, frame_range: tuple[int, int] | None = None):
     annotation = JobAnnotation(pk)
-    annotation.init_from_db(streaming=streaming)
+    annotation.init_from_db(streaming=streaming, frame_range=frame_range)
 
     return annotation.data
 
 
+def _check_annotations_version(pk, expected_versions: Collection[int]):
+    # The job is locked until the end of the transaction,
+    # so the annotations can't be changed by concurrent requests after the check
+    db_job = (
+        models.Job.objects.select_for_update()
+        .only("updated_date", "annotations_updated_date")
+        .get(pk=pk)
+    )
+
+    current_version = get_annotations_version(db_job)
+    if current_version not in expected_versions:
+        raise AnnotationsVersionConflictError(current_version)
+
+
 @silk_profile(name="POST job data")
 @transaction.atomic
-def put_job_data(pk, data: AnnotationIR | dict, *, db_job: models.Job | None = None):
+def put_job_data(
+    pk,
+    data: AnnotationIR | dict,
+    *,
+    db_job: models.Job | None = None,
+    expected_versions: Collection[int] | None = None,
+):
+    if expected_versions is not None:
+        _check_annotations_version(pk, expected_versions)
+
     annotation = JobAnnotation(pk, db_job=db_job)
     annotation.put(data)
 
@@ -1291,8 +1877,16 @@ def put_job_data(pk, data: AnnotationIR | dict, *, db_job: models.Job | None = N
 @plugin_decorator
 @transaction.atomic
 def patch_job_data(
-    pk, data: AnnotationIR | dict, action: PatchAction, *, db_job: models.Job | None = None
+    pk,
+    data: AnnotationIR | dict,
+    action: PatchAction,
+    *,
+    db_job: models.Job | None = None,
+    expected_versions: Collection[int] | None = None,
 ):
+    if expected_versions is not None:
+        _check_annotations_version(pk, expected_versions)
+
     annotation = JobAnnotation(pk, db_job=db_job)
     if action == PatchAction.CREATE:
         annotation.create(data)
@@ -1333,9 +1927,9 @@ def export_job(
 
 @silk_profile(name="GET task data")
 @transaction.atomic
-def get_task_data(pk):
+def get_task_data(pk, *, frame_range: tuple[int, int] | None = None):
     annotation = TaskAnnotation(pk)
-    annotation.init_from_db()
+    annotation.init_from_db(frame_range=frame_range)
 
     return annotation.data
 
@@ -4,20 +4,31 @@
 # SPDX-License-Identifier: MIT
 
 
+import hashlib
+import io
+import json
 import math
+import random
 from collections.abc import Sequence
 from functools import partial
 from typing import Any
 from unittest import mock
 
 from django.contrib.auth import get_user_model
+from django.core.management import call_command
 from django.test import TestCase
 
 from cvat.apps.dataset_manager import task as task_module
-from cvat.apps.dataset_manager.annotation import AnnotationIR, TrackManager
+from cvat.apps.dataset_manager.annotation import (
+    AnnotationFrameIndex,
+    AnnotationIR,
+    ShapeManager,
+    TrackManager,
+)
 from cvat.apps.engine import models
 from cvat.apps.engine.models import DimensionType, JobType, ShapeType
 from cvat.apps.engine.tests.utils import compare_objects
+from cvat.utils.django_database import utils as db_utils
 
 
 # --- SHAPE/TRACK GENERATION HELPERS ---
@@ -418,6 +429,231 @@ class TrackManagerTest(TestCase):
         self.assertEqual(expected_shapes, interpolated_shapes)
 
 
+def make_random_track(
+    rng: random.Random,
+    shape_type: ShapeType,
+    *,
+    dimension: DimensionType = DimensionType.DIM_2D,
+    keyframes_count: int = 8,
+    frame_count: int = 300,
+) -> dict[str, Any]:
+    def make_points() -> list[float]:
+        match shape_type:
+            case ShapeType.CUBOID if dimension == DimensionType.DIM_3D:
+                return [
+                    *(rng.uniform(-100, 100) for _ in range(3)),
+                    *(rng.uniform(-math.pi, math.pi) for _ in range(3)),
+                    *(rng.uniform(1, 10) for _ in range(3)),
+                    *([0.0] * 7),
+                ]
+            case ShapeType.RECTANGLE | ShapeType.ELLIPSE:
+                vertex_count = 2
+            case ShapeType.CUBOID:
+                vertex_count = 8
+            case ShapeType.POLYGON:
+                vertex_count = rng.randint(3, 12)
+            case ShapeType.POLYLINE:
+                vertex_count = rng.randint(2, 10)
+            case ShapeType.POINTS:
+                vertex_count = rng.choice([1, 1, 2, 4])
+            case ShapeType.SKELETON:
+                return []
+
+        return [round(rng.uniform(0, 1000), rng.randint(0, 3)) for _ in range(2 * vertex_count)]
+
+    shapes = []
+    for frame in sorted(rng.sample(range(frame_count), keyframes_count)):
+        attributes = [{"spec_id": 1, "value": str(rng.randint(0, 3))}]
+        if rng.random() < 0.3:
+            attributes.append({"spec_id": 2, "value": "true"})
+
+        shapes.append(
+            {
+                "id": len(shapes),
+                "frame": frame,
+                "type": str(shape_type),
+                "points": make_points(),
+                "rotation": (
+                    rng.uniform(0, 360)
+                    if shape_type in (ShapeType.RECTANGLE, ShapeType.ELLIPSE)
+                    else 0.0
+                ),
+                "occluded": rng.random() < 0.3,
+                "outside": rng.random() < 0.2,
+                "z_order": 0,
+                "attributes": attributes,
+            }
+        )
+
+    return {**make_track(shapes, frame=shapes[0]["frame"]), "id": 1}
+
+
+class TrackInterpolationRegressionTest(TestCase):
+    # The output of the reference interpolation implementation for the generated tracks.
+    # The results must not change after optimizations.
+    EXPECTED_RESULT_HASHES = {
+        "2d_rectangle_default": "2870aa6644b9302bb1b8192b497301d8ab8a220100ea810dadfd8eb2cbec2175",
+        "2d_rectangle_include_outside": "38627c680ac3cef770695051dc9aaf83661a2f4544eb4f30e1af72f4ab4defd5",
+        "2d_rectangle_included_frames": "fca8d622654b337f5d24adf9f9faa45a9b795f625bcffe428f1bf1464b0f43a1",
+        "2d_rectangle_deleted_frames": "8bcacb9a855df690e41ad0a802f21104aef28dcbd966ddb2cc6b8ef9dfeac1a0",
+        "2d_rectangle_end_frame": "7ed49f3d639e6aaee021b996fb41923107fc32f1ad9d67ebe80a2c896eeb377c",
+        "2d_ellipse_default": "3703d4a2315ab19ebfad401621c9c1a6560d90e6c8704f6bf3f1f9a092e45b26",
+        "2d_ellipse_include_outside": "4f896f932d80d192bedd0f55a72fa3408eb217879233052552f22e9f83d4ec74",
+        "2d_ellipse_included_frames": "63b05acf5be796cfd0db7e325a27b8148e3afa353463939e9681d1256ccfce8f",
+        "2d_ellipse_deleted_frames": "9e84e8622fc8036aed06cebe3ae6b6b0e0a5bd35649f63182a4c289984604167",
+        "2d_ellipse_end_frame": "aa067f031e0bc7f6bd5e17b2c69d6a2e2943254243ed8059198fdd9c417d605e",
+        "2d_cuboid_default": "78684ced42b6429ed5bbb76521b508c5cabfaa897b3178b1004450d28a3c5bf4",
+        "2d_cuboid_include_outside": "b5959c57e5f3d2c4f72dbb719976720a1e5650332984833fc4241c12ad79ac18",
+        "2d_cuboid_included_frames": "e06e98f341ed8dbac0471fe3f0cd40aaaf1651a4ce9030098cd536b1feb54c1d",
+        "2d_cuboid_deleted_frames": "f7df13e4ca2b1be135832f61db7766fe2325afe04bbb28704469a462f1ca11e9",
+        "2d_cuboid_end_frame": "04a1c4c8c9384922ceda7dbfac15151a2e9b7b4dc68601493194c4e803ef4b21",
+        "2d_polygon_default": "cfb4853f3935fefbe97a8fdb45095baf1b68762dc372b1fcec7f2e878b1fd563",
+        "2d_polygon_include_outside": "b2d26b4e63cc195f9678041cdd4c094c9b801b19e5c01dfc727c977b96fe1ae1",
+        "2d_polygon_included_frames": "284e2a61b53d44f41a7c38aa717c5a00250eb8359f97d6c4b92da62bbfe21032",
+        "2d_polygon_deleted_frames": "50b6fde2d8953a06a3e77e95c2631a8bee0df9b07386b80bdc98c3210a626c16",
+        "2d_polygon_end_frame": "351a844eaca917e7bde9d726c1184639a7d9609f805e383dba84fe626e68aae8",
+        "2d_polyline_default": "d9c3aef47e7901b4e26edfe5aad5dbca28c3bf25ce5ed861806037acdc0d6747",
+        "2d_polyline_include_outside": "8a3c810a55d6f6570e8a0f335eaceae0e18547a1abbb59541b618d370c896d53",
+        "2d_polyline_included_frames": "c746a5290c0c873db13d07c139b7adff9cf412ee032e1245d0fd183546eed530",
+        "2d_polyline_deleted_frames": "7d2fa4210e4e44ec743befa8b9ad5d3ff233bee16d1222a4274a8899823445fe",
+        "2d_polyline_end_frame": "f87288a8a1e281436b481090f161f700e3768f29b53d1a9c2be85d8955047cec",
+        "2d_points_default": "17b01f199dfc30f2d42cc18d7e96e675d6f8cc57b237e70adebfc5ca3421d4d4",
+        "2d_points_include_outside": "95d8c34a5aa0a9c350f41200b8210fbb641ce1dd8593588603bbb5a8445e48bd",
+        "2d_points_included_frames": "f5a46cc57d599385574d0f0969ec1aac71759bb68f396d3a556baa9b39cc0fab",
+        "2d_points_deleted_frames": "84e5bc5721ecb3b8fccf4ca889dc11edf0083228b1c8ffdece8b15485e947b5e",
+        "2d_points_end_frame": "3f69c7dcf26c6a155970d07f9ba0ef357efcc6128c5b053923d07e47140f642b",
+        "2d_skeleton_default": "919d3a68a540317aa8f1b7a1dd44b17a8e9ca68f98c7f1e7bb3bcf307cd61174",
+        "2d_skeleton_include_outside": "17bc79a20d8285d27039aee9ef2d474997b1825cd44f531b22296cace1489aff",
+        "2d_skeleton_included_frames": "719737d6a54e135f08bac19ac851303cf14cb9c9ccff02f3ef6db7cd4f39b395",
+        "2d_skeleton_deleted_frames": "4a87701365defbd15a0742a0e3daf6afe24dbe7a35034f0405750d2625f1a0b2",
+        "2d_skeleton_end_frame": "269b438c53275eaf11022970642c66623bf1193d06ca3b7cfebb11dad4e642e6",
+        "3d_cuboid_default": "eed469b0a11a4873bf384928922420f04d8bd86ed9710086a93330c04ef01aeb",
+        "3d_cuboid_include_outside": "35a209bbe01559bd3bb0620206625e165f722ab5e33f26bea78cf766dde65205",
+        "3d_cuboid_included_frames": "3002d06c2c3d27e9a90b1b6d4b16d3ac771b96fea17484a91a1b6e90f393f3ae",
+        "3d_cuboid_deleted_frames": "18231f4bd2366f154806f87787b05337c96844974547285d34ac4c72c9cd9d9f",
+        "3d_cuboid_end_frame": "3fbfb020b9e8af5fb09b9861d3f36618122e4c9b562599d9afec469f841d166b",
+    }
+
+    def _get_cases(self):
+        for shape_type, dimension in [
+            (ShapeType.RECTANGLE, DimensionType.DIM_2D),
+            (ShapeType.ELLIPSE, DimensionType.DIM_2D),
+            (ShapeType.CUBOID, DimensionType.DIM_2D),
+            (ShapeType.POLYGON, DimensionType.DIM_2D),
+            (ShapeType.POLYLINE, DimensionType.DIM_2D),
+            (ShapeType.POINTS, DimensionType.DIM_2D),
+            (ShapeType.SKELETON, DimensionType.DIM_2D),
+            (ShapeType.CUBOID, DimensionType.DIM_3D),
+        ]:
+            for variant, kwargs in [
+                ("default", {}),
+                ("include_outside", {"include_outside": True}),
+                ("included_frames", {"included_frames": set(range(0, 300, 3))}),
+                ("deleted_frames", {"deleted_frames": set(range(0, 300, 7))}),
+                ("end_frame", {"end_frame": 150}),
+            ]:
+                yield f"{dimension}_{shape_type}_{variant}", shape_type, dimension, kwargs
+
+    def _get_result_hash(self, shape_type, dimension, kwargs) -> str:
+        kwargs = dict(kwargs)
+        end_frame = kwargs.pop("end_frame", 300)
+
+        results = []
+        rng = random.Random(f"{dimension}_{shape_type}")
+        for _ in range(5):
+            track = make_random_track(rng, shape_type, dimension=dimension)
+            results.append(
+                TrackManager.get_interpolated_shapes(track, 0, end_frame, dimension, **kwargs)
+            )
+
+        return hashlib.sha256(json.dumps(results, sort_keys=True).encode()).hexdigest()
+
+    def test_interpolation_results_are_not_changed(self):
+        for case_name, shape_type, dimension, kwargs in self._get_cases():
+            with self.subTest(case_name):
+                self.assertEqual(
+                    self.EXPECTED_RESULT_HASHES[case_name],
+                    self._get_result_hash(shape_type, dimension, kwargs),
+                )
+
+    def test_interpolated_shapes_do_not_share_data_with_keyframes(self):
+        for shape_type in [ShapeType.RECTANGLE, ShapeType.POLYGON, ShapeType.POINTS]:
+            with self.subTest(shape_type=str(shape_type)):
+                track = make_track(
+                    [
+                        make_shape(0, shape_type=shape_type, attributes=[{"spec_id": 1}]),
+                        make_shape(4, base=4, shape_type=shape_type),
+                    ]
+                )
+
+                interpolated_shapes = TrackManager.get_interpolated_shapes(
+                    track, 0, 8, DimensionType.DIM_2D
+                )
+                generated_shapes = [shape for shape in interpolated_shapes if not shape["keyframe"]]
+                self.assertEqual(len(generated_shapes), 6)
+
+                generated_shapes[0]["attributes"].append({"spec_id": 2})
+                generated_shapes[0]["points"][0] = -1
+
+                self.assertEqual(track["shapes"][0]["attributes"], [{"spec_id": 1}])
+                self.assertEqual(track["shapes"][0]["points"][0], 1)
+                for shape in generated_shapes[1:]:
+                    self.assertNotEqual(shape["points"][0], -1)
+
+
+class ShapeManagerTest(TestCase):
+    def _make_shapes(self, count: int, *, dimension: DimensionType, seed: int) -> list[dict]:
+        rng = random.Random(seed)
+
+        shape_types = [ShapeType.RECTANGLE, ShapeType.POLYGON, ShapeType.POINTS]
+        if dimension == DimensionType.DIM_3D:
+            shape_types = [ShapeType.CUBOID]
+
+        shapes = []
+        for _ in range(count):
+            shape_type = rng.choice(shape_types)
+            base = rng.uniform(0, 20)
+            if shape_type == ShapeType.CUBOID:
+                points = make_3d_points(base)
+            elif shape_type == ShapeType.RECTANGLE and rng.random() < 0.2:
+                # rectangles with swapped corners and empty rectangles
+                points = rng.choice([[5.0 + base, 6.0 + base, 1.0, 2.0], [base, 1.0, base, 8.0]])
+            else:
+                points = make_2d_points(base, shape_type=shape_type)
+
+            shapes.append(
+                {
+                    "type": str(shape_type),
+                    "frame": 0,
+                    "label_id": rng.choice([1, 2]),
+                    "points": points,
+                }
+            )
+
+        return shapes
+
+    def test_cost_matrix_matches_pairwise_similarity(self):
+        for dimension in [DimensionType.DIM_2D, DimensionType.DIM_3D]:
+            with self.subTest(dimension=dimension):
+                int_shapes = self._make_shapes(40, dimension=dimension, seed=1)
+                old_shapes = self._make_shapes(30, dimension=dimension, seed=2)
+                shape_manager = ShapeManager([], dimension=dimension)
+
+                cost_matrix = shape_manager._calc_cost_matrix(int_shapes, old_shapes, 0, 1)
+
+                expected_cost_matrix = [
+                    [
+                        1
+                        - ShapeManager._calc_objects_similarity(
+                            int_shape, old_shape, 0, 1, dimension
+                        )
+                        for old_shape in old_shapes
+                    ]
+                    for int_shape in int_shapes
+                ]
+                self.assertEqual(cost_matrix.tolist(), expected_cost_matrix)
+
+
 class AnnotationIRTest(TestCase):
     def test_interval_stop_can_be_immediately_after_range(self):
         interval = {"id": 1, "start": 0, "stop": 11}
@@ -466,6 +702,40 @@ class AnnotationIRTest(TestCase):
                 sliced_annotation = annotation.slice(0, 1)
                 self.assertEqual(sliced_annotation.data["tracks"][0]["shapes"], shapes[0:2])
 
+    def test_frame_index_slices_are_equal_to_slices(self):
+        tracks = [
+            make_track([make_shape(2), make_shape(5, base=2), make_shape(8, outside=True)], 2),
+            make_track([make_shape(4), make_shape(6, outside=True)], 4),
+            # the track is visible until the end
+            make_track([make_shape(1), make_shape(3, base=1)], 1),
+            # skeleton tracks are checked by their elements
+            dict(
+                make_track([make_shape(0)], 0),
+                elements=[
+                    make_track([make_shape(0), make_shape(7, outside=True)], 0),
+                    make_track([make_shape(0), make_shape(3, outside=True)], 0),
+                ],
+            ),
+        ]
+        annotation = AnnotationIR(
+            DimensionType.DIM_2D,
+            {
+                "version": 0,
+                "tags": [{"frame": frame, "label_id": 0} for frame in [9, 0, 4, 4]],
+                "shapes": [make_shape(frame) for frame in [7, 3, 0, 3, 9, 5]],
+                "tracks": tracks,
+                "intervals": [],
+            },
+        )
+
+        frame_index = AnnotationFrameIndex(annotation)
+
+        for start, stop in [(0, 2), (2, 4), (4, 6), (6, 8), (8, 10), (3, 3), (0, 10), (11, 20)]:
+            with self.subTest(start=start, stop=stop):
+                self.assertEqual(
+                    frame_index.slice(start, stop).data, annotation.slice(start, stop).data
+                )
+
 
 class TestTaskAnnotation(TestCase):
     def test_reads_ordered_jobs(self):
@@ -530,7 +800,13 @@ class TestTaskAnnotation(TestCase):
                         self.called_ids.append(job_id)
                         self.ir_data = AnnotationIR(dimension=dimension)
 
-                    def init_from_db(self, *, streaming: bool = False):
+                    def init_from_db(
+                        self,
+                        *,
+                        streaming: bool = False,
+                        frame_range: tuple[int, int] | None = None,
+                        slice_tracks: bool = True,
+                    ):
                         pass
 
                 with mock.patch.object(task_module, "JobAnnotation", DummyJobAnnotation):
@@ -538,3 +814,80 @@ class TestTaskAnnotation(TestCase):
                     ta.init_from_db()
 
                 assert DummyJobAnnotation.called_ids == sorted(unordered_ids)
+
+
+class AnnotationDbWritesTest(TestCase):
+    def _create_job(self) -> models.Job:
+        user = get_user_model().objects.create_superuser(username="admin", email="", password="")
+        db_data = models.Data.objects.create(size=10, stop_frame=9, image_quality=50)
+        db_task = models.Task.objects.create(
+            data=db_data, name="my task", owner=user, overlap=0, segment_size=10
+        )
+        db_label = models.Label.objects.create(task=db_task, name="car")
+        models.AttributeSpec.objects.create(
+            label=db_label,
+            name="color",
+            mutable=False,
+            input_type=models.AttributeType.SELECT,
+            default_value="red",
+            values="red\nblue",
+        )
+        return models.Job.objects.create(
+            segment=models.Segment.objects.create(task=db_task, start_frame=0, stop_frame=9),
+            type=JobType.ANNOTATION,
+        )
+
+    def test_can_format_copy_values(self):
+        for value, expected in [
+            (None, r"\N"),
+            (True, "t"),
+            (False, "f"),
+            (5, "5"),
+            (1.5, "1.5"),
+            ("a\tb\nc\\d\re", "a\\tb\\nc\\\\d\\re"),
+        ]:
+            with self.subTest(value=value):
+                self.assertEqual(db_utils._format_copy_value(value), expected)
+
+    def test_copy_bulk_create_falls_back_to_bulk_create_on_other_backends(self):
+        db_job = self._create_job()
+        db_label = db_job.segment.task.label_set.get()
+
+        db_shapes = db_utils.copy_bulk_create(
+            models.LabeledShape,
+            [
+                models.LabeledShape(
+                    job=db_job,
+                    label=db_label,
+                    frame=frame,
+                    type=ShapeType.RECTANGLE,
+                    points=[0, 0, 10, 10],
+                )
+                for frame in range(3)
+            ],
+        )
+
+        self.assertEqual(
+            sorted(db_shape.id for db_shape in db_shapes),
+            sorted(models.LabeledShape.objects.filter(job=db_job).values_list("id", flat=True)),
+        )
+
+    def test_can_benchmark_annotation_writes_without_saving_annotations(self):
+        db_job = self._create_job()
+
+        output = io.StringIO()
+        call_command(
+            "benchmarkannotationwrites",
+            str(db_job.id),
+            "--shapes=20",
+            "--tracks=2",
+            "--track-length=3",
+            "--repeats=1",
+            stdout=output,
+            stderr=io.StringIO(),
+        )
+
+        # 20 shapes and 2 tracks with 3 shapes each, shapes and tracks have 1 attribute row
+        self.assertEqual(output.getvalue().count(" 50 rows"), 2)
+        self.assertFalse(models.LabeledShape.objects.filter(job=db_job).exists())
+        self.assertFalse(models.LabeledTrack.objects.filter(job=db_job).exists())
@@ -31,20 +31,23 @@ from attr import define, field
 from datumaro.components.comparator import EqualityComparator
 from datumaro.components.dataset import Dataset
 from django.contrib.auth.models import Group
+from django.test import override_settings
 from PIL import Image
 from rest_framework import status
 
 import cvat.apps.dataset_manager as dm
 from cvat.apps.dataset_manager.bindings import CvatDataExtractor, TaskData
 from cvat.apps.dataset_manager.cron import clear_export_cache
+from cvat.apps.dataset_manager.project import _TaskAnnotationsFragment
 from cvat.apps.dataset_manager.task import TaskAnnotation
 from cvat.apps.dataset_manager.tests.utils import (
     TestDir,
     ensure_extractors_efficiency,
     ensure_streaming_importers,
 )
-from cvat.apps.dataset_manager.util import get_export_cache_lock
+from cvat.apps.dataset_manager.util import ExportCacheManager, get_export_cache_lock
 from cvat.apps.dataset_manager.views import export
+from cvat.apps.engine.media_io.frame_provider import TaskFrameProvider
 from cvat.apps.engine.models import Task
 from cvat.apps.engine.tests.utils import (
     ExportApiTestBase,
@@ -1989,6 +1992,206 @@ class ExportBehaviorTest(_DbTestBase):
 
         self.assertTrue(osp.isfile(export_path))
 
+    def test_project_dataset_export_can_prepare_task_media(self):
+        format_name = "CVAT for images 1.1"
+        project = self._create_project(projects["main"])
+        task_ids = []
+        for task_name, name_offset in [("task in project #1", 0), ("task in project #2", 3)]:
+            task = self._create_task(
+                dict(tasks[task_name], project_id=project["id"]),
+                self._generate_task_images(3, name_offset),
+            )
+            task_ids.append(task["id"])
+
+        with (
+            # make the task media required
+            patch.object(TaskFrameProvider, "get_original_image_paths", return_value={}),
+            patch.object(
+                TaskFrameProvider, "prepare_frame_chunks", autospec=True
+            ) as mock_prepare_frame_chunks,
+        ):
+            export_path = export(dst_format=format_name, project_id=project["id"], save_images=True)
+
+        self.assertTrue(osp.isfile(export_path))
+        self.assertEqual(
+            sorted(call.args[0]._db_task.id for call in mock_prepare_frame_chunks.call_args_list),
+            task_ids,
+        )
+        for call in mock_prepare_frame_chunks.call_args_list:
+            self.assertEqual(set(call.args[1]), {0, 1, 2})
+
+    def test_project_dataset_export_does_not_prepare_chunks_for_original_images(self):
+        format_name = "CVAT for images 1.1"
+
+        for concurrency in [1, 2]:
+            with self.subTest(concurrency=concurrency):
+                project = self._create_project(projects["main"])
+                self._create_task(
+                    dict(tasks["task in project #1"], project_id=project["id"]),
+                    self._generate_task_images(3),
+                )
+
+                with (
+                    override_settings(PROJECT_EXPORT_CONCURRENCY=concurrency),
+                    patch.object(
+                        TaskFrameProvider, "prepare_frame_chunks", autospec=True
+                    ) as mock_prepare_frame_chunks,
+                ):
+                    export_path = export(
+                        dst_format=format_name, project_id=project["id"], save_images=True
+                    )
+
+                self.assertTrue(osp.isfile(export_path))
+                mock_prepare_frame_chunks.assert_not_called()
+
+    def test_project_annotations_export_does_not_prepare_task_media(self):
+        format_name = "CVAT for images 1.1"
+        project = self._create_project(projects["main"])
+        self._create_task(
+            dict(tasks["task in project #1"], project_id=project["id"]),
+            self._generate_task_images(3),
+        )
+
+        with patch.object(
+            TaskFrameProvider, "prepare_frame_chunks", autospec=True
+        ) as mock_prepare_frame_chunks:
+            export_path = export(dst_format=format_name, project_id=project["id"])
+
+        self.assertTrue(osp.isfile(export_path))
+        mock_prepare_frame_chunks.assert_not_called()
+
+    def test_project_export_can_reuse_annotations_of_unchanged_tasks(self):
+        annotations_name = "CVAT for images 1.1 many jobs"
+        project = self._create_project(projects["main"])
+        project_tasks = []
+        for task_name, name_offset in [("task in project #1", 0), ("task in project #2", 3)]:
+            task = self._create_task(
+                dict(tasks[task_name], project_id=project["id"]),
+                self._generate_task_images(3, name_offset),
+            )
+            self._create_annotations(task, annotations_name, "default")
+            project_tasks.append(task)
+
+        def _export_project(format_name: str) -> list[int]:
+            "Returns the tasks with annotations read from the DB"
+
+            with patch(
+                "cvat.apps.dataset_manager.project.TaskAnnotation", wraps=TaskAnnotation
+            ) as mock_task_annotation:
+                export_path = export(dst_format=format_name, project_id=project["id"])
+
+            self.assertTrue(osp.isfile(export_path))
+            return [call.kwargs["pk"] for call in mock_task_annotation.call_args_list]
+
+        self.assertEqual(
+            _export_project("CVAT for images 1.1"), [task["id"] for task in project_tasks]
+        )
+
+        # the stored task annotations don't depend on the format
+        self.assertEqual(_export_project("Datumaro 1.0"), [])
+
+        self._create_annotations(project_tasks[1], annotations_name, "random")
+        self.assertEqual(_export_project("CVAT for images 1.1"), [project_tasks[1]["id"]])
+
+        # the previous annotations of the changed task are removed
+        for task in project_tasks:
+            fragment_files = ExportCacheManager.find_annotations_fragment_files(
+                instance_type="task", instance_id=task["id"]
+            )
+            self.assertEqual(len(fragment_files), 1)
+
+    def test_project_export_annotations_fragment_keeps_task_annotations(self):
+        project = self._create_project(projects["main"])
+        task = self._create_task(
+            dict(tasks["task in project #1"], project_id=project["id"]),
+            self._generate_task_images(3),
+        )
+        self._create_annotations(task, "CVAT for images 1.1 many jobs", "default")
+
+        task_annotation = TaskAnnotation(pk=task["id"])
+        task_annotation.init_from_db()
+        expected_data = task_annotation.ir_data.data
+
+        db_task = Task.objects.get(id=task["id"])
+        fragment = _TaskAnnotationsFragment(db_task, labels_signature="0123456789abcdef")
+        for annotation_ir in [fragment.save(task_annotation.ir_data), fragment.load()]:
+            self.assertEqual(
+                {**annotation_ir.data, "shapes": list(annotation_ir.shapes)}, expected_data
+            )
+
+        # storing a new version of the task annotations removes the previous one
+        new_fragment = _TaskAnnotationsFragment(db_task, labels_signature="fedcba9876543210")
+        new_fragment.save(task_annotation.ir_data)
+        self.assertEqual(
+            ExportCacheManager.find_annotations_fragment_files(
+                instance_type="task", instance_id=task["id"]
+            ),
+            [new_fragment.path],
+        )
+        self.assertIsNone(fragment.load())
+
+    def test_cvat_export_writes_files_directly_into_archive(self):
+        format_name = "CVAT for images 1.1"
+        images = self._generate_task_images(3)
+        task = self._create_task(tasks["main"], images)
+        self._create_annotations(task, f"{format_name} many jobs", "default")
+
+        with TemporaryDirectory() as temp_dir:
+            export_dir = osp.join(temp_dir, "export")
+            os.makedirs(export_dir)
+            dst_file = osp.join(temp_dir, "result.zip")
+
+            dm.task.export_task(
+                task["id"], dst_file, format_name=format_name, save_images=True, temp_dir=export_dir
+            )
+
+            self.assertEqual(os.listdir(export_dir), [])
+
+            with zipfile.ZipFile(dst_file) as archive:
+                archive_files = archive.namelist()
+
+        self.assertIn("annotations.xml", archive_files)
+        self.assertEqual(
+            len([name for name in archive_files if name.startswith("images/")]), len(images)
+        )
+
+    def test_dataset_export_can_use_original_image_files(self):
+        images = self._generate_task_images(3)
+        task = self._create_task(tasks["main"], images)
+
+        for format_name in ["CVAT for images 1.1", "Datumaro 1.0"]:
+            with (
+                self.subTest(format=format_name),
+                patch.object(
+                    TaskFrameProvider,
+                    "get_frames",
+                    wraps=TaskFrameProvider.get_frames,
+                    autospec=True,
+                ) as mock_get_frames,
+                TemporaryDirectory() as temp_dir,
+            ):
+                dst_file = osp.join(temp_dir, "result.zip")
+                dm.task.export_task(task["id"], dst_file, format_name=format_name, save_images=True)
+
+                for call in mock_get_frames.call_args_list:
+                    self.assertEqual(set(call.args[1]), set())
+
+                with zipfile.ZipFile(dst_file) as archive:
+                    exported_images = sorted(
+                        archive.read(name)
+                        for name in archive.namelist()
+                        if name.lower().endswith(".jpg")
+                    )
+
+                self.assertEqual(
+                    exported_images,
+                    sorted(
+                        image.getvalue()
+                        for key, image in images.items()
+                        if key.startswith("client_files")
+                    ),
+                )
+
     def test_export_cache_lock_can_raise_on_releasing_expired_lock(self):
         from pottery import ReleaseUnlockedLock
 
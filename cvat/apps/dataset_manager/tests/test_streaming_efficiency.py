@@ -2,6 +2,8 @@ import os
 import tempfile
 from collections import namedtuple
 from collections.abc import Callable
+from functools import partial
+from types import SimpleNamespace
 from unittest import TestCase, mock
 from unittest.mock import Mock
 
@@ -11,6 +13,7 @@ from datumaro.components import media
 from datumaro.components.dataset import StreamDataset
 from datumaro.components.dataset_base import CategoriesInfo, DatasetBase, DatasetItem
 from django.contrib.auth.models import Group
+from django.test import override_settings
 from rest_framework import status
 from rq.job import Job as RQJob
 
@@ -19,16 +22,25 @@ from cvat.apps.dataset_manager.bindings import (
     CommonData,
     CvatDataExtractor,
     JobData,
+    MediaProvider2D,
+    MediaSource,
     ProjectData,
     TaskData,
+    _FrameReader,
     import_dm_annotations,
 )
 from cvat.apps.dataset_manager.formats import registry
 from cvat.apps.dataset_manager.formats.registry import dm_env, importer
 from cvat.apps.dataset_manager.project import import_dataset_as_project
-from cvat.apps.dataset_manager.task import import_job_annotations, import_task_annotations
+from cvat.apps.dataset_manager.task import (
+    TaskAnnotation,
+    import_job_annotations,
+    import_task_annotations,
+)
 from cvat.apps.dataset_manager.util import TmpDirManager
-from cvat.apps.engine.models import LabelType
+from cvat.apps.engine.media_io.frame_provider import FrameOutputType
+from cvat.apps.engine.media_io.media_provider import DataWithMeta
+from cvat.apps.engine.models import LabeledShape, LabelType
 from cvat.apps.engine.tests.utils import (
     ApiTestBase,
     ForceLogin,
@@ -259,6 +271,137 @@ class TestExtractors(TestCase):
                     assert not any(annotations), annotations
 
 
+class _FakeFrameProvider:
+    "Records the frames read from the chunks and the frames converted into the output type"
+
+    def __init__(self, db_task):
+        self.db_task = db_task
+        self.read_frames = []
+        self.converted_frames = []
+        self.single_frames = []
+
+    def get_original_image_paths(self, frame_numbers):
+        return {}
+
+    def get_frame_loaders(self, frame_numbers, *, quality, out_type):
+        for frame_number in sorted(set(frame_numbers)):
+            self.read_frames.append(frame_number)
+            yield frame_number, partial(self._convert_frame, frame_number)
+
+    def _convert_frame(self, frame_number):
+        self.converted_frames.append(frame_number)
+        return DataWithMeta(self._make_frame(frame_number), mime="image/png")
+
+    def get_frame(self, frame_number, *, quality, out_type):
+        self.single_frames.append(frame_number)
+        return DataWithMeta(self._make_frame(frame_number), mime="image/png")
+
+    def _make_frame(self, frame_number):
+        return f"task {self.db_task.id} frame {frame_number}"
+
+    def unload(self):
+        pass
+
+
+class TestFrameReader(TestCase):
+    def _make_frame_reader(self, frames, *, max_buffered_frames=3):
+        frame_provider = _FakeFrameProvider(SimpleNamespace(id=1))
+        frame_reader = _FrameReader(
+            frame_provider,
+            frames,
+            out_type=FrameOutputType.NUMPY_ARRAY,
+            max_buffered_frames=max_buffered_frames,
+        )
+        self.addCleanup(frame_reader.close)
+        return frame_reader, frame_provider
+
+    def test_can_read_frames_in_order(self):
+        frame_reader, frame_provider = self._make_frame_reader(range(5))
+
+        for frame_number in range(5):
+            self.assertEqual(frame_reader.get_frame(frame_number), f"task 1 frame {frame_number}")
+
+        self.assertEqual(frame_provider.read_frames, [0, 1, 2, 3, 4])
+        self.assertEqual(frame_provider.converted_frames, [0, 1, 2, 3, 4])
+        self.assertEqual(frame_provider.single_frames, [])
+
+    def test_keeps_only_last_frames_in_buffer(self):
+        frame_reader, frame_provider = self._make_frame_reader(range(10), max_buffered_frames=3)
+
+        frame_reader.get_frame(6)
+
+        # the buffered frames are returned without reading the chunks again
+        for frame_number in [4, 5, 6]:
+            self.assertEqual(frame_reader.get_frame(frame_number), f"task 1 frame {frame_number}")
+        self.assertEqual(frame_provider.single_frames, [])
+
+        # the older frames are read separately
+        self.assertEqual(frame_reader.get_frame(3), "task 1 frame 3")
+        self.assertEqual(frame_provider.single_frames, [3])
+        self.assertEqual(frame_provider.read_frames, list(range(7)))
+
+    def test_does_not_convert_skipped_frames(self):
+        frame_reader, frame_provider = self._make_frame_reader(range(10))
+
+        self.assertEqual(frame_reader.get_frame(8), "task 1 frame 8")
+        self.assertEqual(frame_reader.get_frame(7), "task 1 frame 7")
+        self.assertEqual(frame_reader.get_frame(8), "task 1 frame 8")
+
+        self.assertEqual(frame_provider.read_frames, list(range(9)))
+        self.assertEqual(frame_provider.converted_frames, [8, 7])
+
+    def test_reads_unexpected_frames_separately(self):
+        frame_reader, frame_provider = self._make_frame_reader([2, 4])
+
+        self.assertEqual(frame_reader.get_frame(3), "task 1 frame 3")
+        self.assertEqual(frame_reader.get_frame(4), "task 1 frame 4")
+
+        self.assertEqual(frame_provider.single_frames, [3])
+        self.assertEqual(frame_provider.read_frames, [2, 4])
+        self.assertEqual(frame_provider.converted_frames, [4])
+
+    def test_can_read_frames_again_after_source_switch(self):
+        sources = {
+            task_id: MediaSource(SimpleNamespace(id=task_id, mode="annotation"), frames=range(5))
+            for task_id in [1, 2]
+        }
+        frame_providers = []
+
+        def _make_frame_provider(db_task):
+            frame_provider = _FakeFrameProvider(db_task)
+            frame_providers.append(frame_provider)
+            return frame_provider
+
+        media_provider = MediaProvider2D(sources)
+        with (
+            mock.patch(
+                "cvat.apps.dataset_manager.bindings.TaskFrameProvider",
+                side_effect=_make_frame_provider,
+            ),
+            mock.patch.object(media_provider, "_log_read_stats"),
+        ):
+            for source_id, frame_number in [(1, 3), (2, 0), (1, 1)]:
+                frame = media_provider._read_frame(
+                    source_id,
+                    sources[source_id],
+                    frame_number,
+                    out_type=FrameOutputType.NUMPY_ARRAY,
+                )
+                self.assertEqual(frame, f"task {source_id} frame {frame_number}")
+
+            media_provider.unload()
+
+        self.assertEqual(
+            [frame_provider.db_task.id for frame_provider in frame_providers], [1, 2, 1]
+        )
+        self.assertEqual(frame_providers[0].read_frames, [0, 1, 2, 3])
+        self.assertEqual(frame_providers[1].read_frames, [0])
+
+        # the source is read from the beginning, not from the buffer of the previous reader
+        self.assertEqual(frame_providers[2].read_frames, [0, 1])
+        self.assertEqual(frame_providers[2].single_frames, [])
+
+
 class TestImporters(ApiTestBase):
     @classmethod
     def setUpTestData(cls):
@@ -442,6 +585,24 @@ class TestImporters(ApiTestBase):
             import_task_annotations(fake_file_name, self.task_id, "dummy_format 1.0", True)
             assert self.extractor.ann_init_count == 2
 
+    @override_settings(ANNOTATION_IMPORT_BATCH_SIZE=1)
+    def test_import_task_annotations_in_batches(self):
+        with (
+            TmpDirManager.get_tmp_directory() as temp_dir,
+            mock.patch.object(
+                TaskAnnotation, "create", autospec=True, side_effect=TaskAnnotation.create
+            ) as mock_create,
+        ):
+            fake_file_name = os.path.join(temp_dir, "fake.zip")
+            open(fake_file_name, "w").close()
+            import_task_annotations(fake_file_name, self.task_id, "dummy_format 1.0", True)
+
+        imported_shape_batches = [
+            len(call.args[1]["shapes"]) for call in mock_create.call_args_list
+        ]
+        assert imported_shape_batches == [2, 0], imported_shape_batches
+        assert LabeledShape.objects.filter(job__segment__task_id=self.task_id).count() == 2
+
     @mock.patch("rq.get_current_job")
     def test_import_project_annotations_efficiency(self, mock_current_job):
         mock_current_job.return_value = Mock(spec=RQJob, meta=dict())
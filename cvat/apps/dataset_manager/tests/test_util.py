@@ -9,7 +9,14 @@ from datumaro.components.dataset import Dataset
 from datumaro.components.errors import DatasetError, DatasetImportError, DatasetNotFoundError
 from django.test import SimpleTestCase
 
-from cvat.apps.dataset_manager.util import format_exception_chain, format_import_exception
+from cvat.apps.dataset_manager.util import (
+    ConstructedFileId,
+    ExportCacheManager,
+    ExportFileType,
+    InstanceType,
+    format_exception_chain,
+    format_import_exception,
+)
 
 
 class FormatExceptionChainTest(SimpleTestCase):
@@ -137,3 +144,24 @@ class FormatImportExceptionTest(SimpleTestCase):
         message = format_import_exception(c.exception)
         self.assertIn("Failed to import dataset 'yolo'", message)
         self.assertIn("obj.names", message)
+
+
+class ExportCacheManagerTest(SimpleTestCase):
+    def test_can_parse_annotations_fragment_file_path(self):
+        file_path = ExportCacheManager.make_annotations_fragment_file_path(
+            instance_type="Task",
+            instance_id=42,
+            instance_timestamp=1700000000.5,
+            labels_signature="0123456789abcdef",
+        )
+
+        parsed_filename = ExportCacheManager.parse_filename(osp.basename(file_path))
+
+        self.assertEqual(parsed_filename.file_type, ExportFileType.ANNOTATIONS_FRAGMENT)
+        self.assertEqual(parsed_filename.file_ext, "jsonl")
+        self.assertEqual(
+            parsed_filename.file_id,
+            ConstructedFileId(
+                instance_type=InstanceType.TASK, instance_id=42, instance_timestamp=1700000000.5
+            ),
+        )
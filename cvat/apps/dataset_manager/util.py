@@ -197,6 +197,7 @@ class OperationType(str, Enum):
 
 class ExportFileType(str, Enum):
     ANNOTATIONS = "annotations"
+    ANNOTATIONS_FRAGMENT = "annotations_fragment"
     BACKUP = "backup"
     DATASET = "dataset"
     EVENTS = "events"
@@ -366,6 +367,44 @@ class ExportCacheManager:
         )
         return osp.join(cls.ROOT, filename)
 
+    @classmethod
+    def make_annotations_fragment_file_path(
+        cls,
+        *,
+        instance_type: str,
+        instance_id: int,
+        instance_timestamp: float,
+        labels_signature: str,
+    ) -> str:
+        instance_type = InstanceType(instance_type.lower())
+        filename = cls.FILE_NAME_TEMPLATE_WITH_INSTANCE.format(
+            instance_type=instance_type,
+            instance_id=instance_id,
+            file_type=ExportFileType.ANNOTATIONS_FRAGMENT,
+            instance_timestamp=instance_timestamp,
+            optional_suffix=cls.SPLITTER + labels_signature,
+            file_ext="jsonl",
+        )
+        return osp.join(cls.ROOT, filename)
+
+    @classmethod
+    def find_annotations_fragment_files(cls, *, instance_type: str, instance_id: int) -> list[str]:
+        "Returns the paths of all the stored annotations fragments of the instance"
+
+        filename_prefix = cls.SPLITTER.join(
+            [
+                InstanceType(instance_type.lower()),
+                str(instance_id),
+                ExportFileType.ANNOTATIONS_FRAGMENT,
+                cls.INSTANCE_PREFIX,
+            ]
+        )
+        return [
+            osp.join(cls.ROOT, filename)
+            for filename in os.listdir(cls.ROOT)
+            if filename.startswith(filename_prefix)
+        ]
+
     @classmethod
     def make_file_path(
         cls,
@@ -413,8 +452,12 @@ class ExportCacheManager:
             unparsed = fragments.pop("unparsed")[len(cls.INSTANCE_PREFIX) :]
             instance_timestamp = unparsed
 
-            if fragments["file_type"] in (ExportFileType.DATASET, ExportFileType.ANNOTATIONS):
-                # The "format" is a part of file id, but there is actually
+            if fragments["file_type"] in (
+                ExportFileType.DATASET,
+                ExportFileType.ANNOTATIONS,
+                ExportFileType.ANNOTATIONS_FRAGMENT,
+            ):
+                # The "format" (or the labels signature) is a part of file id, but there is actually
                 # no need to use it after filename parsing, so just drop it.
                 instance_timestamp, _ = unparsed.split(cls.SPLITTER, maxsplit=1)
             elif fragments["file_type"] == ExportFileType.BACKUP:
@@ -9,14 +9,18 @@ import io
 import os
 import os.path
 import pickle  # nosec
+import random
 import tempfile
+import threading
 import time
 import zipfile
 import zlib
 from collections.abc import Callable, Collection, Generator, Iterator, Sequence
 from contextlib import ExitStack, closing
 from datetime import datetime, timezone
-from itertools import groupby, pairwise
+from enum import Enum
+from functools import cache
+from itertools import chain, groupby, islice, pairwise
 from pathlib import Path, PurePath
 from typing import Any, TypeAlias, overload
 
@@ -36,6 +40,7 @@ from rq.job import JobStatus as RQJobStatus
 
 from cvat.apps.engine import models
 from cvat.apps.engine.cache_signals import cache_item_created_signal, cache_item_read_signal
+from cvat.apps.engine.local_cache import LocalCacheStats, SizeBoundedLRUCache
 from cvat.apps.engine.log import ServerLogManager
 from cvat.apps.engine.media_extractors import (
     ImageReaderWithManifest,
@@ -51,6 +56,7 @@ from cvat.apps.engine.utils import (
     format_list,
     get_rq_lock_for_job,
     md5_hash,
+    take_by,
 )
 from cvat.utils import django_database as db_utils
 from cvat.utils.paths import join_untrusted_path
@@ -61,8 +67,23 @@ slogger = ServerLogManager(__name__)
 
 
 DataWithMime: TypeAlias = tuple[io.BytesIO, str]
-_CacheItem: TypeAlias = tuple[io.BytesIO, str, int, datetime | None]
+_CacheItemDigest: TypeAlias = tuple[int, int]
+"(data size, partial checksum)"
+
+_CacheItem: TypeAlias = (
+    tuple[io.BytesIO, str, int, datetime | None]
+    | tuple[io.BytesIO, str, int, datetime | None, _CacheItemDigest]
+)
+_StoredCacheItem: TypeAlias = (
+    tuple[bytes, str, int, datetime | None]
+    | tuple[bytes, str, int, datetime | None, _CacheItemDigest]
+)
+"""
+The item representation in caches. The data is kept as bytes, so that it can be
+wrapped into BytesIO without copying. Older items can contain BytesIO instead.
+"""
 _RQ_JOB_ORIGIN_ATTRIBUTE = "origin"
+_RQ_JOB_PREFETCH_META_FIELD = "prefetch"
 
 ASSETS_DIR = Path(__file__).parent / "assets"
 
@@ -71,6 +92,20 @@ class CacheTooLargeDataError(Exception):
     pass
 
 
+class CacheIntegrityCheckMode(str, Enum):
+    FULL = "full"
+    "The checksum of the whole item is checked on each read"
+
+    SAMPLED = "sampled"
+    "The item size is checked on each read, the checksum - only on a fraction of reads"
+
+    PARTIAL = "partial"
+    "The item size and the checksum of the item head and tail are checked on each read"
+
+    def __str__(self) -> str:
+        return self.value
+
+
 class ChunkCreationError(Exception):
     pass
 
@@ -98,6 +133,7 @@ def enqueue_create_chunk_job(
     *,
     rq_job_result_ttl: int = 60,
     rq_job_failure_ttl: int = 3600 * 24 * 14,  # 2 weeks
+    prefetch: bool = False,
 ) -> rq.job.Job:
     try:
         with get_rq_lock_for_job(queue, rq_job_id):
@@ -115,13 +151,65 @@ def enqueue_create_chunk_job(
                     job_id=rq_job_id,
                     result_ttl=rq_job_result_ttl,
                     failure_ttl=rq_job_failure_ttl,
+                    meta={_RQ_JOB_PREFETCH_META_FIELD: True} if prefetch else None,
                 )
+            elif not prefetch:
+                _move_prefetch_job_to_queue_head(queue, rq_job)
     except LockError:
         raise TimeoutError(f"Cannot acquire lock for {rq_job_id}")
 
     return rq_job
 
 
+def _move_prefetch_job_to_queue_head(queue: rq.Queue, rq_job: rq.job.Job) -> None:
+    if (
+        rq_job.meta.get(_RQ_JOB_PREFETCH_META_FIELD)
+        and rq_job.get_status(refresh=False) == RQJobStatus.QUEUED
+    ):
+        # Somebody is waiting for the prefetched item now, move the job
+        # to the queue head, so that it's not processed after other prefetches.
+        # If the job has just been taken by a worker, it's not in the queue anymore.
+        if queue.remove(rq_job):
+            queue.push_job_id(rq_job.id, at_front=True)
+
+
+_ACTIVE_RQ_JOB_STATUSES = (
+    RQJobStatus.QUEUED,
+    RQJobStatus.DEFERRED,
+    RQJobStatus.SCHEDULED,
+    RQJobStatus.STARTED,
+)
+
+
+class _ChunkPrefetchLimiter:
+    """
+    Limits the number of unfinished chunk prefetching jobs, enqueued by the current process
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._job_ids: list[str] = []
+
+    def try_acquire(self, queue: rq.Queue) -> bool:
+        with self._lock:
+            max_jobs = settings.CVAT_CHUNK_PREFETCH_MAX_JOBS_PER_WORKER
+            if len(self._job_ids) >= max_jobs:
+                self._job_ids = [
+                    rq_job.id
+                    for rq_job in rq.job.Job.fetch_many(self._job_ids, connection=queue.connection)
+                    if rq_job and rq_job.get_status(refresh=False) in _ACTIVE_RQ_JOB_STATUSES
+                ]
+
+            return len(self._job_ids) < max_jobs
+
+    def add(self, rq_job: rq.job.Job):
+        with self._lock:
+            self._job_ids.append(rq_job.id)
+
+
+_chunk_prefetch_limiter = _ChunkPrefetchLimiter()
+
+
 def wait_for_rq_job(rq_job: rq.job.Job):
     retries = settings.CVAT_CHUNK_CREATE_TIMEOUT // settings.CVAT_CHUNK_CREATE_CHECK_INTERVAL or 1
     while retries > 0:
@@ -139,6 +227,16 @@ def wait_for_rq_job(rq_job: rq.job.Job):
     raise TimeoutError(f"Chunk processing takes too long {rq_job.id}")
 
 
+@cache
+def _get_local_media_cache() -> SizeBoundedLRUCache[_StoredCacheItem]:
+    return SizeBoundedLRUCache(
+        max_size=settings.MEDIA_CACHE_LOCAL_TIER_MAX_SIZE,
+        max_item_size=settings.MEDIA_CACHE_LOCAL_TIER_MAX_ITEM_SIZE,
+        ttl=settings.MEDIA_CACHE_LOCAL_TIER_TTL,
+        get_item_size=lambda item: len(item[0]),
+    )
+
+
 def _is_run_inside_rq() -> bool:
     return rq.get_current_job() is not None
 
@@ -192,20 +290,139 @@ class Callback:
 class MediaCache:
     _QUEUE_NAME = settings.CVAT_QUEUES.CHUNKS.value
     _QUEUE_JOB_PREFIX_TASK = "chunks:prepare-item-"
+    _QUEUE_JOB_GROUP_REF_PREFIX = "chunks:prepare-item-group-of-"
+    _QUEUE_JOB_GROUP_REF_TTL = 3600
+    _SEGMENT_CHUNK_GROUP_MAX_SIZE = 10
+    "The maximum number of segment chunks prepared in one pass over the source media"
     _CACHE_NAME = "media"
     _PREVIEW_TTL = settings.CVAT_PREVIEW_CACHE_TTL
 
+    _PARTIAL_CHECKSUM_BLOCK_SIZE = 64 * 1024
+    "The number of bytes from the item head and tail, used for the partial checksum computation"
+
     @staticmethod
     def _cache():
         return caches[MediaCache._CACHE_NAME]
 
     @staticmethod
-    def _get_checksum(value: bytes) -> int:
+    def _get_checksum(value: bytes | memoryview) -> int:
         return zlib.crc32(value)
 
+    @classmethod
+    def _get_partial_checksum(cls, value: bytes | memoryview) -> int:
+        value = memoryview(value)
+        block_size = cls._PARTIAL_CHECKSUM_BLOCK_SIZE
+        checksum = zlib.crc32(str(len(value)).encode())
+        checksum = zlib.crc32(value[:block_size], checksum)
+        return zlib.crc32(value[max(block_size, len(value) - block_size) :], checksum)
+
+    @classmethod
+    def _get_digest(cls, value: bytes | memoryview) -> _CacheItemDigest:
+        return (len(value), cls._get_partial_checksum(value))
+
+    @classmethod
+    def _check_item_integrity(
+        cls, item: _CacheItem | _StoredCacheItem, *, mode: CacheIntegrityCheckMode
+    ) -> tuple[bool, CacheIntegrityCheckMode]:
+        """
+        Checks that the item data is not corrupted.
+
+        Returns the check result and the check mode actually used. Items without a digest
+        (created before digests were introduced) are always checked fully.
+        """
+
+        item_data = cls._get_item_data_view(item)
+        item_checksum = item[2] if len(item) >= 4 else None
+        item_digest = item[4] if len(item) >= 5 else None
+
+        if not item_digest:
+            mode = CacheIntegrityCheckMode.FULL
+
+        if mode == CacheIntegrityCheckMode.SAMPLED:
+            # Size checks allow to detect truncated values in any case
+            if item_digest[0] != len(item_data):
+                return False, mode
+
+            if random.random() >= settings.MEDIA_CACHE_INTEGRITY_CHECK_SAMPLE_RATE:  # nosec
+                return True, mode
+
+            mode = CacheIntegrityCheckMode.FULL
+
+        if mode == CacheIntegrityCheckMode.PARTIAL:
+            return item_digest == cls._get_digest(item_data), mode
+
+        return item_checksum == cls._get_checksum(item_data), mode
+
+    @staticmethod
+    def _get_item_data_view(item: _CacheItem | _StoredCacheItem) -> memoryview:
+        """
+        Returns the item data without copying it.
+
+        BytesIO.getbuffer() copies the data if the buffer is shared with a bytes object,
+        which is the case for all the items returned from the cache,
+        while getvalue() returns the shared object as is.
+        """
+
+        item_data = item[0]
+        if isinstance(item_data, io.BytesIO):
+            item_data = item_data.getvalue()
+
+        return memoryview(item_data)
+
+    @classmethod
+    def _get_cache_item_size(cls, item: _CacheItem | _StoredCacheItem) -> int:
+        return cls._get_item_data_view(item).nbytes
+
+    @staticmethod
+    def _make_stored_cache_item(item: _CacheItem) -> _StoredCacheItem:
+        return (item[0].getvalue(), *item[1:])
+
+    @staticmethod
+    def _load_stored_cache_item(item: _StoredCacheItem | _CacheItem) -> _CacheItem:
+        if isinstance(item[0], io.BytesIO):
+            return item
+
+        # BytesIO doesn't copy the initial bytes until they are modified
+        return (io.BytesIO(item[0]), *item[1:])
+
     @staticmethod
-    def _get_cache_item_size(item: _CacheItem) -> int:
-        return item[0].getbuffer().nbytes
+    def _local_cache() -> SizeBoundedLRUCache[_StoredCacheItem]:
+        return _get_local_media_cache()
+
+    @classmethod
+    def get_local_cache_stats(cls) -> LocalCacheStats:
+        """
+        Returns hit/miss counters of the in-process cache tier of the current process
+        """
+        return cls._local_cache().get_stats()
+
+    @classmethod
+    def invalidate_local_cache_item(cls, key: str) -> None:
+        cls._local_cache().delete(key)
+
+    @classmethod
+    def _get_local_cache_item(cls, key: str) -> _CacheItem | None:
+        local_cache = cls._local_cache()
+        if not local_cache.enabled:
+            return None
+
+        local_item = local_cache.get(key)
+        if local_item is None:
+            return None
+
+        return cls._load_stored_cache_item(local_item)
+
+    @classmethod
+    def _set_local_cache_item(cls, key: str, item: _CacheItem) -> _CacheItem:
+        local_cache = cls._local_cache()
+        if not local_cache.enabled:
+            return item
+
+        stored_item = cls._make_stored_cache_item(item)
+        if not local_cache.set(key, stored_item):
+            return item
+
+        return cls._load_stored_cache_item(stored_item)
 
     def _get_or_set_cache_item(
         self,
@@ -232,6 +449,51 @@ class MediaCache:
     def _make_queue_job_id(cls, key: str) -> str:
         return f"{cls._QUEUE_JOB_PREFIX_TASK}{key}"
 
+    @classmethod
+    def _make_queue_job_group_ref(cls, key: str) -> str:
+        return f"{cls._QUEUE_JOB_GROUP_REF_PREFIX}{key}"
+
+    def _enqueue_create_cache_items_job(
+        self, queue: rq.Queue, keys: Sequence[str], job_callback: Callback, *, prefetch: bool
+    ) -> rq.job.Job:
+        """
+        Enqueues a job creating several items. The job uses the job id of the first item.
+        The other items refer to the job, so that requests for them wait for this job
+        instead of enqueuing another one.
+        """
+
+        rq_job = enqueue_create_chunk_job(
+            queue=queue,
+            rq_job_id=self._make_queue_job_id(keys[0]),
+            create_callback=job_callback,
+            prefetch=prefetch,
+        )
+
+        if len(keys) > 1:
+            with queue.connection.pipeline() as pipe:
+                for key in keys[1:]:
+                    pipe.set(
+                        self._make_queue_job_group_ref(key),
+                        rq_job.id,
+                        ex=self._QUEUE_JOB_GROUP_REF_TTL,
+                    )
+                pipe.execute()
+
+        return rq_job
+
+    def _get_active_group_job(self, queue: rq.Queue, key: str) -> rq.job.Job | None:
+        "Returns the unfinished job creating the item together with other items, if any"
+
+        rq_job_id = queue.connection.get(self._make_queue_job_group_ref(key))
+        if not rq_job_id:
+            return None
+
+        rq_job = queue.fetch_job(rq_job_id.decode())
+        if not rq_job or rq_job.get_status(refresh=False) not in _ACTIVE_RQ_JOB_STATUSES:
+            return None
+
+        return rq_job
+
     @staticmethod
     def _drop_return_value(func: Callable[..., DataWithMime], *args: Any, **kwargs: Any):
         func(*args, **kwargs)
@@ -244,9 +506,45 @@ class MediaCache:
         cache_item_ttl: int | None = None,
     ) -> DataWithMime:
         timestamp = django_tz.now()
-        item_data = create_callback()
+        return cls._set_cache_item(
+            key, create_callback(), timestamp=timestamp, cache_item_ttl=cache_item_ttl
+        )
+
+    @classmethod
+    def _create_and_set_cache_items(
+        cls,
+        keys: Sequence[str],
+        create_callback: Callback,
+        cache_item_ttl: int | None = None,
+    ) -> list[_CacheItem]:
+        "Creates several items at once. The callback must return item data in the keys order"
+
+        timestamp = django_tz.now()
+        items_data = create_callback()
+        assert len(items_data) == len(keys)
+
+        return [
+            cls._set_cache_item(key, item_data, timestamp=timestamp, cache_item_ttl=cache_item_ttl)
+            for key, item_data in zip(keys, items_data)
+        ]
+
+    @classmethod
+    def _set_cache_item(
+        cls,
+        key: str,
+        item_data: DataWithMime,
+        *,
+        timestamp: datetime,
+        cache_item_ttl: int | None = None,
+    ) -> _CacheItem:
         item_data_bytes = item_data[0].getvalue()
-        item = (item_data[0], item_data[1], cls._get_checksum(item_data_bytes), timestamp)
+        item = (
+            item_data[0],
+            item_data[1],
+            cls._get_checksum(item_data_bytes),
+            timestamp,
+            cls._get_digest(item_data_bytes),
+        )
 
         # allow empty data to be set in cache to prevent
         # future rq jobs from being enqueued to prepare the item
@@ -257,6 +555,7 @@ class MediaCache:
         ):
             cached_item = cache.get(key)
             if cached_item is not None:
+                cached_item = cls._load_stored_cache_item(cached_item)
                 cache_item_read_signal.send(
                     sender=cls,
                     item_key=key,
@@ -273,7 +572,11 @@ class MediaCache:
                         f"Chunk data size {item_size} exceeds the maximum allowed size "
                         f"{settings.CVAT_CACHE_ITEM_MAX_SIZE}."
                     )
-                cache.set(key, item, timeout=cache_item_ttl or cache.default_timeout)
+                cache.set(
+                    key,
+                    cls._make_stored_cache_item(item),
+                    timeout=cache_item_ttl or cache.default_timeout,
+                )
 
                 cache_item_created_signal.send(
                     sender=cls,
@@ -299,38 +602,128 @@ class MediaCache:
                 cache_item_ttl=cache_item_ttl,
             )
         else:
-            rq_job = enqueue_create_chunk_job(
-                queue=self._get_queue(),
-                rq_job_id=self._make_queue_job_id(key),
-                create_callback=Callback(
-                    callable=self._drop_return_value,
-                    args=[
-                        self._create_and_set_cache_item,
-                        key,
-                        create_callback,
-                    ],
-                    kwargs={
-                        "cache_item_ttl": cache_item_ttl,
-                    },
-                ),
-            )
-            wait_for_rq_job(rq_job)
-            item = self._get_cache_item(key)
+            queue = self._get_queue()
+
+            item = None
+            if group_rq_job := self._get_active_group_job(queue, key):
+                with get_rq_lock_for_job(queue, group_rq_job.id):
+                    _move_prefetch_job_to_queue_head(queue, group_rq_job)
+
+                wait_for_rq_job(group_rq_job)
+                item = self._get_cache_item(key)
+
+            if not item:
+                rq_job = enqueue_create_chunk_job(
+                    queue=queue,
+                    rq_job_id=self._make_queue_job_id(key),
+                    create_callback=self._make_create_cache_item_job_callback(
+                        key, create_callback, cache_item_ttl=cache_item_ttl
+                    ),
+                )
+                wait_for_rq_job(rq_job)
+                item = self._get_cache_item(key)
 
         slogger.glob.info(f"Ending to prepare chunk: key {key}")
 
         return item
 
+    def _create_cache_items(
+        self, keys: Sequence[str], create_callback: Callback
+    ) -> list[_CacheItem | None]:
+        "Creates several items at once. The callback must return item data in the keys order"
+
+        slogger.glob.info(f"Starting to prepare chunks: keys {format_list(keys)}")
+        if _is_run_inside_rq():
+            items = self._create_and_set_cache_items(keys, create_callback)
+        else:
+            rq_job = self._enqueue_create_cache_items_job(
+                self._get_queue(),
+                keys,
+                self._make_create_cache_items_job_callback(keys, create_callback),
+                prefetch=False,
+            )
+            wait_for_rq_job(rq_job)
+            items = [self._get_cache_item(key) for key in keys]
+
+        slogger.glob.info(f"Ending to prepare chunks: keys {format_list(keys)}")
+
+        return items
+
+    def _make_create_cache_item_job_callback(
+        self, key: str, create_callback: Callback, *, cache_item_ttl: int | None = None
+    ) -> Callback:
+        return Callback(
+            callable=self._drop_return_value,
+            args=[
+                self._create_and_set_cache_item,
+                key,
+                create_callback,
+            ],
+            kwargs={
+                "cache_item_ttl": cache_item_ttl,
+            },
+        )
+
+    def _make_create_cache_items_job_callback(
+        self, keys: Sequence[str], create_callback: Callback
+    ) -> Callback:
+        return Callback(
+            callable=self._drop_return_value,
+            args=[
+                self._create_and_set_cache_items,
+                list(keys),
+                create_callback,
+            ],
+        )
+
+    def _prefetch_cache_item(self, key: str, create_callback: Callback) -> bool:
+        """
+        Enqueues preparation of the item in the background, if it's not in the cache yet.
+        Returns False if the limit of prefetching jobs of the current process is reached.
+        """
+
+        if self._is_cached(key):
+            return True
+
+        return self._enqueue_prefetch_job(
+            [key], self._make_create_cache_item_job_callback(key, create_callback)
+        )
+
+    def _is_cached(self, key: str) -> bool:
+        return key in self._local_cache() or self._has_key(key)
+
+    def _enqueue_prefetch_job(self, keys: Sequence[str], job_callback: Callback) -> bool:
+        queue = self._get_queue()
+        if not _chunk_prefetch_limiter.try_acquire(queue):
+            return False
+
+        rq_job = self._enqueue_create_cache_items_job(queue, keys, job_callback, prefetch=True)
+        _chunk_prefetch_limiter.add(rq_job)
+        slogger.glob.info(f"Enqueued chunk prefetching: keys {format_list(keys)}")
+        return True
+
     def _delete_cache_item(self, key: str):
+        self._local_cache().delete(key)
         self._cache().delete(key)
         slogger.glob.info(f"Removed the cache key {key}")
 
     def _bulk_delete_cache_items(self, keys: Sequence[str]):
+        self._local_cache().delete_many(keys)
         self._cache().delete_many(keys)
         slogger.glob.info(f"Removed the cache keys {format_list(keys)}")
 
     def _get_cache_item(self, key: str) -> _CacheItem | None:
         rq_queue = _get_current_rq_queue_name()
+
+        if item := self._get_local_cache_item(key):
+            cache_item_read_signal.send(
+                sender=self.__class__,
+                item_key=key,
+                item_data_size=self._get_cache_item_size(item),
+                rq_queue=rq_queue,
+            )
+            return item
+
         try:
             item = self._cache().get(key)
         except pickle.UnpicklingError:
@@ -340,25 +733,34 @@ class MediaCache:
         if not item:
             return None
 
-        item_data = item[0].getbuffer() if isinstance(item[0], io.BytesIO) else item[0]
-        item_checksum = item[2] if len(item) == 4 else None
+        check_start_time = time.thread_time()
+        is_valid, integrity_check_mode = self._check_item_integrity(
+            item, mode=CacheIntegrityCheckMode(settings.MEDIA_CACHE_INTEGRITY_CHECK_MODE)
+        )
+        integrity_check_time = time.thread_time() - check_start_time
+
         cache_item_read_signal.send(
             sender=self.__class__,
             item_key=key,
             item_data_size=self._get_cache_item_size(item),
             rq_queue=rq_queue,
+            integrity_check_mode=str(integrity_check_mode),
+            integrity_check_time=integrity_check_time,
         )
 
-        if item_checksum != self._get_checksum(item_data):
+        if not is_valid:
             slogger.glob.info(f"Cache item {key} checksum mismatch")
             return None
 
-        return item
+        return self._set_local_cache_item(key, self._load_stored_cache_item(item))
 
     def _validate_cache_item_timestamp(
-        self, item: _CacheItem, expected_timestamp: datetime
+        self, key: str, item: _CacheItem, expected_timestamp: datetime
     ) -> _CacheItem:
         if item[3] < expected_timestamp:
+            # The item could be updated by another process, the local copy is outdated
+            self._local_cache().delete(key)
+
             raise CvatChunkTimestampMismatchError(
                 f"Cache timestamp mismatch. Item_ts: {item[3]}, expected_ts: {expected_timestamp}"
             )
@@ -432,20 +834,181 @@ class MediaCache:
         self, db_segment: models.Segment, chunk_number: int, *, quality: models.FrameQuality
     ) -> DataWithMime:
 
-        item = self._get_or_set_cache_item(
-            self._make_chunk_key(db_segment, chunk_number, quality=quality),
-            Callback(
-                callable=self.prepare_segment_chunk,
-                args=[db_segment, chunk_number],
-                kwargs={"quality": quality},
-            ),
+        key = self._make_chunk_key(db_segment, chunk_number, quality=quality)
+        item = self._get_cache_item(key) or self._create_segment_chunk_cache_item(
+            db_segment, chunk_number, quality=quality
         )
         db_segment.refresh_from_db(fields=["chunks_updated_date"])
 
         return self._to_data_with_mime(
-            self._validate_cache_item_timestamp(item, db_segment.chunks_updated_date)
+            self._validate_cache_item_timestamp(key, item, db_segment.chunks_updated_date)
         )
 
+    def _create_segment_chunk_cache_item(
+        self, db_segment: models.Segment, chunk_number: int, *, quality: models.FrameQuality
+    ) -> _CacheItem:
+        key = self._make_chunk_key(db_segment, chunk_number, quality=quality)
+
+        other_qualities = []
+        if settings.CVAT_CHUNK_BUILD_ALL_QUALITIES:
+            other_qualities = [
+                other_quality
+                for other_quality in models.FrameQuality
+                if other_quality != quality
+                and not self._is_cached(
+                    self._make_chunk_key(db_segment, chunk_number, quality=other_quality)
+                )
+            ]
+
+        if not other_qualities:
+            return self._create_cache_item(
+                key, self._make_segment_chunk_callback(db_segment, chunk_number, quality=quality)
+            )
+
+        targets = [(chunk_number, quality)] + [
+            (chunk_number, other_quality) for other_quality in other_qualities
+        ]
+        item = self._create_cache_items(
+            [
+                self._make_chunk_key(db_segment, target_chunk, quality=target_quality)
+                for target_chunk, target_quality in targets
+            ],
+            self._make_segment_chunks_callback(db_segment, targets),
+        )[0]
+
+        # The job could be enqueued before for this chunk only, or the item could be removed
+        return item or self._create_cache_item(
+            key, self._make_segment_chunk_callback(db_segment, chunk_number, quality=quality)
+        )
+
+    def _make_segment_chunk_callback(
+        self, db_segment: models.Segment, chunk_number: int, *, quality: models.FrameQuality
+    ) -> Callback:
+        return Callback(
+            callable=self.prepare_segment_chunk,
+            args=[db_segment, chunk_number],
+            kwargs={"quality": quality},
+        )
+
+    def _make_segment_chunks_callback(
+        self, db_segment: models.Segment, targets: Sequence[tuple[int, models.FrameQuality]]
+    ) -> Callback:
+        return Callback(
+            callable=self.prepare_segment_chunks,
+            args=[
+                db_segment,
+                [[chunk_number, int(quality)] for chunk_number, quality in targets],
+            ],
+        )
+
+    def _group_consecutive_segment_chunks(self, chunk_numbers: Sequence[int]) -> list[list[int]]:
+        """
+        Splits the chunks into groups of consecutive chunks, which can be prepared together.
+        The groups are returned in the order of their first chunks in the input.
+        """
+
+        chunk_groups = [
+            group_part
+            for _, group in groupby(enumerate(sorted(chunk_numbers)), key=lambda v: v[1] - v[0])
+            for group_part in take_by(
+                [chunk_number for _, chunk_number in group], self._SEGMENT_CHUNK_GROUP_MAX_SIZE
+            )
+        ]
+        chunk_groups.sort(key=lambda group: chunk_numbers.index(group[0]))
+        return chunk_groups
+
+    def prefetch_segment_chunks(
+        self,
+        db_segment: models.Segment,
+        chunk_numbers: Sequence[int],
+        *,
+        quality: models.FrameQuality,
+    ) -> None:
+        """
+        Enqueues background preparation of the segment chunks missing in the cache.
+        The chunks are processed in the specified order.
+        Consecutive chunks are prepared together, reading the source media once.
+        """
+
+        if _is_run_inside_rq():
+            return
+
+        queue = self._get_queue()
+
+        def _is_missing(chunk_number: int) -> bool:
+            key = self._make_chunk_key(db_segment, chunk_number, quality=quality)
+            return not self._is_cached(key) and not self._get_active_group_job(queue, key)
+
+        missing_chunks = [
+            chunk_number for chunk_number in chunk_numbers if _is_missing(chunk_number)
+        ]
+
+        for chunk_group in self._group_consecutive_segment_chunks(missing_chunks):
+            keys = [
+                self._make_chunk_key(db_segment, chunk_number, quality=quality)
+                for chunk_number in chunk_group
+            ]
+
+            if len(chunk_group) == 1:
+                job_callback = self._make_create_cache_item_job_callback(
+                    keys[0],
+                    self._make_segment_chunk_callback(db_segment, chunk_group[0], quality=quality),
+                )
+            else:
+                job_callback = self._make_create_cache_items_job_callback(
+                    keys,
+                    self._make_segment_chunks_callback(
+                        db_segment, [(chunk_number, quality) for chunk_number in chunk_group]
+                    ),
+                )
+
+            if not self._enqueue_prefetch_job(keys, job_callback):
+                break
+
+    def prepare_segment_chunks_if_missing(
+        self,
+        db_segment: models.Segment,
+        chunk_numbers: Sequence[int],
+        *,
+        quality: models.FrameQuality,
+    ) -> None:
+        """
+        Creates the segment chunks missing in the cache and waits for them.
+        Unlike prefetching, the call doesn't return until the chunks are available.
+        Consecutive chunks are prepared together, reading the source media once.
+        """
+
+        missing_chunks = [
+            chunk_number
+            for chunk_number in chunk_numbers
+            if not self._is_cached(self._make_chunk_key(db_segment, chunk_number, quality=quality))
+        ]
+
+        for chunk_group in self._group_consecutive_segment_chunks(missing_chunks):
+            keys = [
+                self._make_chunk_key(db_segment, chunk_number, quality=quality)
+                for chunk_number in chunk_group
+            ]
+
+            items = [None] * len(keys)
+            if len(chunk_group) > 1:
+                items = self._create_cache_items(
+                    keys,
+                    self._make_segment_chunks_callback(
+                        db_segment, [(chunk_number, quality) for chunk_number in chunk_group]
+                    ),
+                )
+
+            for chunk_number, key, item in zip(chunk_group, keys, items):
+                if not item:
+                    # A single chunk, or it was being prepared by another job
+                    self._create_cache_item(
+                        key,
+                        self._make_segment_chunk_callback(
+                            db_segment, chunk_number, quality=quality
+                        ),
+                    )
+
     def get_task_chunk(
         self, db_task: models.Task, chunk_number: int, *, quality: models.FrameQuality
     ) -> DataWithMime | None:
@@ -465,10 +1028,8 @@ class MediaCache:
         quality: models.FrameQuality,
     ) -> DataWithMime:
 
-        item = self._get_or_set_cache_item(
-            self._make_chunk_key(db_task, chunk_number, quality=quality),
-            set_callback,
-        )
+        key = self._make_chunk_key(db_task, chunk_number, quality=quality)
+        item = self._get_or_set_cache_item(key, set_callback)
 
         if db_utils.is_field_cached(db_task, "segment_set"):
             # Refresh segments to report actual dates if they were fetched previously
@@ -476,7 +1037,26 @@ class MediaCache:
             db_task.refresh_from_db(fields=["segment_set"])
 
         return self._to_data_with_mime(
-            self._validate_cache_item_timestamp(item, db_task.get_chunks_updated_date())
+            self._validate_cache_item_timestamp(key, item, db_task.get_chunks_updated_date())
+        )
+
+    def prefetch_task_chunk(
+        self,
+        db_task: models.Task,
+        chunk_number: int,
+        set_callback: Callback,
+        *,
+        quality: models.FrameQuality,
+    ) -> None:
+        """
+        Enqueues background preparation of the task chunk, if it's missing in the cache
+        """
+
+        if _is_run_inside_rq():
+            return
+
+        self._prefetch_cache_item(
+            self._make_chunk_key(db_task, chunk_number, quality=quality), set_callback
         )
 
     def get_segment_task_chunk(
@@ -498,14 +1078,12 @@ class MediaCache:
         set_callback: Callback,
     ) -> DataWithMime:
 
-        item = self._get_or_set_cache_item(
-            self._make_segment_task_chunk_key(db_segment, chunk_number, quality=quality),
-            set_callback,
-        )
+        key = self._make_segment_task_chunk_key(db_segment, chunk_number, quality=quality)
+        item = self._get_or_set_cache_item(key, set_callback)
         db_segment.refresh_from_db(fields=["chunks_updated_date"])
 
         return self._to_data_with_mime(
-            self._validate_cache_item_timestamp(item, db_segment.chunks_updated_date),
+            self._validate_cache_item_timestamp(key, item, db_segment.chunks_updated_date),
         )
 
     def get_or_set_selective_job_chunk(
@@ -852,6 +1430,70 @@ class MediaCache:
         else:
             assert False, f"Unknown segment type {db_segment.type}"
 
+    def prepare_segment_chunks(
+        self,
+        db_segment: models.Segment | int,
+        targets: Sequence[Sequence[int]],
+    ) -> list[DataWithMime]:
+        """
+        Prepares several chunks of the segment.
+
+        The targets are (chunk number, quality) pairs. For consecutive chunks
+        and for different qualities of the same chunk, the source media is read
+        and decoded once. Returns the chunks in the targets order.
+        """
+
+        if isinstance(db_segment, int):
+            db_segment = models.Segment.objects.get(pk=db_segment)
+
+        targets = [
+            (int(chunk_number), models.FrameQuality(quality)) for chunk_number, quality in targets
+        ]
+
+        db_task = db_segment.task
+        if (
+            db_segment.type != models.SegmentType.RANGE
+            or db_task.media_type != models.MediaType.IMAGE
+        ):
+            return [
+                self.prepare_segment_chunk(db_segment, chunk_number, quality=quality)
+                for chunk_number, quality in targets
+            ]
+
+        from cvat.apps.engine.media_io.frame_provider import prepare_image_chunk
+
+        chunk_size = db_task.require_data().chunk_size
+        segment_frames = db_segment.frame_set
+
+        chunk_qualities: dict[int, list[models.FrameQuality]] = {}
+        for chunk_number, quality in targets:
+            chunk_qualities.setdefault(chunk_number, []).append(quality)
+
+        results: dict[tuple[int, models.FrameQuality], DataWithMime] = {}
+        for _, group in groupby(enumerate(sorted(chunk_qualities)), key=lambda v: v[1] - v[0]):
+            chunk_frame_ids = {
+                chunk_number: segment_frames[
+                    chunk_size * chunk_number : chunk_size * (chunk_number + 1)
+                ]
+                for _, chunk_number in group
+            }
+
+            with closing(
+                self._read_raw_frames(
+                    db_task, frame_ids=list(chain.from_iterable(chunk_frame_ids.values()))
+                )
+            ) as frame_iter:
+                for chunk_number, frame_ids in chunk_frame_ids.items():
+                    # Keep the chunk frames to pass them to each chunk writer
+                    chunk_frames = list(islice(frame_iter, len(frame_ids)))
+
+                    for quality in chunk_qualities[chunk_number]:
+                        results[(chunk_number, quality)] = prepare_image_chunk(
+                            chunk_frames, quality=quality, db_task=db_task
+                        )
+
+        return [results[target] for target in targets]
+
     def prepare_range_segment_chunk(
         self, db_segment: models.Segment, chunk_number: int, *, quality: models.FrameQuality
     ) -> DataWithMime:
@@ -118,3 +118,164 @@ if DEFAULT_BACKING_CS_ID:
     DEFAULT_BACKING_CS_ID = int(DEFAULT_BACKING_CS_ID)
 else:
     DEFAULT_BACKING_CS_ID = None
+
+MEDIA_CACHE_LOCAL_TIER_MAX_SIZE = int(os.getenv("CVAT_MEDIA_CACHE_LOCAL_TIER_MAX_SIZE", 0))
+"""
+Sets the maximum total size in bytes of the in-process media cache tier.
+The tier keeps recently served chunks and previews in the memory of each server process,
+in front of the shared media cache. Set to 0 to disable the tier.
+"""
+
+MEDIA_CACHE_LOCAL_TIER_MAX_ITEM_SIZE = int(
+    os.getenv("CVAT_MEDIA_CACHE_LOCAL_TIER_MAX_ITEM_SIZE", 32 * 1024 * 1024)
+)
+"""
+Sets the maximum size in bytes of a single item in the in-process media cache tier.
+Bigger items are only stored in the shared media cache.
+"""
+
+MEDIA_CACHE_LOCAL_TIER_TTL = int(os.getenv("CVAT_MEDIA_CACHE_LOCAL_TIER_TTL", 60))
+"""
+Sets the lifetime in seconds of items in the in-process media cache tier.
+Limits the time a process can serve an item that was removed or updated by another process.
+"""
+
+MEDIA_CACHE_INTEGRITY_CHECK_MODE = os.getenv("CVAT_MEDIA_CACHE_INTEGRITY_CHECK_MODE", "full")
+"""
+Sets the way media cache items are checked for corruption on reads:
+- full - the checksum of the whole item is checked on each read
+- sampled - the item size is checked on each read, the full checksum is checked
+  on a fraction of reads (see MEDIA_CACHE_INTEGRITY_CHECK_SAMPLE_RATE)
+- partial - the item size and the checksum of the item head and tail are checked on each read
+
+The full checksum is always computed when an item is written.
+"""
+if MEDIA_CACHE_INTEGRITY_CHECK_MODE not in ("full", "sampled", "partial"):
+    raise ImproperlyConfigured(
+        f"Unknown MEDIA_CACHE_INTEGRITY_CHECK_MODE value '{MEDIA_CACHE_INTEGRITY_CHECK_MODE}'"
+    )
+
+MEDIA_CACHE_INTEGRITY_CHECK_SAMPLE_RATE = float(
+    os.getenv("CVAT_MEDIA_CACHE_INTEGRITY_CHECK_SAMPLE_RATE", 0.05)
+)
+"""
+Sets the fraction of reads with the full checksum check in the "sampled" integrity check mode
+"""
+if not (0 <= MEDIA_CACHE_INTEGRITY_CHECK_SAMPLE_RATE <= 1):
+    raise ImproperlyConfigured("MEDIA_CACHE_INTEGRITY_CHECK_SAMPLE_RATE must be in [0; 1]")
+
+CVAT_CHUNK_PREFETCH_FORWARD = int(os.getenv("CVAT_CHUNK_PREFETCH_FORWARD", 1))
+"""
+Sets the number of the next job chunks, which are prepared in the background
+when a job chunk is requested. Set to 0 to disable.
+"""
+
+CVAT_CHUNK_PREFETCH_BACKWARD = int(os.getenv("CVAT_CHUNK_PREFETCH_BACKWARD", 1))
+"""
+Sets the number of the previous job chunks, which are prepared in the background
+when a job chunk is requested. Set to 0 to disable.
+"""
+
+CVAT_CHUNK_PREFETCH_MAX_JOBS_PER_WORKER = int(
+    os.getenv("CVAT_CHUNK_PREFETCH_MAX_JOBS_PER_WORKER", 2)
+)
+"""
+Sets the maximum number of unfinished chunk prefetching jobs enqueued by one server process.
+Limits the chunk queue load from prefetching, so that it doesn't delay requested chunks.
+"""
+
+CVAT_CHUNK_BUILD_ALL_QUALITIES = to_bool(os.getenv("CVAT_CHUNK_BUILD_ALL_QUALITIES", False))
+"""
+Sets whether the missing chunks of the other quality are built together with
+a requested job chunk, reading and decoding the source media once.
+Useful when clients request both the compressed and the original chunks.
+"""
+
+CVAT_CHUNK_ENCODING_THREADS = int(os.getenv("CVAT_CHUNK_ENCODING_THREADS", 1))
+"""
+Sets the number of threads used to compress images in compressed image chunks.
+"""
+
+CVAT_ANNOTATION_POINTS_STORAGE_FORMAT = os.getenv("CVAT_ANNOTATION_POINTS_STORAGE_FORMAT", "text")
+"""
+Sets the format used to store shape points in the database:
+- text - comma-separated values
+- float64 - packed binary values, lossless, much faster to read and write
+- float32 - packed binary values, smaller, but with reduced precision
+
+Points are read in any of these formats, so the setting can be changed at any time.
+Existing annotations can be converted with the "convertannotationpoints" command.
+"""
+if CVAT_ANNOTATION_POINTS_STORAGE_FORMAT not in ("text", "float32", "float64"):
+    raise ImproperlyConfigured(
+        "Unknown CVAT_ANNOTATION_POINTS_STORAGE_FORMAT value "
+        f"'{CVAT_ANNOTATION_POINTS_STORAGE_FORMAT}'"
+    )
+
+ANNOTATIONS_RESPONSE_CACHE_TTL = int(os.getenv("CVAT_ANNOTATIONS_RESPONSE_CACHE_TTL", 0))
+"""
+Sets the lifetime in seconds of cached job annotation responses.
+Repeated requests of unchanged job annotations are served from the cache.
+The responses are stored in the shared "default" cache. Disabled by default (0).
+"""
+
+ANNOTATIONS_RESPONSE_CACHE_MAX_ITEM_SIZE = int(
+    os.getenv("CVAT_ANNOTATIONS_RESPONSE_CACHE_MAX_ITEM_SIZE", 4 * 1024 * 1024)
+)
+"""
+Sets the maximum size in bytes of a cached job annotations response.
+Bigger responses are not cached.
+"""
+
+ANNOTATIONS_RESPONSE_CACHE_COMPRESSION = to_bool(
+    os.getenv("CVAT_ANNOTATIONS_RESPONSE_CACHE_COMPRESSION", True)
+)
+"""
+Enables gzip compression of cached job annotation responses.
+Compressed responses are sent as is to the clients supporting gzip.
+"""
+
+PROJECT_EXPORT_CONCURRENCY = int(os.getenv("CVAT_PROJECT_EXPORT_CONCURRENCY", 4))
+"""
+Sets the number of project tasks whose media is prepared in parallel for a project dataset export.
+Missing media chunks are created in the chunk workers, if they are available,
+or in the export worker. Set to 1 to prepare the task media sequentially.
+"""
+if PROJECT_EXPORT_CONCURRENCY < 1:
+    raise ImproperlyConfigured(
+        f"PROJECT_EXPORT_CONCURRENCY must be >= 1, got {PROJECT_EXPORT_CONCURRENCY}"
+    )
+
+ANNOTATION_IMPORT_BATCH_SIZE = int(os.getenv("CVAT_ANNOTATION_IMPORT_BATCH_SIZE", 30000))
+"""
+Sets the number of imported annotations (tags, shapes and track shapes) kept in memory
+before they are saved to the DB. The batches are saved in the same transaction,
+so an import is still applied or rolled back as a whole.
+For projects, the limit is split between the project tasks.
+"""
+if ANNOTATION_IMPORT_BATCH_SIZE < 1:
+    raise ImproperlyConfigured(
+        f"ANNOTATION_IMPORT_BATCH_SIZE must be >= 1, got {ANNOTATION_IMPORT_BATCH_SIZE}"
+    )
+
+ANNOTATION_DB_COPY_THRESHOLD = int(os.getenv("CVAT_ANNOTATION_DB_COPY_THRESHOLD", 0))
+"""
+Enables writing the created shapes, tracks and their attributes with the PostgreSQL COPY
+command, when at least this number of rows is written at once. This is faster than
+the regular bulk inserts for big annotation imports. Set to 0 to disable.
+"""
+if ANNOTATION_DB_COPY_THRESHOLD < 0:
+    raise ImproperlyConfigured(
+        f"ANNOTATION_DB_COPY_THRESHOLD must be >= 0, got {ANNOTATION_DB_COPY_THRESHOLD}"
+    )
+
+EXPORT_FRAME_BUFFER_SIZE = int(os.getenv("CVAT_EXPORT_FRAME_BUFFER_SIZE", 8))
+"""
+Sets the number of the last read task frames kept in memory during a dataset export.
+The frames are read in the frame order, the buffer allows the exporters
+to request the frames slightly out of order without reading the chunks again.
+"""
+if EXPORT_FRAME_BUFFER_SIZE < 0:
+    raise ImproperlyConfigured(
+        f"EXPORT_FRAME_BUFFER_SIZE must be >= 0, got {EXPORT_FRAME_BUFFER_SIZE}"
+    )
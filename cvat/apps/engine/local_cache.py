@@ -0,0 +1,150 @@
+# Copyright (C) CVAT.ai Corporation
+#
+# SPDX-License-Identifier: MIT
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from typing import Generic, TypeVar
+
+import attrs
+
+T = TypeVar("T")
+
+
+@attrs.frozen
+class LocalCacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    items: int
+    size: int
+    max_size: int
+
+
+@attrs.define
+class _LocalCacheEntry(Generic[T]):
+    value: T
+    size: int
+    expires_at: float | None
+
+
+class SizeBoundedLRUCache(Generic[T]):
+    """
+    A thread-safe in-process LRU cache, bounded by the total size of the stored values.
+
+    The cache is intended to be used as a small hot tier in front of a shared (remote) cache.
+    Items are not shared between processes, so each item can have a TTL to limit the time
+    an outdated value can be served after it was changed in another process.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_size: int,
+        max_item_size: int | None = None,
+        ttl: float | None = None,
+        get_item_size: Callable[[T], int],
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if max_size < 0:
+            raise ValueError("max_size must be non-negative")
+
+        self._max_size = max_size
+        self._max_item_size = max_size if max_item_size is None else min(max_item_size, max_size)
+        self._ttl = ttl
+        self._get_item_size = get_item_size
+        self._clock = clock
+
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, _LocalCacheEntry[T]] = OrderedDict()
+        self._size = 0
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._max_size > 0
+
+    def get(self, key: str) -> T | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at is not None:
+                if entry.expires_at <= self._clock():
+                    self._pop(key)
+                    entry = None
+
+            if entry is None:
+                self._misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry.value
+
+    def set(self, key: str, value: T) -> bool:
+        """
+        Puts the value into the cache, evicting the least recently used items if needed.
+        Returns False if the value is too big to be stored.
+        """
+
+        item_size = self._get_item_size(value)
+
+        with self._lock:
+            self._pop(key)
+
+            if not self.enabled or self._max_item_size < item_size:
+                return False
+
+            while self._entries and self._max_size < self._size + item_size:
+                self._pop(next(iter(self._entries)))
+                self._evictions += 1
+
+            expires_at = self._clock() + self._ttl if self._ttl else None
+            self._entries[key] = _LocalCacheEntry(
+                value=value, size=item_size, expires_at=expires_at
+            )
+            self._size += item_size
+
+        return True
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._pop(key)
+
+    def delete_many(self, keys: Iterable[str]) -> None:
+        with self._lock:
+            for key in keys:
+                self._pop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def get_stats(self) -> LocalCacheStats:
+        with self._lock:
+            return LocalCacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                items=len(self._entries),
+                size=self._size,
+                max_size=self._max_size,
+            )
+
+    def _pop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= entry.size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
@@ -0,0 +1,157 @@
+# Copyright (C) CVAT.ai Corporation
+#
+# SPDX-License-Identifier: MIT
+
+import statistics
+import time
+from copy import deepcopy
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import override_settings
+
+from cvat.apps.dataset_manager.task import JobAnnotation
+from cvat.apps.engine.models import Job, LabelType, ShapeType, SourceType
+
+
+class Command(BaseCommand):
+    help = (
+        "The command measures the time of writing job annotations to the DB "
+        "with the regular bulk inserts and with the PostgreSQL COPY command. "
+        "The created annotations are rolled back."
+    )
+
+    WRITE_MODES = {
+        # mode name -> ANNOTATION_DB_COPY_THRESHOLD
+        "bulk_create": 0,
+        "copy": 1,
+    }
+
+    def add_arguments(self, parser):
+        parser.add_argument("job_id", type=int, help="The job to create the annotations in")
+        parser.add_argument(
+            "--shapes", type=int, default=10000, help="The number of shapes created"
+        )
+        parser.add_argument("--tracks", type=int, default=1000, help="The number of tracks created")
+        parser.add_argument(
+            "--track-length", type=int, default=10, help="The number of shapes in each track"
+        )
+        parser.add_argument(
+            "--repeats", type=int, default=3, help="The number of measurements for each mode"
+        )
+
+    def handle(self, *args, **options):
+        try:
+            annotation = JobAnnotation(options["job_id"])
+        except Job.DoesNotExist as ex:
+            raise CommandError(f"Job #{options['job_id']} does not exist") from ex
+
+        if connection.vendor != "postgresql":
+            self.stderr.write(
+                self.style.WARNING(
+                    f"The COPY command is not supported by the {connection.vendor!r} DB backend, "
+                    "the regular bulk inserts are used in all modes"
+                )
+            )
+
+        data = self._make_annotations(
+            annotation,
+            shapes=options["shapes"],
+            tracks=options["tracks"],
+            track_length=options["track_length"],
+        )
+        row_count = self._count_rows(data)
+
+        for mode, copy_threshold in self.WRITE_MODES.items():
+            durations = []
+            for _ in range(options["repeats"]):
+                run_data = deepcopy(data)
+
+                with override_settings(ANNOTATION_DB_COPY_THRESHOLD=copy_threshold):
+                    with transaction.atomic():
+                        time_before = time.perf_counter()
+                        annotation._create(run_data)
+                        durations.append(time.perf_counter() - time_before)
+
+                        transaction.set_rollback(True)
+
+            best_duration = min(durations)
+            self.stdout.write(
+                f"{mode}: {row_count} rows; "
+                f"best {best_duration:.3f} s, mean {statistics.mean(durations):.3f} s "
+                f"({row_count / best_duration:.0f} rows/s)"
+            )
+
+    @staticmethod
+    def _make_annotations(
+        annotation: JobAnnotation, *, shapes: int, tracks: int, track_length: int
+    ) -> dict:
+        label_id = next(
+            (
+                db_label.id
+                for db_label in annotation.db_labels.values()
+                if db_label.parent_id is None and db_label.type != str(LabelType.SKELETON)
+            ),
+            None,
+        )
+        if label_id is None:
+            raise CommandError("The job has no labels suitable for the benchmark")
+
+        def _make_attributes(attr_type: str) -> list[dict]:
+            return [
+                {"spec_id": spec_id, "value": default_value.value}
+                for spec_id, default_value in annotation.db_attributes[label_id][attr_type].items()
+            ]
+
+        frames = range(annotation.start_frame, annotation.stop_frame + 1)
+
+        def _make_shape(index: int) -> dict:
+            return {
+                "type": str(ShapeType.RECTANGLE),
+                "frame": frames[index % len(frames)],
+                "occluded": False,
+                "outside": False,
+                "z_order": 0,
+                "points": [index % 100, 10.5, index % 100 + 20, 30.5],
+                "rotation": 0,
+            }
+
+        return {
+            "version": 0,
+            "tags": [],
+            "shapes": [
+                {
+                    **_make_shape(i),
+                    "label_id": label_id,
+                    "group": 0,
+                    "source": str(SourceType.MANUAL),
+                    "attributes": _make_attributes("all"),
+                }
+                for i in range(shapes)
+            ],
+            "tracks": [
+                {
+                    "frame": frames[0],
+                    "label_id": label_id,
+                    "group": 0,
+                    "source": str(SourceType.MANUAL),
+                    "attributes": _make_attributes("immutable"),
+                    "shapes": [
+                        {**_make_shape(i), "attributes": _make_attributes("mutable")}
+                        for i in range(track_length)
+                    ],
+                }
+                for _ in range(tracks)
+            ],
+            "intervals": [],
+        }
+
+    @staticmethod
+    def _count_rows(data: dict) -> int:
+        row_count = sum(1 + len(shape["attributes"]) for shape in data["shapes"])
+
+        for track in data["tracks"]:
+            row_count += 1 + len(track["attributes"])
+            row_count += sum(1 + len(shape["attributes"]) for shape in track["shapes"])
+
+        return row_count
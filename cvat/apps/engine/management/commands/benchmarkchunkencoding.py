@@ -0,0 +1,77 @@
+# Copyright (C) CVAT.ai Corporation
+#
+# SPDX-License-Identifier: MIT
+
+import io
+import os
+import statistics
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand
+from PIL import Image
+
+from cvat.apps.engine.media_extractors import ZipCompressedChunkWriter
+from cvat.apps.engine.models import DimensionType
+
+
+class Command(BaseCommand):
+    help = (
+        "The command measures the time of writing compressed image chunks "
+        "with different numbers of image encoding threads"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--threads",
+            type=int,
+            nargs="+",
+            default=sorted({1, 2, 4, os.cpu_count() or 1}),
+            help="The numbers of image encoding threads",
+        )
+        parser.add_argument(
+            "--images", type=int, default=72, help="The number of images in the chunk"
+        )
+        parser.add_argument(
+            "--image-size",
+            type=int,
+            nargs=2,
+            default=[1920, 1080],
+            metavar=("WIDTH", "HEIGHT"),
+            help="The image size",
+        )
+        parser.add_argument("--quality", type=int, default=70, help="The image quality")
+        parser.add_argument(
+            "--repeats", type=int, default=3, help="The number of measurements for each case"
+        )
+
+    def handle(self, *args, **options):
+        image_w, image_h = options["image_size"]
+        rng = np.random.default_rng(0)
+        images = [
+            (
+                Image.fromarray(rng.integers(0, 256, (image_h, image_w, 3), dtype=np.uint8)),
+                f"image_{i}.png",
+            )
+            for i in range(options["images"])
+        ]
+
+        for encoding_threads in options["threads"]:
+            writer = ZipCompressedChunkWriter(
+                quality=options["quality"],
+                dimension=DimensionType.DIM_2D,
+                encoding_threads=encoding_threads,
+            )
+
+            durations = []
+            for _ in range(options["repeats"]):
+                time_before = time.perf_counter()
+                writer.save_as_chunk(iter(images), io.BytesIO())
+                durations.append(time.perf_counter() - time_before)
+
+            best_duration = min(durations)
+            self.stdout.write(
+                f"{encoding_threads} threads: "
+                f"best {best_duration:.3f} s, mean {statistics.mean(durations):.3f} s "
+                f"({len(images) / best_duration:.1f} images/s)"
+            )
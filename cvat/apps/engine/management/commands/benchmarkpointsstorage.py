@@ -0,0 +1,61 @@
+# Copyright (C) CVAT.ai Corporation
+#
+# SPDX-License-Identifier: MIT
+
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+
+from cvat.apps.engine.models import FloatArrayField, FloatArrayStorageFormat
+
+
+class Command(BaseCommand):
+    help = (
+        "The command measures the time of encoding and decoding shape points "
+        "in each of the supported DB storage formats"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--shapes", type=int, default=10000, help="The number of shapes")
+        parser.add_argument(
+            "--points", type=int, default=25, help="The number of points in each shape"
+        )
+        parser.add_argument(
+            "--repeats", type=int, default=3, help="The number of measurements for each format"
+        )
+
+    def handle(self, *args, **options):
+        rng = random.Random(0)
+        shapes = [
+            [rng.uniform(0, 4000) for _ in range(2 * options["points"])]
+            for _ in range(options["shapes"])
+        ]
+        field = FloatArrayField(default=[], allow_packed_storage=True)
+
+        for storage_format in FloatArrayStorageFormat:
+            write_durations = []
+            read_durations = []
+
+            with override_settings(CVAT_ANNOTATION_POINTS_STORAGE_FORMAT=str(storage_format)):
+                for _ in range(options["repeats"]):
+                    time_before = time.perf_counter()
+                    encoded_shapes = [field.get_prep_value(shape) for shape in shapes]
+                    write_durations.append(time.perf_counter() - time_before)
+
+                    time_before = time.perf_counter()
+                    for encoded_shape in encoded_shapes:
+                        # LazyList values are parsed only on access
+                        list(field.from_db_value(encoded_shape, None, None))
+                    read_durations.append(time.perf_counter() - time_before)
+
+            self.stdout.write(
+                f"{storage_format}: "
+                f"write best {min(write_durations):.3f} s, "
+                f"mean {statistics.mean(write_durations):.3f} s; "
+                f"read best {min(read_durations):.3f} s, "
+                f"mean {statistics.mean(read_durations):.3f} s; "
+                f"size {sum(map(len, encoded_shapes)) / 2**20:.1f} MiB"
+            )
@@ -0,0 +1,85 @@
+# Copyright (C) CVAT.ai Corporation
+#
+# SPDX-License-Identifier: MIT
+
+import operator
+from functools import reduce
+
+from django.core.management.base import BaseCommand
+from django.db import models, transaction
+from django.db.models import Q
+from django.db.models.functions import Cast
+
+from cvat.apps.engine.models import (
+    FloatArrayField,
+    FloatArrayStorageFormat,
+    LabeledShape,
+    TrackedShape,
+)
+from cvat.apps.engine.utils import take_by
+
+
+class Command(BaseCommand):
+    help = (
+        "The command converts stored shape points into the specified storage format. "
+        "Note that the conversion into the 'float32' format reduces the points precision."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "storage_format",
+            choices=[str(f) for f in FloatArrayStorageFormat],
+            help="The target storage format",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="The number of shapes updated in one transaction",
+        )
+
+    def handle(self, *args, **options):
+        storage_format = FloatArrayStorageFormat(options["storage_format"])
+        batch_size = options["batch_size"]
+        packed_value_prefixes = [
+            FloatArrayField.get_packed_value_prefix(f)
+            for f in FloatArrayStorageFormat
+            if f != FloatArrayStorageFormat.TEXT
+        ]
+
+        for Model in [LabeledShape, TrackedShape]:
+            total = 0
+            self.stdout.write(f"Started for {Model.__name__}")
+
+            queryset = Model.objects.annotate(
+                # the raw values, without decoding
+                raw_points=Cast("points", output_field=models.TextField())
+            ).exclude(raw_points="")
+            if storage_format == FloatArrayStorageFormat.TEXT:
+                queryset = queryset.filter(
+                    reduce(
+                        operator.or_,
+                        (Q(raw_points__startswith=prefix) for prefix in packed_value_prefixes),
+                    )
+                )
+            else:
+                queryset = queryset.exclude(
+                    raw_points__startswith=FloatArrayField.get_packed_value_prefix(storage_format)
+                )
+
+            ids = queryset.order_by("id").values_list("id", flat=True).iterator()
+            for batch_ids in take_by(ids, batch_size):
+                with transaction.atomic():
+                    db_shapes = list(
+                        Model.objects.filter(id__in=batch_ids)
+                        .select_for_update()
+                        .only("id", "points")
+                    )
+                    for db_shape in db_shapes:
+                        db_shape.points = FloatArrayField.encode(db_shape.points, storage_format)
+                    Model.objects.bulk_update(db_shapes, ["points"])
+
+                total += len(db_shapes)
+                self.stdout.write(f"\tProcessed {total} shapes")
+
+            self.stdout.write(f"Finished for {Model.__name__}")
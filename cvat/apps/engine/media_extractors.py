@@ -13,7 +13,9 @@ import tempfile
 import zipfile
 from abc import ABC, abstractmethod
 from bisect import bisect
+from collections import deque
 from collections.abc import Callable, Generator, Iterable, Iterator, Sequence
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
 from contextlib import ExitStack, closing, contextmanager
 from dataclasses import dataclass
 from enum import Enum, IntEnum
@@ -28,6 +30,7 @@ import av.codec
 import av.container
 import av.video.stream
 import numpy as np
+from django.conf import settings
 from natsort import os_sorted
 from PIL import Image, ImageFile, ImageOps
 from rest_framework.exceptions import ValidationError
@@ -147,6 +150,7 @@ def get_video_chapters(
 
 
 _T = TypeVar("_T")
+_T2 = TypeVar("_T2")
 
 
 class RandomAccessIterator(Iterator[_T]):
@@ -1031,6 +1035,33 @@ class AudioReader(IMediaReader):
             return stream.codec.canonical_name
 
 
+def _map_ordered(
+    func: Callable[[_T], _T2],
+    items: Iterable[_T],
+    *,
+    executor: Executor,
+    max_pending: int,
+) -> Generator[_T2, None, None]:
+    """
+    Like executor.map(), but returns results in the input order
+    and reads no more than max_pending input items ahead of the results
+    """
+
+    pending: deque[Future[_T2]] = deque()
+    try:
+        for item in items:
+            pending.append(executor.submit(func, item))
+
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+
+
 class IChunkWriter(ABC):
     CHUNK_MIME_TYPE: ClassVar[str]
 
@@ -1119,6 +1150,20 @@ class ZipChunkWriter(IChunkWriter):
 
 
 class ZipCompressedChunkWriter(ZipChunkWriter):
+    def __init__(
+        self, *, quality: int, dimension: DimensionType, encoding_threads: int | None = None
+    ) -> None:
+        """
+        encoding_threads - the number of threads used to compress images.
+            If not set, the CVAT_CHUNK_ENCODING_THREADS setting value is used.
+        """
+
+        super().__init__(quality=quality, dimension=dimension)
+
+        if encoding_threads is None:
+            encoding_threads = settings.CVAT_CHUNK_ENCODING_THREADS
+        self._encoding_threads = max(1, encoding_threads)
+
     def _validate_configuration(self):
         assert self._dimension in (DimensionType.DIM_2D, DimensionType.DIM_3D)
 
@@ -1182,30 +1227,63 @@ class ZipCompressedChunkWriter(ZipChunkWriter):
         compress_frames: bool = True,
         zip_compress_level: int = 0,
     ) -> None:
-        with zipfile.ZipFile(chunk_path, "x", compresslevel=zip_compress_level) as zip_chunk:
-            for idx, (image, path) in enumerate(images):
-                if self._dimension == DimensionType.DIM_2D:
-                    if compress_frames:
-                        try:
-                            image_buf = self._compress_image(image, self._quality)
-                        except Exception as ex:
-                            if path is None:
-                                raise
-
-                            raise RuntimeError(
-                                f"Exception occurred during compression of image {os.path.basename(path)!r}"
-                            ) from ex
-                    else:
-                        assert isinstance(image, io.IOBase)
-                        image_buf = io.BytesIO(image.read())
-                    extension = self.IMAGE_EXT
+        def prepare_chunk_item(
+            image: Image.Image | io.IOBase | str, path: str | None
+        ) -> tuple[io.BytesIO, str]:
+            if self._dimension == DimensionType.DIM_2D:
+                if compress_frames:
+                    try:
+                        image_buf = self._compress_image(image, self._quality)
+                    except Exception as ex:
+                        if path is None:
+                            raise
+
+                        raise RuntimeError(
+                            f"Exception occurred during compression of image {os.path.basename(path)!r}"
+                        ) from ex
                 else:
-                    if isinstance(image, io.BytesIO):
-                        image_buf, extension = self._write_pcd_file(image)
-                    else:
-                        assert path is not None
-                        image_buf, extension = self._write_pcd_file(path)
+                    assert isinstance(image, io.IOBase)
+                    image_buf = io.BytesIO(image.read())
+                extension = self.IMAGE_EXT
+            else:
+                if isinstance(image, io.BytesIO):
+                    image_buf, extension = self._write_pcd_file(image)
+                else:
+                    assert path is not None
+                    image_buf, extension = self._write_pcd_file(path)
+
+            return image_buf, extension
+
+        with ExitStack() as es:
+            zip_chunk = es.enter_context(
+                zipfile.ZipFile(chunk_path, "x", compresslevel=zip_compress_level)
+            )
+
+            if (
+                self._encoding_threads > 1
+                and compress_frames
+                and self._dimension == DimensionType.DIM_2D
+            ):
+                executor = es.enter_context(
+                    ThreadPoolExecutor(
+                        max_workers=self._encoding_threads, thread_name_prefix="chunk-encoding"
+                    )
+                )
+                chunk_items = es.enter_context(
+                    closing(
+                        _map_ordered(
+                            lambda item: prepare_chunk_item(*item),
+                            images,
+                            executor=executor,
+                            # Limit the number of decoded images kept in memory
+                            max_pending=2 * self._encoding_threads,
+                        )
+                    )
+                )
+            else:
+                chunk_items = itertools.starmap(prepare_chunk_item, images)
 
+            for idx, (image_buf, extension) in enumerate(chunk_items):
                 arcname = "{:06d}.{}".format(idx, extension)
                 zip_chunk.writestr(arcname, image_buf.getvalue())
 
@@ -11,14 +11,17 @@ import math
 from abc import ABCMeta, abstractmethod
 from bisect import bisect
 from collections import OrderedDict
-from collections.abc import Callable, Iterator, Sequence
+from collections.abc import Callable, Generator, Iterable, Iterator, Sequence
 from enum import Enum, auto
+from functools import partial
 from io import BytesIO
+from pathlib import Path
 from typing import Any, TypeAlias, overload
 
 import av
 import cv2
 import numpy as np
+from django.conf import settings
 from django.db.models import prefetch_related_objects
 from PIL import Image
 from rest_framework.exceptions import ValidationError
@@ -35,6 +38,7 @@ from cvat.apps.engine.media_extractors import (
     ZipChunkWriter,
     ZipCompressedChunkWriter,
     ZipReader,
+    has_exif_rotation,
 )
 from cvat.apps.engine.media_io.media_chunks import (
     BufferChunkLoader,
@@ -50,6 +54,7 @@ from cvat.apps.engine.media_io.media_provider import (
 )
 from cvat.apps.engine.mime_types import mimetypes
 from cvat.apps.engine.utils import take_by
+from cvat.utils.paths import join_untrusted_path
 
 _ReaderFactory: TypeAlias = Callable[[BytesIO], IMediaReader]
 
@@ -118,6 +123,18 @@ class _BufferChunkLoader(_ChunkLoader):
         return self.get_chunk(chunk_id)
 
 
+def _get_chunks_to_prefetch(chunk_number: int, *, last_chunk: int) -> list[int]:
+    "Returns the chunks to be prepared in the background, in the order of preparation"
+
+    next_chunks = range(
+        chunk_number + 1, min(chunk_number + settings.CVAT_CHUNK_PREFETCH_FORWARD, last_chunk) + 1
+    )
+    previous_chunks = range(
+        chunk_number - 1, max(chunk_number - settings.CVAT_CHUNK_PREFETCH_BACKWARD, 0) - 1, -1
+    )
+    return [*next_chunks, *previous_chunks]
+
+
 class FrameOutputType(Enum):
     BUFFER = auto()
     PIL = auto()
@@ -218,8 +235,11 @@ class TaskFrameProvider(IFrameProvider):
 
         return frame_number
 
+    def _get_last_chunk_number(self) -> int:
+        return math.ceil(self._db_task.data.size / self._db_task.data.chunk_size) - 1
+
     def validate_chunk_number(self, chunk_number: int) -> int:
-        last_chunk = math.ceil(self._db_task.data.size / self._db_task.data.chunk_size) - 1
+        last_chunk = self._get_last_chunk_number()
         if not 0 <= chunk_number <= last_chunk:
             raise ValidationError(
                 f"Invalid chunk number '{chunk_number}'. "
@@ -256,11 +276,111 @@ class TaskFrameProvider(IFrameProvider):
         if cached_chunk:
             return return_type(cached_chunk[0], cached_chunk[1])
 
+        task_chunk_frame_set = self._get_chunk_frame_set(chunk_number)
+        matching_segments = self._get_chunk_matching_segments(task_chunk_frame_set)
+
+        # Don't put this into set_callback to avoid data duplication in the cache
+
+        if len(matching_segments) == 1:
+            segment_frame_provider = SegmentFrameProvider(matching_segments[0])
+            matching_chunk_index = segment_frame_provider.find_matching_chunk(
+                sorted(task_chunk_frame_set)
+            )
+            if matching_chunk_index is not None:
+                # The requested frames match one of the job chunks, we can use it directly
+                return segment_frame_provider.get_chunk(matching_chunk_index, quality=quality)
+
+        buffer, mime_type = cache.get_or_set_task_chunk(
+            self._db_task,
+            chunk_number,
+            quality=quality,
+            set_callback=self._make_chunk_create_callback(
+                task_chunk_frame_set, matching_segments, quality=quality
+            ),
+        )
+
+        return return_type(data=buffer, mime=mime_type)
+
+    def prefetch_chunks(
+        self, chunk_number: int, *, quality: models.FrameQuality = models.FrameQuality.ORIGINAL
+    ) -> None:
+        if self._db_task.data.storage_method != models.StorageMethodChoice.CACHE:
+            return
+
+        cache = MediaCache()
+
+        for prefetched_chunk_number in _get_chunks_to_prefetch(
+            chunk_number, last_chunk=self._get_last_chunk_number()
+        ):
+            task_chunk_frame_set = self._get_chunk_frame_set(prefetched_chunk_number)
+            matching_segments = self._get_chunk_matching_segments(task_chunk_frame_set)
+
+            if len(matching_segments) == 1:
+                matching_chunk_index = SegmentFrameProvider(
+                    matching_segments[0]
+                ).find_matching_chunk(sorted(task_chunk_frame_set))
+                if matching_chunk_index is not None:
+                    cache.prefetch_segment_chunks(
+                        matching_segments[0], [matching_chunk_index], quality=quality
+                    )
+                    continue
+
+            cache.prefetch_task_chunk(
+                self._db_task,
+                prefetched_chunk_number,
+                quality=quality,
+                set_callback=self._make_chunk_create_callback(
+                    task_chunk_frame_set, matching_segments, quality=quality
+                ),
+            )
+
+    def prepare_frame_chunks(
+        self,
+        frame_numbers: Iterable[int],
+        *,
+        quality: models.FrameQuality = models.FrameQuality.ORIGINAL,
+    ) -> None:
+        """
+        Makes sure the segment chunks with the requested frames are available in the media cache,
+        so that reading these frames doesn't need chunk creation.
+        Does nothing for tasks with static chunks.
+        """
+
+        db_data = self._db_task.require_data()
+        if db_data.storage_method != models.StorageMethodChoice.CACHE:
+            return
+
+        remaining_frames = set(
+            self.get_abs_frame_number(self.validate_frame_number(frame)) for frame in frame_numbers
+        )
+
+        cache = MediaCache()
+
+        # Same segment selection as in _get_segment()
+        for db_segment in sorted(
+            self._db_task.segment_set.all(), key=lambda s: s.type != models.SegmentType.RANGE
+        ):
+            if not remaining_frames:
+                break
+
+            segment_frames = sorted(db_segment.frame_set)
+            chunk_numbers = sorted(
+                set(
+                    frame_index // db_data.chunk_size
+                    for frame_index, frame in enumerate(segment_frames)
+                    if frame in remaining_frames
+                )
+            )
+            remaining_frames.difference_update(segment_frames)
+
+            cache.prepare_segment_chunks_if_missing(db_segment, chunk_numbers, quality=quality)
+
+    def _get_chunk_frame_set(self, chunk_number: int) -> set[int]:
         db_data = self._db_task.require_data()
         step = db_data.get_frame_step()
         task_chunk_start_frame = chunk_number * db_data.chunk_size
         task_chunk_stop_frame = (chunk_number + 1) * db_data.chunk_size - 1
-        task_chunk_frame_set = set(
+        return set(
             range(
                 db_data.start_frame + task_chunk_start_frame * step,
                 min(db_data.start_frame + task_chunk_stop_frame * step, db_data.stop_frame) + step,
@@ -268,6 +388,7 @@ class TaskFrameProvider(IFrameProvider):
             )
         )
 
+    def _get_chunk_matching_segments(self, task_chunk_frame_set: set[int]) -> list[models.Segment]:
         matching_segments: list[models.Segment] = sorted(
             [
                 s
@@ -281,34 +402,25 @@ class TaskFrameProvider(IFrameProvider):
         )
         assert matching_segments
 
-        # Don't put this into set_callback to avoid data duplication in the cache
+        return matching_segments
 
-        if len(matching_segments) == 1:
-            segment_frame_provider = SegmentFrameProvider(matching_segments[0])
-            matching_chunk_index = segment_frame_provider.find_matching_chunk(
-                sorted(task_chunk_frame_set)
-            )
-            if matching_chunk_index is not None:
-                # The requested frames match one of the job chunks, we can use it directly
-                return segment_frame_provider.get_chunk(matching_chunk_index, quality=quality)
-
-        buffer, mime_type = cache.get_or_set_task_chunk(
-            self._db_task,
-            chunk_number,
-            quality=quality,
-            set_callback=Callback(
-                callable=self._get_chunk_create_callback,
-                args=[
-                    self._db_task,
-                    matching_segments,
-                    {f: self.get_rel_frame_number(f) for f in task_chunk_frame_set},
-                    quality,
-                ],
-            ),
+    def _make_chunk_create_callback(
+        self,
+        task_chunk_frame_set: set[int],
+        matching_segments: list[models.Segment],
+        *,
+        quality: models.FrameQuality,
+    ) -> Callback:
+        return Callback(
+            callable=self._get_chunk_create_callback,
+            args=[
+                self._db_task,
+                matching_segments,
+                {f: self.get_rel_frame_number(f) for f in task_chunk_frame_set},
+                quality,
+            ],
         )
 
-        return return_type(data=buffer, mime=mime_type)
-
     @staticmethod
     def _get_chunk_create_callback(
         db_task: models.Task | int,
@@ -396,6 +508,111 @@ class TaskFrameProvider(IFrameProvider):
 
             yield db_segment_frame_provider.get_frame(idx, quality=quality, out_type=out_type)
 
+    def get_frames(
+        self,
+        frame_numbers: Iterable[int],
+        *,
+        quality: models.FrameQuality = models.FrameQuality.ORIGINAL,
+        out_type: FrameOutputType = FrameOutputType.BUFFER,
+    ) -> Iterator[tuple[int, DataWithMeta[AnyFrame]]]:
+        """
+        Returns the requested frames in the frame order, as (frame number, frame) pairs.
+        The frames are read chunk by chunk, each required chunk is loaded and decoded once.
+        """
+
+        frame_loaders = self.get_frame_loaders(frame_numbers, quality=quality, out_type=out_type)
+        try:
+            for frame_number, frame_loader in frame_loaders:
+                yield frame_number, frame_loader()
+        finally:
+            frame_loaders.close()
+
+    def get_frame_loaders(
+        self,
+        frame_numbers: Iterable[int],
+        *,
+        quality: models.FrameQuality = models.FrameQuality.ORIGINAL,
+        out_type: FrameOutputType = FrameOutputType.BUFFER,
+    ) -> Generator[tuple[int, Callable[[], DataWithMeta[AnyFrame]]], None, None]:
+        """
+        Same as get_frames(), but returns the frames in the raw form, as
+        (frame number, frame loader) pairs. The loaders convert the frames into the
+        requested output type, so the conversion can be skipped for the unused frames.
+        The loaders remain usable after iteration.
+        """
+
+        db_segment_frame_set = None
+        db_segment_frame_provider = None
+        try:
+            for frame_number in sorted(set(map(self.validate_frame_number, frame_numbers))):
+                if (
+                    db_segment_frame_set is None
+                    or self.get_abs_frame_number(frame_number) not in db_segment_frame_set
+                ):
+                    if db_segment_frame_provider:
+                        db_segment_frame_provider.unload()
+
+                    db_segment = self._get_segment(frame_number)
+                    db_segment_frame_set = set(db_segment.frame_set)
+                    db_segment_frame_provider = SegmentFrameProvider(db_segment)
+
+                frame, frame_name = db_segment_frame_provider._get_raw_frame(
+                    frame_number, quality=quality
+                )
+                yield frame_number, partial(
+                    db_segment_frame_provider._make_frame, frame, frame_name, out_type=out_type
+                )
+        finally:
+            if db_segment_frame_provider:
+                db_segment_frame_provider.unload()
+
+    def get_original_image_paths(self, frame_numbers: Iterable[int]) -> dict[int, Path]:
+        """
+        Returns the paths to the original image files, which are identical to
+        the original quality frames and can be used instead of them, without reading the chunks.
+        The frames without such files are not included in the result.
+        """
+
+        db_data = self._db_task.require_data()
+        if (
+            self._db_task.dimension != models.DimensionType.DIM_2D
+            or hasattr(db_data, "video")
+            or db_data.get_chunk_type(models.FrameQuality.ORIGINAL) != models.DataChoice.IMAGESET
+            or db_data.storage == models.StorageChoice.CLOUD_STORAGE
+            or db_data.local_storage_backing_cs_id
+        ):
+            return {}
+
+        frame_numbers = {
+            self.get_abs_frame_number(self.validate_frame_number(frame_number)): frame_number
+            for frame_number in frame_numbers
+        }
+        if not frame_numbers:
+            return {}
+
+        raw_data_dir = db_data.get_raw_data_dirname()
+
+        original_image_paths = {}
+        for abs_frame_number, image_path in db_data.images.filter(
+            frame__in=frame_numbers.keys()
+        ).values_list("frame", "path"):
+            image_path = join_untrusted_path(raw_data_dir, image_path)
+            if not image_path.is_file():
+                continue
+
+            try:
+                # only the header is read here
+                with Image.open(image_path) as image:
+                    # such images are transformed in the chunks, see ZipChunkWriter
+                    if image.format == "TIFF" or has_exif_rotation(image):
+                        continue
+            except (OSError, SyntaxError, ValueError):
+                continue
+
+            original_image_paths[frame_numbers[abs_frame_number]] = image_path
+
+        return original_image_paths
+
     def _get_segment(self, validated_frame_number: int) -> models.Segment:
         if not self._db_task.data or not self._db_task.data.size:
             raise ValidationError("Task has no data")
@@ -545,9 +762,12 @@ class SegmentFrameProvider(IFrameProvider):
             None,
         )
 
-    def validate_chunk_number(self, chunk_number: int) -> int:
+    def _get_last_chunk_number(self) -> int:
         segment_size = self._db_segment.frame_count
-        last_chunk = math.ceil(segment_size / self._db_segment.task.data.chunk_size) - 1
+        return math.ceil(segment_size / self._db_segment.task.data.chunk_size) - 1
+
+    def validate_chunk_number(self, chunk_number: int) -> int:
+        last_chunk = self._get_last_chunk_number()
         if not 0 <= chunk_number <= last_chunk:
             raise ValidationError(
                 f"Invalid chunk number '{chunk_number}'. "
@@ -571,6 +791,18 @@ class SegmentFrameProvider(IFrameProvider):
         chunk_data, mime = self._loaders[quality].read_chunk(chunk_number)
         return DataWithMeta[BytesIO](chunk_data, mime=mime)
 
+    def prefetch_chunks(
+        self, chunk_number: int, *, quality: models.FrameQuality = models.FrameQuality.ORIGINAL
+    ) -> None:
+        if self._db_segment.task.data.storage_method != models.StorageMethodChoice.CACHE:
+            return
+
+        MediaCache().prefetch_segment_chunks(
+            self._db_segment,
+            _get_chunks_to_prefetch(chunk_number, last_chunk=self._get_last_chunk_number()),
+            quality=quality,
+        )
+
     def invalidate_chunks(self, *, quality: models.FrameQuality = models.FrameQuality.ORIGINAL):
         cache = MediaCache()
         cache.remove_segment_preview(self._db_segment)
@@ -603,9 +835,13 @@ class SegmentFrameProvider(IFrameProvider):
         quality: models.FrameQuality = models.FrameQuality.ORIGINAL,
         out_type: FrameOutputType = FrameOutputType.BUFFER,
     ) -> DataWithMeta[AnyFrame]:
-        return_type = DataWithMeta[AnyFrame]
-
         frame, frame_name = self._get_raw_frame(frame_number, quality=quality)
+        return self._make_frame(frame, frame_name, out_type=out_type)
+
+    def _make_frame(
+        self, frame: Any, frame_name: str, *, out_type: FrameOutputType
+    ) -> DataWithMeta[AnyFrame]:
+        return_type = DataWithMeta[AnyFrame]
 
         if isinstance(frame, av.VideoFrame):
             mime = self.VIDEO_FRAME_MIME
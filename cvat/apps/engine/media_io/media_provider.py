@@ -24,6 +24,13 @@ class IMediaProvider(metaclass=ABCMeta):
     def unload(self):
         pass
 
+    def prefetch_chunks(
+        self, chunk_number: int, *, quality: models.FrameQuality = models.FrameQuality.ORIGINAL
+    ) -> None:
+        """
+        Requests background preparation of the chunks likely to be requested after this one
+        """
+
     @abstractmethod
     def get_preview_image(self, *, allow_empty: bool = False) -> DataWithMeta[BytesIO]: ...
 
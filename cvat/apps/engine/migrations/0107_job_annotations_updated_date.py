@@ -0,0 +1,18 @@
+# Generated by Django 5.2.14 on 2026-10-18 21:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("engine", "0106_add_interval_annotations"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="job",
+            name="annotations_updated_date",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -5,6 +5,7 @@
 
 from __future__ import annotations
 
+import base64
 import datetime
 import re
 import shutil
@@ -16,6 +17,7 @@ from functools import cached_property
 from pathlib import Path, PurePath
 from typing import TYPE_CHECKING, Any, ClassVar
 
+import numpy as np
 from dirtyfields import DirtyFieldsMixin
 from django.conf import settings
 from django.core.exceptions import ValidationError
@@ -243,9 +245,91 @@ class AbstractArrayField(models.TextField):
         return self.separator.join(map(str, value))
 
 
+class FloatArrayStorageFormat(str, Enum):
+    TEXT = "text"
+    FLOAT32 = "float32"
+    FLOAT64 = "float64"
+
+    @classmethod
+    def choices(cls):
+        return tuple((x.value, x.name) for x in cls)
+
+    def __str__(self):
+        return self.value
+
+
 class FloatArrayField(AbstractArrayField):
+    """
+    Stores float arrays as comma-separated values or, if allowed,
+    in the packed binary format, selected by the CVAT_ANNOTATION_POINTS_STORAGE_FORMAT setting.
+
+    Packed values are stored as "<prefix><base64-encoded little-endian float array>" strings,
+    which are much faster to write and read than the text representation.
+    Values are read in any format, regardless of the current setting.
+    """
+
     converter = float
 
+    _PACKED_FORMATS: ClassVar[dict[FloatArrayStorageFormat, tuple[str, str]]] = {
+        # format: (value prefix, numpy dtype)
+        FloatArrayStorageFormat.FLOAT32: ("f4:", "<f4"),
+        FloatArrayStorageFormat.FLOAT64: ("f8:", "<f8"),
+    }
+
+    def __init__(self, *args, allow_packed_storage: bool = False, **kwargs):
+        self._allow_packed_storage = allow_packed_storage
+        super().__init__(*args, **kwargs)
+
+    @classmethod
+    def get_packed_value_prefix(cls, storage_format: FloatArrayStorageFormat) -> str:
+        return cls._PACKED_FORMATS[storage_format][0]
+
+    @classmethod
+    def get_storage_format(cls, value: str) -> FloatArrayStorageFormat:
+        for storage_format, (prefix, _) in cls._PACKED_FORMATS.items():
+            if value.startswith(prefix):
+                return storage_format
+
+        return FloatArrayStorageFormat.TEXT
+
+    @classmethod
+    def encode(cls, value: Iterable[float], storage_format: FloatArrayStorageFormat) -> str:
+        if storage_format == FloatArrayStorageFormat.TEXT:
+            return cls.separator.join(map(str, value))
+
+        if isinstance(value, LazyList):
+            # numpy reads list storage directly, bypassing the lazy parsing
+            value = list(value)
+
+        prefix, dtype = cls._PACKED_FORMATS[storage_format]
+        packed_value = np.asarray(value, dtype=dtype)
+        if not packed_value.size:
+            return ""
+
+        return prefix + base64.b64encode(packed_value.tobytes()).decode("ascii")
+
+    def from_db_value(self, value, expression, connection):
+        storage_format = self.get_storage_format(value) if value else FloatArrayStorageFormat.TEXT
+        if storage_format == FloatArrayStorageFormat.TEXT:
+            return super().from_db_value(value, expression, connection)
+
+        prefix, dtype = self._PACKED_FORMATS[storage_format]
+        return np.frombuffer(base64.b64decode(value[len(prefix) :]), dtype=dtype).tolist()
+
+    def get_prep_value(self, value):
+        if isinstance(value, str):
+            # the value is already encoded
+            return value
+
+        if not self._allow_packed_storage or self._unique_values or self._store_sorted:
+            return super().get_prep_value(value)
+
+        storage_format = FloatArrayStorageFormat(settings.CVAT_ANNOTATION_POINTS_STORAGE_FORMAT)
+        if storage_format == FloatArrayStorageFormat.TEXT:
+            return super().get_prep_value(value)
+
+        return self.encode(value, storage_format)
+
 
 class IntArrayField(AbstractArrayField):
     converter = int
@@ -1297,6 +1381,31 @@ class JobQuerySet(models.QuerySet):
         ):
             raise TaskGroundTruthJobsLimitError()
 
+    def update_annotations_date(
+        self, annotations_updated_date: datetime.datetime | None = None, **kwargs: Any
+    ) -> int:
+        """
+        Changes the annotations version of the jobs. Required for the annotation changes
+        made directly in the DB, e.g. by cascade deletions.
+        The date is moved forward even if the clock has not advanced since the previous change,
+        the same way as for the annotation changes made via the annotations API.
+        """
+
+        if annotations_updated_date is None:
+            annotations_updated_date = timezone.now()
+
+        return self.update(
+            annotations_updated_date=models.functions.Greatest(
+                models.Value(annotations_updated_date, output_field=models.DateTimeField()),
+                models.ExpressionWrapper(
+                    models.functions.Coalesce("annotations_updated_date", "updated_date")
+                    + datetime.timedelta(microseconds=1),
+                    output_field=models.DateTimeField(),
+                ),
+            ),
+            **kwargs,
+        )
+
     def with_issue_counts(self):
         return self.annotate(issue__count=models.Count("issue"))
 
@@ -1329,6 +1438,12 @@ class Job(DirtyFieldsMixin, TimestampedModel, AssignableModel, FileSystemRelated
         related_name="child_jobs",
         related_query_name="child_job",
     )
+    annotations_updated_date = models.DateTimeField(null=True, blank=True)
+    """
+    Changed on each annotation change. Unlike updated_date, it's not changed
+    on other job changes, such as the assignee or the stage. Undefined for the jobs,
+    whose annotations haven't been changed since the field was added.
+    """
 
     labeledimage_set: models.manager.RelatedManager[LabeledImage]
     labeledshape_set: models.manager.RelatedManager[LabeledShape]
@@ -1463,6 +1578,17 @@ class Label(models.Model):
             return self.task.organization_id
         return None
 
+    def get_jobs(self) -> JobQuerySet:
+        if self.project_id is not None:
+            return Job.objects.filter(segment__task__project_id=self.project_id)
+        return Job.objects.filter(segment__task_id=self.task_id)
+
+    @transaction.atomic(savepoint=False)
+    def delete(self, using=None, keep_parents=False):
+        # The label annotations are deleted by cascade
+        self.get_jobs().update_annotations_date()
+        return super().delete(using, keep_parents)
+
     class Meta:
         default_permissions = ()
         constraints = [
@@ -1528,6 +1654,12 @@ class AttributeSpec(models.Model):
     def __str__(self):
         return self.name
 
+    @transaction.atomic(savepoint=False)
+    def delete(self, using=None, keep_parents=False):
+        # The attribute values in annotations are deleted by cascade
+        self.label.get_jobs().update_annotations_date()
+        return super().delete(using, keep_parents)
+
 
 class AttributeVal(models.Model):
     # TODO: add a validator here to be sure that it corresponds to self.label
@@ -1606,7 +1738,7 @@ class ShapeAnnotationMixin(models.Model):
     occluded = models.BooleanField(default=False)
     outside = models.BooleanField(default=False)
     z_order = models.IntegerField(default=0)
-    points = FloatArrayField(default=[])
+    points = FloatArrayField(default=[], allow_packed_storage=True)
     rotation = FloatField(default=0)
 
     class Meta:
@@ -1774,7 +1774,10 @@ class JobValidationLayoutWriteSerializer(serializers.Serializer):
             if bulk_context:
                 bulk_context.updated_segments.append(db_segment.id)
             else:
-                db_segment.job_set.update(updated_date=new_updated_date)
+                # The annotations on the updated honeypots are removed
+                db_segment.job_set.update_annotations_date(
+                    new_updated_date, updated_date=new_updated_date
+                )
 
                 db_task.touch()
                 if db_task.project:
@@ -2096,9 +2099,10 @@ class TaskValidationLayoutWriteSerializer(serializers.Serializer):
         # Update segments
         updated_date = timezone.now()
         for updated_segments_batch in take_by(updated_segments, chunk_size=1000):
-            models.Job.objects.filter(segment_id__in=updated_segments_batch).update(
-                updated_date=updated_date
-            )
+            # The annotations on the updated honeypots are removed
+            models.Job.objects.filter(
+                segment_id__in=updated_segments_batch
+            ).update_annotations_date(updated_date, updated_date=updated_date)
 
         for updated_segment_chunks_batch in take_by(
             bulk_context.segments_with_updated_chunks, chunk_size=1000
@@ -3269,6 +3273,9 @@ class TaskWriteSerializer(WriteOnceMixin, serializers.ModelSerializer, OrgTransf
                     label=new_label
                 )
 
+        # The annotations use the project labels now
+        models.Job.objects.filter(segment__task=instance).update_annotations_date()
+
         if instance.project_id is None:
             instance.label_set.all().delete()
 
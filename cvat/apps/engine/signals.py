@@ -219,9 +219,21 @@ def __cache_item_created_handler(
     )
 
 
+@receiver(cache_item_created_signal, sender=MediaCache)
+def __cache_item_created_local_cache_handler(sender, item_key: str, **kwargs):
+    # The item has been replaced in the shared cache, the local copy can be outdated
+    sender.invalidate_local_cache_item(item_key)
+
+
 @receiver(cache_item_read_signal, sender=MediaCache)
 def __cache_item_read_handler(
-    sender, item_key: str, item_data_size: int, rq_queue: str | None = None, **kwargs
+    sender,
+    item_key: str,
+    item_data_size: int,
+    rq_queue: str | None = None,
+    integrity_check_mode: str | None = None,
+    integrity_check_time: float | None = None,
+    **kwargs,
 ):
     cache_item_info = _parse_cache_key(item_key)
     # Handle only known key types.
@@ -229,8 +241,16 @@ def __cache_item_read_handler(
     if cache_item_info is None:
         return
 
+    payload_fields = {}
+    if integrity_check_mode is not None:
+        payload_fields["integrity_check"] = {
+            "mode": integrity_check_mode,
+            "cpu_time": integrity_check_time,
+        }
+
     handle_cache_item_read(
         **cache_item_info,
         size=item_data_size,
         queue=rq_queue,
+        **payload_fields,
     )
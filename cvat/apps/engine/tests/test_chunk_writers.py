@@ -0,0 +1,58 @@
+# Copyright (C) CVAT.ai Corporation
+#
+# SPDX-License-Identifier: MIT
+
+import io
+import unittest
+import zipfile
+
+import numpy as np
+from PIL import Image
+
+from cvat.apps.engine.media_extractors import ZipCompressedChunkWriter
+from cvat.apps.engine.models import DimensionType
+
+
+def _generate_images(count: int, *, size: tuple[int, int]) -> list[tuple[Image.Image, str]]:
+    rng = np.random.default_rng(42)
+    return [
+        (
+            Image.fromarray(rng.integers(0, 256, (size[1], size[0], 3), dtype=np.uint8)),
+            f"image_{i}.png",
+        )
+        for i in range(count)
+    ]
+
+
+def _write_chunk(images, *, encoding_threads: int) -> io.BytesIO:
+    writer = ZipCompressedChunkWriter(
+        quality=70, dimension=DimensionType.DIM_2D, encoding_threads=encoding_threads
+    )
+
+    chunk = io.BytesIO()
+    writer.save_as_chunk(iter(images), chunk)
+    chunk.seek(0)
+    return chunk
+
+
+def _read_chunk_files(chunk: io.BytesIO) -> dict[str, bytes]:
+    with zipfile.ZipFile(chunk) as zip_file:
+        return {name: zip_file.read(name) for name in zip_file.namelist()}
+
+
+class ZipCompressedChunkWriterTest(unittest.TestCase):
+    def test_parallel_encoding_produces_same_chunk(self):
+        images = _generate_images(10, size=(64, 48))
+
+        serial_chunk = _read_chunk_files(_write_chunk(images, encoding_threads=1))
+        parallel_chunk = _read_chunk_files(_write_chunk(images, encoding_threads=3))
+
+        self.assertEqual(list(serial_chunk), [f"{i:06d}.jpeg" for i in range(10)])
+        self.assertEqual(serial_chunk, parallel_chunk)
+
+    def test_parallel_encoding_reports_image_errors(self):
+        images = _generate_images(5, size=(16, 16))
+        images[3] = (io.BytesIO(b"not an image"), "broken.jpg")
+
+        with self.assertRaisesRegex(RuntimeError, "broken.jpg"):
+            _write_chunk(images, encoding_threads=2)
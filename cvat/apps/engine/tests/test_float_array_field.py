@@ -0,0 +1,95 @@
+# Copyright (C) CVAT.ai Corporation
+#
+# SPDX-License-Identifier: MIT
+
+import random
+import unittest
+
+from django.test import override_settings
+
+from cvat.apps.engine.lazy_list import LazyList
+from cvat.apps.engine.models import FloatArrayField, FloatArrayStorageFormat
+
+
+def _generate_points(count: int) -> list[float]:
+    rng = random.Random(42)
+    return [rng.uniform(0, 4000) for _ in range(count)]
+
+
+class TestFloatArrayField(unittest.TestCase):
+    def _make_field(self, **kwargs) -> FloatArrayField:
+        return FloatArrayField(default=[], allow_packed_storage=True, **kwargs)
+
+    def _save_and_load(self, field: FloatArrayField, value: list[float]) -> list[float]:
+        return field.from_db_value(field.get_prep_value(value), None, None)
+
+    def test_can_store_values_in_text_format(self):
+        field = self._make_field()
+        points = [1.5, 2, -3.25]
+
+        with override_settings(CVAT_ANNOTATION_POINTS_STORAGE_FORMAT="text"):
+            self.assertEqual(field.get_prep_value(points), "1.5,2,-3.25")
+            self.assertEqual(self._save_and_load(field, points), points)
+
+    def test_can_store_values_in_float64_format_without_losses(self):
+        field = self._make_field()
+        points = _generate_points(100)
+
+        with override_settings(CVAT_ANNOTATION_POINTS_STORAGE_FORMAT="float64"):
+            encoded_value = field.get_prep_value(points)
+            self.assertEqual(
+                FloatArrayField.get_storage_format(encoded_value), FloatArrayStorageFormat.FLOAT64
+            )
+            self.assertEqual(self._save_and_load(field, points), points)
+
+    def test_can_store_values_in_float32_format(self):
+        field = self._make_field()
+        points = [1.5, 2.0, -3.25, 0.1]
+
+        with override_settings(CVAT_ANNOTATION_POINTS_STORAGE_FORMAT="float32"):
+            encoded_value = field.get_prep_value(points)
+            self.assertEqual(
+                FloatArrayField.get_storage_format(encoded_value), FloatArrayStorageFormat.FLOAT32
+            )
+
+            loaded_points = self._save_and_load(field, points)
+            self.assertEqual(loaded_points[:3], points[:3])
+            self.assertAlmostEqual(loaded_points[3], points[3], places=6)
+
+    def test_can_read_values_in_any_format(self):
+        field = self._make_field()
+        points = [1.5, 2.0, -3.25]
+
+        for storage_format in FloatArrayStorageFormat:
+            with self.subTest(storage_format=str(storage_format)):
+                encoded_value = FloatArrayField.encode(points, storage_format)
+
+                with override_settings(CVAT_ANNOTATION_POINTS_STORAGE_FORMAT="text"):
+                    self.assertEqual(field.from_db_value(encoded_value, None, None), points)
+
+    def test_can_pack_lazy_lists(self):
+        field = self._make_field()
+
+        with override_settings(CVAT_ANNOTATION_POINTS_STORAGE_FORMAT="float64"):
+            loaded_points = self._save_and_load(
+                field, LazyList(string="1.5,2,-3.25", separator=",", converter=float)
+            )
+
+        self.assertEqual(loaded_points, [1.5, 2.0, -3.25])
+
+    def test_can_store_empty_values(self):
+        field = self._make_field()
+
+        for storage_format in FloatArrayStorageFormat:
+            with (
+                self.subTest(storage_format=str(storage_format)),
+                override_settings(CVAT_ANNOTATION_POINTS_STORAGE_FORMAT=str(storage_format)),
+            ):
+                self.assertEqual(field.get_prep_value([]), "")
+                self.assertEqual(self._save_and_load(field, []), [])
+
+    def test_packed_storage_is_not_used_if_not_allowed(self):
+        field = FloatArrayField(default=[])
+
+        with override_settings(CVAT_ANNOTATION_POINTS_STORAGE_FORMAT="float64"):
+            self.assertEqual(field.get_prep_value([1.5, 2]), "1.5,2")
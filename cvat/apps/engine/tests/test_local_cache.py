@@ -0,0 +1,83 @@
+# Copyright (C) CVAT.ai Corporation
+#
+# SPDX-License-Identifier: MIT
+
+import unittest
+
+from cvat.apps.engine.local_cache import SizeBoundedLRUCache
+
+
+class _FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestSizeBoundedLRUCache(unittest.TestCase):
+    def _make_cache(self, **kwargs) -> SizeBoundedLRUCache[bytes]:
+        kwargs.setdefault("max_size", 10)
+        return SizeBoundedLRUCache(get_item_size=len, **kwargs)
+
+    def test_can_get_item(self):
+        cache = self._make_cache()
+        cache.set("a", b"123")
+
+        self.assertEqual(cache.get("a"), b"123")
+        self.assertIsNone(cache.get("b"))
+
+        stats = cache.get_stats()
+        self.assertEqual((stats.hits, stats.misses, stats.items, stats.size), (1, 1, 1, 3))
+
+    def test_evicts_least_recently_used_items_by_size(self):
+        cache = self._make_cache()
+        cache.set("a", b"1234")
+        cache.set("b", b"1234")
+        cache.get("a")
+        cache.set("c", b"1234")
+
+        self.assertIn("a", cache)
+        self.assertNotIn("b", cache)
+        self.assertIn("c", cache)
+        self.assertEqual(cache.get_stats().evictions, 1)
+        self.assertEqual(cache.get_stats().size, 8)
+
+    def test_skips_too_big_items(self):
+        cache = self._make_cache(max_item_size=4)
+        cache.set("a", b"1")
+
+        self.assertFalse(cache.set("a", b"12345"))
+        self.assertNotIn("a", cache)
+        self.assertEqual(cache.get_stats().size, 0)
+
+    def test_disabled_cache_stores_nothing(self):
+        cache = self._make_cache(max_size=0)
+
+        self.assertFalse(cache.enabled)
+        self.assertFalse(cache.set("a", b""))
+        self.assertIsNone(cache.get("a"))
+
+    def test_items_expire(self):
+        clock = _FakeClock()
+        cache = self._make_cache(ttl=5, clock=clock)
+        cache.set("a", b"1")
+
+        clock.now = 4
+        self.assertEqual(cache.get("a"), b"1")
+
+        clock.now = 5
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.get_stats().size, 0)
+
+    def test_can_delete_items(self):
+        cache = self._make_cache()
+        cache.set("a", b"1")
+        cache.set("b", b"2")
+        cache.set("c", b"3")
+
+        cache.delete("a")
+        cache.delete_many(["b", "missing"])
+
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cache.get_stats().size, 1)
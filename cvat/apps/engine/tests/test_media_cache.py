@@ -0,0 +1,383 @@
+# Copyright (C) CVAT.ai Corporation
+#
+# SPDX-License-Identifier: MIT
+
+import io
+import pickle
+import unittest
+from unittest import mock
+
+import fakeredis
+import rq
+from django.test import override_settings
+from django.utils import timezone
+from rq.job import JobStatus as RQJobStatus
+
+from cvat.apps.engine.cache import (
+    CacheIntegrityCheckMode,
+    Callback,
+    MediaCache,
+    _ChunkPrefetchLimiter,
+    enqueue_create_chunk_job,
+)
+from cvat.apps.engine.media_io.frame_provider import _get_chunks_to_prefetch
+from cvat.apps.engine.models import FrameQuality
+
+
+def _create_chunk():
+    return b"chunk", "application/zip"
+
+
+class TestMediaCacheItems(unittest.TestCase):
+    def _make_item(self, data: bytes):
+        return (
+            io.BytesIO(data),
+            "application/zip",
+            MediaCache._get_checksum(data),
+            timezone.now(),
+            MediaCache._get_digest(data),
+        )
+
+    def test_stored_items_keep_data_as_bytes(self):
+        data = b"chunk data" * 100
+        item = self._make_item(data)
+
+        stored_item = pickle.loads(pickle.dumps(MediaCache._make_stored_cache_item(item)))
+
+        self.assertIsInstance(stored_item[0], bytes)
+        self.assertEqual(stored_item[1:], item[1:])
+
+    def test_can_load_stored_items_without_copying(self):
+        data = b"chunk data" * 100
+        stored_item = MediaCache._make_stored_cache_item(self._make_item(data))
+
+        loaded_item = MediaCache._load_stored_cache_item(stored_item)
+
+        self.assertIsInstance(loaded_item[0], io.BytesIO)
+        self.assertIs(loaded_item[0].getvalue(), stored_item[0])
+        self.assertIs(MediaCache._get_item_data_view(loaded_item).obj, stored_item[0])
+        self.assertEqual(MediaCache._get_cache_item_size(loaded_item), len(data))
+
+    def test_can_load_legacy_items(self):
+        item = self._make_item(b"chunk data")
+
+        self.assertIs(MediaCache._load_stored_cache_item(item), item)
+
+    def test_can_check_integrity_of_stored_items(self):
+        data = b"chunk data" * 100
+        stored_item = MediaCache._make_stored_cache_item(self._make_item(data))
+        corrupted_item = (data[:-1] + b"!", *stored_item[1:])
+
+        for mode in (CacheIntegrityCheckMode.FULL, CacheIntegrityCheckMode.PARTIAL):
+            with self.subTest(mode=mode):
+                self.assertTrue(MediaCache._check_item_integrity(stored_item, mode=mode)[0])
+                self.assertFalse(MediaCache._check_item_integrity(corrupted_item, mode=mode)[0])
+
+
+class TestMediaCacheIntegrityChecks(unittest.TestCase):
+    def _make_item(self, data: bytes, *, checked_data: bytes | None = None, with_digest=True):
+        # checked_data allows to emulate the item data corrupted after the checksum computation
+        if checked_data is None:
+            checked_data = data
+
+        item = (
+            io.BytesIO(data),
+            "application/zip",
+            MediaCache._get_checksum(checked_data),
+            timezone.now(),
+        )
+        if with_digest:
+            item += (MediaCache._get_digest(checked_data),)
+
+        return item
+
+    def _check(self, item, mode: CacheIntegrityCheckMode) -> tuple[bool, CacheIntegrityCheckMode]:
+        return MediaCache._check_item_integrity(item, mode=mode)
+
+    def test_full_check(self):
+        data = b"chunk data" * 100
+
+        self.assertEqual(
+            self._check(self._make_item(data), CacheIntegrityCheckMode.FULL),
+            (True, CacheIntegrityCheckMode.FULL),
+        )
+        self.assertEqual(
+            self._check(
+                self._make_item(data[:-1] + b"!", checked_data=data), CacheIntegrityCheckMode.FULL
+            ),
+            (False, CacheIntegrityCheckMode.FULL),
+        )
+
+    def test_partial_check(self):
+        block_size = MediaCache._PARTIAL_CHECKSUM_BLOCK_SIZE
+        data = bytes(range(256)) * (3 * block_size // 256)
+
+        self.assertEqual(
+            self._check(self._make_item(data), CacheIntegrityCheckMode.PARTIAL),
+            (True, CacheIntegrityCheckMode.PARTIAL),
+        )
+
+        for name, corrupted_data in {
+            "head": b"!" + data[1:],
+            "tail": data[:-1] + b"!",
+            "truncated": data[:-1],
+        }.items():
+            with self.subTest(corruption=name):
+                self.assertEqual(
+                    self._check(
+                        self._make_item(corrupted_data, checked_data=data),
+                        CacheIntegrityCheckMode.PARTIAL,
+                    ),
+                    (False, CacheIntegrityCheckMode.PARTIAL),
+                )
+
+        # The middle part of big items is not checked in this mode
+        middle = len(data) // 2
+        corrupted_data = data[:middle] + b"!" + data[middle + 1 :]
+        self.assertTrue(
+            self._check(
+                self._make_item(corrupted_data, checked_data=data), CacheIntegrityCheckMode.PARTIAL
+            )[0]
+        )
+
+    def test_partial_check_of_small_items(self):
+        # The head and tail blocks cover the whole item
+        data = b"chunk data" * 10
+        corrupted_data = data[:50] + b"!" + data[51:]
+
+        self.assertTrue(self._check(self._make_item(data), CacheIntegrityCheckMode.PARTIAL)[0])
+        self.assertFalse(
+            self._check(
+                self._make_item(corrupted_data, checked_data=data), CacheIntegrityCheckMode.PARTIAL
+            )[0]
+        )
+
+    def test_sampled_check(self):
+        data = b"chunk data" * 100
+        corrupted_item = self._make_item(data[:-1] + b"!", checked_data=data)
+        truncated_item = self._make_item(data[:-1], checked_data=data)
+
+        with override_settings(MEDIA_CACHE_INTEGRITY_CHECK_SAMPLE_RATE=0):
+            # Only the size is checked
+            self.assertEqual(
+                self._check(self._make_item(data), CacheIntegrityCheckMode.SAMPLED),
+                (True, CacheIntegrityCheckMode.SAMPLED),
+            )
+            self.assertEqual(
+                self._check(corrupted_item, CacheIntegrityCheckMode.SAMPLED),
+                (True, CacheIntegrityCheckMode.SAMPLED),
+            )
+            self.assertEqual(
+                self._check(truncated_item, CacheIntegrityCheckMode.SAMPLED),
+                (False, CacheIntegrityCheckMode.SAMPLED),
+            )
+
+        with override_settings(MEDIA_CACHE_INTEGRITY_CHECK_SAMPLE_RATE=1):
+            # The checksum is checked on each read
+            self.assertEqual(
+                self._check(self._make_item(data), CacheIntegrityCheckMode.SAMPLED),
+                (True, CacheIntegrityCheckMode.FULL),
+            )
+            self.assertEqual(
+                self._check(corrupted_item, CacheIntegrityCheckMode.SAMPLED),
+                (False, CacheIntegrityCheckMode.FULL),
+            )
+            self.assertEqual(
+                self._check(truncated_item, CacheIntegrityCheckMode.SAMPLED),
+                (False, CacheIntegrityCheckMode.SAMPLED),
+            )
+
+    def test_items_without_digest_are_checked_fully(self):
+        data = b"chunk data" * 100
+
+        for mode in CacheIntegrityCheckMode:
+            with self.subTest(mode=mode):
+                self.assertEqual(
+                    self._check(self._make_item(data, with_digest=False), mode),
+                    (True, CacheIntegrityCheckMode.FULL),
+                )
+                self.assertEqual(
+                    self._check(
+                        self._make_item(data[:-1] + b"!", checked_data=data, with_digest=False),
+                        mode,
+                    ),
+                    (False, CacheIntegrityCheckMode.FULL),
+                )
+
+
+class TestChunkPrefetching(unittest.TestCase):
+    def setUp(self):
+        self.queue = rq.Queue("chunks", connection=fakeredis.FakeRedis())
+
+    def _enqueue(self, rq_job_id: str, *, prefetch: bool = False) -> rq.job.Job:
+        return enqueue_create_chunk_job(
+            self.queue, rq_job_id, Callback(callable=_create_chunk), prefetch=prefetch
+        )
+
+    @override_settings(CVAT_CHUNK_PREFETCH_FORWARD=2, CVAT_CHUNK_PREFETCH_BACKWARD=1)
+    def test_can_get_chunks_to_prefetch(self):
+        self.assertEqual(_get_chunks_to_prefetch(5, last_chunk=10), [6, 7, 4])
+        self.assertEqual(_get_chunks_to_prefetch(0, last_chunk=10), [1, 2])
+        self.assertEqual(_get_chunks_to_prefetch(9, last_chunk=10), [10, 8])
+        self.assertEqual(_get_chunks_to_prefetch(0, last_chunk=0), [])
+
+    @override_settings(CVAT_CHUNK_PREFETCH_FORWARD=0, CVAT_CHUNK_PREFETCH_BACKWARD=0)
+    def test_can_disable_prefetching(self):
+        self.assertEqual(_get_chunks_to_prefetch(5, last_chunk=10), [])
+
+    def test_requested_prefetch_job_is_moved_to_queue_head(self):
+        for rq_job_id in ["a", "b", "c"]:
+            self._enqueue(rq_job_id, prefetch=True)
+
+        self._enqueue("c")
+
+        self.assertEqual(self.queue.get_job_ids(), ["c", "a", "b"])
+
+    def test_requested_regular_job_is_not_moved(self):
+        self._enqueue("a", prefetch=True)
+        self._enqueue("b")
+        self._enqueue("c", prefetch=True)
+
+        self._enqueue("b")
+
+        self.assertEqual(self.queue.get_job_ids(), ["a", "b", "c"])
+
+    def test_prefetch_request_does_not_move_jobs(self):
+        self._enqueue("a", prefetch=True)
+        self._enqueue("b", prefetch=True)
+
+        self._enqueue("b", prefetch=True)
+
+        self.assertEqual(self.queue.get_job_ids(), ["a", "b"])
+
+    @override_settings(CVAT_CHUNK_PREFETCH_MAX_JOBS_PER_WORKER=2)
+    def test_limiter_limits_unfinished_jobs(self):
+        limiter = _ChunkPrefetchLimiter()
+
+        rq_jobs = []
+        for rq_job_id in ["a", "b"]:
+            self.assertTrue(limiter.try_acquire(self.queue))
+            rq_jobs.append(self._enqueue(rq_job_id, prefetch=True))
+            limiter.add(rq_jobs[-1])
+
+        self.assertFalse(limiter.try_acquire(self.queue))
+
+        rq_jobs[0].set_status(RQJobStatus.FINISHED)
+        self.assertTrue(limiter.try_acquire(self.queue))
+
+    @override_settings(CVAT_CHUNK_PREFETCH_MAX_JOBS_PER_WORKER=1)
+    def test_limiter_forgets_removed_jobs(self):
+        limiter = _ChunkPrefetchLimiter()
+        rq_job = self._enqueue("a", prefetch=True)
+        limiter.add(rq_job)
+        self.assertFalse(limiter.try_acquire(self.queue))
+
+        rq_job.delete()
+
+        self.assertTrue(limiter.try_acquire(self.queue))
+
+
+class TestSegmentChunkGroups(unittest.TestCase):
+    def setUp(self):
+        self.queue = rq.Queue("chunks", connection=fakeredis.FakeRedis())
+        self.cache = MediaCache()
+
+        for patcher in [
+            mock.patch.object(MediaCache, "_get_queue", return_value=self.queue),
+            mock.patch.object(MediaCache, "_is_cached", return_value=False),
+            mock.patch.object(
+                MediaCache,
+                "_make_chunk_key",
+                side_effect=lambda db_segment, chunk_number, *, quality: f"chunk_{chunk_number}",
+            ),
+            mock.patch.object(
+                MediaCache,
+                "_make_segment_chunk_callback",
+                return_value=Callback(callable=_create_chunk),
+            ),
+            mock.patch.object(
+                MediaCache,
+                "_make_segment_chunks_callback",
+                return_value=Callback(callable=_create_chunk),
+            ),
+            mock.patch("cvat.apps.engine.cache._chunk_prefetch_limiter", _ChunkPrefetchLimiter()),
+        ]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        settings_override = override_settings(CVAT_CHUNK_PREFETCH_MAX_JOBS_PER_WORKER=10)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def _prefetch(self, chunk_numbers: list[int]):
+        self.cache.prefetch_segment_chunks(None, chunk_numbers, quality=FrameQuality.ORIGINAL)
+
+    def _job_id(self, chunk_number: int) -> str:
+        return MediaCache._make_queue_job_id(f"chunk_{chunk_number}")
+
+    def test_can_group_consecutive_chunks(self):
+        self.assertEqual(
+            self.cache._group_consecutive_segment_chunks([5, 1, 2, 3, 8, 7]),
+            [[5], [1, 2, 3], [7, 8]],
+        )
+
+    def test_chunk_groups_are_limited_in_size(self):
+        with mock.patch.object(MediaCache, "_SEGMENT_CHUNK_GROUP_MAX_SIZE", 2):
+            self.assertEqual(
+                self.cache._group_consecutive_segment_chunks([1, 2, 3, 4, 5]),
+                [[1, 2], [3, 4], [5]],
+            )
+
+    def test_consecutive_chunks_are_prefetched_in_one_job(self):
+        self._prefetch([3, 4, 5, 1])
+
+        self.assertEqual(self.queue.get_job_ids(), [self._job_id(3), self._job_id(1)])
+        for chunk_number in [4, 5]:
+            self.assertEqual(
+                self.cache._get_active_group_job(self.queue, f"chunk_{chunk_number}").id,
+                self._job_id(3),
+            )
+
+    def test_chunks_in_enqueued_group_are_not_prefetched_again(self):
+        self._prefetch([3, 4, 5])
+        self._prefetch([4, 5, 6])
+
+        self.assertEqual(self.queue.get_job_ids(), [self._job_id(3), self._job_id(6)])
+
+    def test_requested_chunk_waits_for_group_job(self):
+        self._prefetch([1])
+        self._prefetch([3, 4, 5])
+
+        with (
+            mock.patch("cvat.apps.engine.cache.wait_for_rq_job") as mock_wait_for_rq_job,
+            mock.patch.object(MediaCache, "_get_cache_item", return_value="item"),
+        ):
+            item = self.cache._create_cache_item("chunk_4", Callback(callable=_create_chunk))
+
+        self.assertEqual(item, "item")
+        self.assertEqual(
+            [call.args[0].id for call in mock_wait_for_rq_job.call_args_list], [self._job_id(3)]
+        )
+        # No new jobs, the awaited job is moved to the queue head
+        self.assertEqual(self.queue.get_job_ids(), [self._job_id(3), self._job_id(1)])
+
+    def test_requested_chunk_is_created_if_group_job_did_not_create_it(self):
+        self._prefetch([3, 4, 5])
+
+        with (
+            mock.patch("cvat.apps.engine.cache.wait_for_rq_job") as mock_wait_for_rq_job,
+            mock.patch.object(MediaCache, "_get_cache_item", side_effect=[None, "item"]),
+        ):
+            item = self.cache._create_cache_item("chunk_4", Callback(callable=_create_chunk))
+
+        self.assertEqual(item, "item")
+        self.assertEqual(
+            [call.args[0].id for call in mock_wait_for_rq_job.call_args_list],
+            [self._job_id(3), self._job_id(4)],
+        )
+
+    def test_finished_group_job_is_not_awaited(self):
+        self._prefetch([3, 4, 5])
+        self.queue.fetch_job(self._job_id(3)).set_status(RQJobStatus.FINISHED)
+
+        self.assertIsNone(self.cache._get_active_group_job(self.queue, "chunk_4"))
@@ -5,6 +5,7 @@
 
 
 import copy
+import gzip
 import io
 import json
 import logging
@@ -47,6 +48,7 @@ from rest_framework.test import APIClient
 from rq.job import Job as RQJob
 from rq.queue import Queue as RQQueue
 
+from cvat.apps.dataset_manager.annotation import AnnotationIR
 from cvat.apps.dataset_manager.tests.utils import TestDir
 from cvat.apps.dataset_manager.util import current_function_name
 from cvat.apps.engine.cache import MediaCache
@@ -56,6 +58,7 @@ from cvat.apps.engine.cloud_provider import (
     Status,
 )
 from cvat.apps.engine.media_extractors import ValidateDimension, sort
+from cvat.apps.engine.media_io.frame_provider import TaskFrameProvider
 from cvat.apps.engine.models import (
     AnnotationGuide,
     AttributeSpec,
@@ -63,11 +66,16 @@ from cvat.apps.engine.models import (
     CloudStorage,
     Data,
     DimensionType,
+    FrameQuality,
     Job,
+    JobType,
     Label,
+    LabeledShape,
+    LabeledShapeAttributeVal,
     MediaType,
     Project,
     Segment,
+    SegmentType,
     SortingMethod,
     StageChoice,
     StatusChoice,
@@ -5700,6 +5708,269 @@ class TaskDataAPITestCase(ApiTestBase):
         assert b"not in canonical form" in response.content
 
 
+class TaskFrameProviderTestCase(ApiTestBase):
+    @classmethod
+    def setUpTestData(cls):
+        create_db_users(cls, primary=False, extra=False)
+
+    def _create_task(self, *, use_cache: bool, client_files=None, chunk_size: int = 1):
+        if client_files is None:
+            client_files = [generate_random_image_file(f"test_{i}.jpg")[1] for i in range(5)]
+
+        with ForceLogin(self.admin, self.client):
+            response = self.client.post(
+                "/api/tasks",
+                data={
+                    "name": "chunk preparation task",
+                    "segment_size": 2,
+                    "labels": [{"name": "car"}],
+                },
+                format="json",
+            )
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+            tid = response.data["id"]
+
+            response = self.client.post(
+                f"/api/tasks/{tid}/data",
+                data={
+                    **{f"client_files[{i}]": f for i, f in enumerate(client_files)},
+                    "image_quality": 75,
+                    "chunk_size": chunk_size,
+                    "use_cache": use_cache,
+                },
+            )
+            self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+
+        return Task.objects.get(id=tid)
+
+    @staticmethod
+    def _get_cached_chunks(db_task: Task) -> set[tuple[int, int]]:
+        cache = MediaCache()
+        return set(
+            (db_segment.start_frame, chunk_number)
+            for db_segment in db_task.segment_set.all()
+            for chunk_number in range(db_segment.frame_count)
+            if cache._is_cached(
+                cache._make_chunk_key(db_segment, chunk_number, quality=FrameQuality.ORIGINAL)
+            )
+        )
+
+    def test_can_prepare_chunks_for_frames(self):
+        db_task = self._create_task(use_cache=True)
+        self._clear_temp_data()
+
+        TaskFrameProvider(db_task).prepare_frame_chunks([1, 2, 4])
+
+        # segments are [0, 1], [2, 3], [4], 1 frame per chunk
+        self.assertEqual(self._get_cached_chunks(db_task), {(0, 1), (2, 0), (4, 0)})
+
+    @override_settings(MEDIA_CACHE_ALLOW_STATIC_CACHE=True)
+    def test_prepare_chunks_does_nothing_for_static_chunks(self):
+        db_task = self._create_task(use_cache=False)
+        self._clear_temp_data()
+
+        with mock.patch.object(MediaCache, "prepare_segment_chunks_if_missing") as mock_prepare:
+            TaskFrameProvider(db_task).prepare_frame_chunks(range(5))
+
+        mock_prepare.assert_not_called()
+
+    def _get_task_chunk(self, db_task: Task, chunk_number: int):
+        with ForceLogin(self.admin, self.client):
+            return self.client.get(
+                f"/api/tasks/{db_task.id}/data",
+                data={"type": "chunk", "number": chunk_number, "quality": "original"},
+            )
+
+    @staticmethod
+    def _get_cached_task_chunks(db_task: Task) -> set[int]:
+        cache = MediaCache()
+        return set(
+            chunk_number
+            for chunk_number in range(db_task.data.size)
+            if cache._is_cached(
+                cache._make_chunk_key(db_task, chunk_number, quality=FrameQuality.ORIGINAL)
+            )
+        )
+
+    @override_settings(CVAT_CHUNK_PREFETCH_FORWARD=1, CVAT_CHUNK_PREFETCH_BACKWARD=1)
+    def test_chunk_request_prefetches_neighboring_chunks(self):
+        db_task = self._create_task(use_cache=True)
+        self._clear_temp_data()
+
+        response = self._get_task_chunk(db_task, 2)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self._get_cached_task_chunks(db_task), {1, 2, 3})
+
+    def test_chunk_request_succeeds_if_prefetching_fails(self):
+        db_task = self._create_task(use_cache=True)
+        self._clear_temp_data()
+
+        with (
+            mock.patch.object(
+                MediaCache, "prefetch_segment_chunks", side_effect=Exception("prefetching failed")
+            ),
+            mock.patch.object(
+                MediaCache, "prefetch_task_chunk", side_effect=Exception("prefetching failed")
+            ) as mock_prefetch_task,
+        ):
+            response = self._get_task_chunk(db_task, 0)
+
+        mock_prefetch_task.assert_called()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self._get_cached_task_chunks(db_task), {0})
+
+    @override_settings(MEDIA_CACHE_ALLOW_STATIC_CACHE=True)
+    def test_prefetching_does_nothing_for_static_chunks(self):
+        db_task = self._create_task(use_cache=False)
+        self._clear_temp_data()
+
+        with (
+            mock.patch.object(MediaCache, "prefetch_segment_chunks") as mock_prefetch_segment,
+            mock.patch.object(MediaCache, "prefetch_task_chunk") as mock_prefetch_task,
+        ):
+            response = self._get_task_chunk(db_task, 0)
+            TaskFrameProvider(db_task).prefetch_chunks(0)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        mock_prefetch_segment.assert_not_called()
+        mock_prefetch_task.assert_not_called()
+
+    def _test_can_prepare_several_segment_chunks(self, db_task: Task):
+        db_segment = db_task.segment_set.order_by("start_frame").first()
+        targets = [
+            (chunk_number, quality)
+            for chunk_number in [0, 1]
+            for quality in [FrameQuality.COMPRESSED, FrameQuality.ORIGINAL]
+        ]
+        cache = MediaCache()
+
+        with mock.patch.object(
+            MediaCache, "_read_raw_frames", wraps=MediaCache._read_raw_frames
+        ) as mock_read_raw_frames:
+            chunks = cache.prepare_segment_chunks(db_segment, targets)
+
+        # The consecutive chunks are read together
+        mock_read_raw_frames.assert_called_once()
+        self.assertEqual(len(chunks), len(targets))
+        for (chunk_number, quality), (chunk, mime) in zip(targets, chunks):
+            expected_chunk, expected_mime = cache.prepare_segment_chunk(
+                db_segment, chunk_number, quality=quality
+            )
+            self.assertEqual(mime, expected_mime)
+            self.assertEqual(chunk.getvalue(), expected_chunk.getvalue())
+
+    def test_can_prepare_several_segment_chunks_of_images(self):
+        db_task = self._create_task(use_cache=True)
+        self._test_can_prepare_several_segment_chunks(db_task)
+
+    def test_can_prepare_several_segment_chunks_of_video(self):
+        db_task = self._create_task(
+            use_cache=True,
+            client_files=[
+                generate_video_file("test_video.mp4", width=320, height=240, duration=2, fps=5)[1]
+            ],
+        )
+        self._test_can_prepare_several_segment_chunks(db_task)
+
+    def test_prepare_several_chunks_falls_back_to_one_chunk_at_once_for_specific_frames(self):
+        db_task = self._create_task(use_cache=True)
+        db_segment = db_task.segment_set.order_by("start_frame").first()
+        db_segment.type = SegmentType.SPECIFIC_FRAMES
+        targets = [(0, FrameQuality.COMPRESSED), (1, FrameQuality.ORIGINAL)]
+
+        with mock.patch.object(
+            MediaCache, "prepare_segment_chunk", return_value=(io.BytesIO(), "application/zip")
+        ) as mock_prepare_segment_chunk:
+            chunks = MediaCache().prepare_segment_chunks(db_segment, targets)
+
+        self.assertEqual(len(chunks), len(targets))
+        self.assertEqual(
+            mock_prepare_segment_chunk.call_args_list,
+            [
+                mock.call(db_segment, chunk_number, quality=quality)
+                for chunk_number, quality in targets
+            ],
+        )
+
+    def test_can_prepare_consecutive_chunks_together(self):
+        db_task = self._create_task(use_cache=True)
+        self._clear_temp_data()
+
+        with mock.patch.object(
+            MediaCache, "_read_raw_frames", wraps=MediaCache._read_raw_frames
+        ) as mock_read_raw_frames:
+            TaskFrameProvider(db_task).prepare_frame_chunks(range(5))
+
+        # segments are [0, 1], [2, 3], [4], 1 frame per chunk
+        self.assertEqual(self._get_cached_chunks(db_task), {(0, 0), (0, 1), (2, 0), (2, 1), (4, 0)})
+        self.assertEqual(
+            [list(call.kwargs["frame_ids"]) for call in mock_read_raw_frames.call_args_list],
+            [[0, 1], [2, 3], [4]],
+        )
+
+    @override_settings(CVAT_CHUNK_BUILD_ALL_QUALITIES=True)
+    def test_can_prepare_all_chunk_qualities_together(self):
+        db_task = self._create_task(use_cache=True)
+        self._clear_temp_data()
+        db_segment = db_task.segment_set.order_by("start_frame").first()
+        cache = MediaCache()
+
+        with mock.patch.object(
+            MediaCache, "_read_raw_frames", wraps=MediaCache._read_raw_frames
+        ) as mock_read_raw_frames:
+            cache.get_or_set_segment_chunk(db_segment, 0, quality=FrameQuality.COMPRESSED)
+            cache.get_or_set_segment_chunk(db_segment, 0, quality=FrameQuality.ORIGINAL)
+
+        mock_read_raw_frames.assert_called_once()
+        for quality in FrameQuality:
+            self.assertTrue(cache._is_cached(cache._make_chunk_key(db_segment, 0, quality=quality)))
+
+    def test_can_get_frames_in_frame_order(self):
+        db_task = self._create_task(use_cache=True)
+        frame_provider = TaskFrameProvider(db_task)
+
+        frames = list(frame_provider.get_frames([4, 1, 2, 1]))
+
+        self.assertEqual([frame_number for frame_number, _ in frames], [1, 2, 4])
+        for frame_number, frame in frames:
+            self.assertEqual(
+                frame.data.getvalue(), frame_provider.get_frame(frame_number).data.getvalue()
+            )
+
+    def test_can_convert_frames_after_iteration(self):
+        db_task = self._create_task(use_cache=True)
+        frame_provider = TaskFrameProvider(db_task)
+
+        frame_loaders = list(frame_provider.get_frame_loaders([4, 1, 2, 1]))
+
+        self.assertEqual([frame_number for frame_number, _ in frame_loaders], [1, 2, 4])
+        for frame_number, frame_loader in frame_loaders:
+            self.assertEqual(
+                frame_loader().data.getvalue(),
+                frame_provider.get_frame(frame_number).data.getvalue(),
+            )
+
+    def test_can_get_original_image_paths(self):
+        db_task = self._create_task(use_cache=True)
+        frame_provider = TaskFrameProvider(db_task)
+
+        original_image_paths = frame_provider.get_original_image_paths(range(5))
+
+        self.assertEqual(set(original_image_paths), set(range(5)))
+        for frame_number, image_path in original_image_paths.items():
+            self.assertEqual(
+                image_path.read_bytes(), frame_provider.get_frame(frame_number).data.getvalue()
+            )
+
+    def test_original_image_paths_skip_missing_files(self):
+        db_task = self._create_task(use_cache=True)
+        frame_provider = TaskFrameProvider(db_task)
+        os.remove(frame_provider.get_original_image_paths([2])[2])
+
+        self.assertEqual(set(frame_provider.get_original_image_paths(range(5))), {0, 1, 3, 4})
+
+
 class JobAnnotationAPITestCase(ApiTestBase):
     @classmethod
     def setUpTestData(cls):
@@ -6259,7 +6530,7 @@ class JobAnnotationAPITestCase(ApiTestBase):
         ]["mutable"]
         self._check_response(response, data)
 
-        data = response.data
+        data = response.json()
         if not response.status_code in [status.HTTP_403_FORBIDDEN, status.HTTP_401_UNAUTHORIZED]:
             data["tags"][0]["label_id"] = task["labels"][0]["id"]
             data["shapes"][0]["points"] = [1, 2, 3.0, 100, 120, 1, 2, 4.0]
@@ -6415,6 +6686,853 @@ class JobAnnotationAPITestCase(ApiTestBase):
         self._run_api_v2_jobs_id_annotations(self.user, self.user, None)
 
 
+class JobAnnotationIncrementalUpdateAPITestCase(ApiTestBase):
+    @classmethod
+    def setUpTestData(cls):
+        create_db_users(cls, primary=False, extra=False)
+
+    def setUp(self):
+        super().setUp()
+
+        task_spec = {
+            "name": "incremental update task",
+            "overlap": 0,
+            "segment_size": 100,
+            "labels": [
+                {
+                    "name": "car",
+                    "attributes": [
+                        {
+                            "name": "model",
+                            "mutable": False,
+                            "input_type": "select",
+                            "default_value": "mazda",
+                            "values": ["bmw", "mazda", "renault"],
+                        },
+                        {
+                            "name": "parked",
+                            "mutable": True,
+                            "input_type": "checkbox",
+                            "default_value": "false",
+                            "values": ["false", "true"],
+                        },
+                    ],
+                },
+                {
+                    "name": "skel",
+                    "type": "skeleton",
+                    "attributes": [],
+                    "sublabels": [
+                        {"name": "1", "attributes": [], "type": "points"},
+                        {"name": "2", "attributes": [], "type": "points"},
+                    ],
+                    "svg": "",
+                },
+            ],
+        }
+
+        with ForceLogin(self.admin, self.client):
+            response = self.client.post("/api/tasks", data=task_spec, format="json")
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+            tid = response.data["id"]
+
+            response = self.client.post(
+                f"/api/tasks/{tid}/data",
+                data={
+                    "client_files[0]": generate_random_image_file("test_1.jpg")[1],
+                    "client_files[1]": generate_random_image_file("test_2.jpg")[1],
+                    "image_quality": 75,
+                },
+            )
+            self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+
+        db_task = Task.objects.get(id=tid)
+        self.job_id = db_task.segment_set.get().job_set.get().id
+
+        labels = {label.name: label for label in db_task.label_set.filter(parent=None)}
+        self.car_label = labels["car"]
+        self.skeleton_label = labels["skel"]
+        self.skeleton_sublabels = list(self.skeleton_label.sublabels.order_by("name"))
+        self.car_attributes = {
+            spec.name: spec.id for spec in self.car_label.attributespec_set.all()
+        }
+
+    def _put_annotations(self, data, **kwargs):
+        with ForceLogin(self.admin, self.client):
+            return self.client.put(
+                f"/api/jobs/{self.job_id}/annotations", data=data, format="json", **kwargs
+            )
+
+    def _get_annotations(self):
+        with ForceLogin(self.admin, self.client):
+            response = self.client.get(f"/api/jobs/{self.job_id}/annotations")
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            return response.json()
+
+    def _patch_annotations(self, action, data, **kwargs):
+        with ForceLogin(self.admin, self.client):
+            return self.client.patch(
+                f"/api/jobs/{self.job_id}/annotations",
+                query_params={"action": action},
+                data=data,
+                format="json",
+                **kwargs,
+            )
+
+    def _create_annotations(self):
+        data = {
+            "version": 0,
+            "tags": [
+                {
+                    "frame": 0,
+                    "label_id": self.car_label.id,
+                    "group": 0,
+                    "source": "manual",
+                    "attributes": [
+                        {"spec_id": self.car_attributes["model"], "value": "bmw"},
+                        {"spec_id": self.car_attributes["parked"], "value": "false"},
+                    ],
+                }
+            ],
+            "shapes": [
+                {
+                    "frame": 0,
+                    "label_id": self.car_label.id,
+                    "group": 0,
+                    "source": "manual",
+                    "type": "rectangle",
+                    "points": [1.0, 2.0, 10.0, 20.0],
+                    "occluded": False,
+                    "attributes": [
+                        {"spec_id": self.car_attributes["model"], "value": "bmw"},
+                        {"spec_id": self.car_attributes["parked"], "value": "false"},
+                    ],
+                },
+                {
+                    "frame": 1,
+                    "label_id": self.skeleton_label.id,
+                    "group": 0,
+                    "source": "manual",
+                    "type": "skeleton",
+                    "points": [],
+                    "attributes": [],
+                    "elements": [
+                        {
+                            "frame": 1,
+                            "label_id": sublabel.id,
+                            "group": 0,
+                            "source": "manual",
+                            "type": "points",
+                            "points": [float(i), float(i)],
+                            "attributes": [],
+                        }
+                        for i, sublabel in enumerate(self.skeleton_sublabels)
+                    ],
+                },
+            ],
+            "tracks": [],
+        }
+
+        response = self._put_annotations(data)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return self._get_annotations()
+
+    def _get_attribute_rows(self, shape_id):
+        return dict(
+            LabeledShapeAttributeVal.objects.filter(shape_id=shape_id).values_list("spec_id", "id")
+        )
+
+    def test_can_update_annotations_in_place(self):
+        annotations = self._create_annotations()
+        shape = annotations["shapes"][0]
+        attribute_rows = self._get_attribute_rows(shape["id"])
+
+        shape["points"] = [2.0, 3.0, 11.0, 21.0]
+        for attr in shape["attributes"]:
+            if attr["spec_id"] == self.car_attributes["parked"]:
+                attr["value"] = "true"
+
+        response = self._patch_annotations("update", {"shapes": [shape]})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["shapes"][0]["id"], shape["id"])
+
+        updated_annotations = self._get_annotations()
+        self.assertEqual(updated_annotations["shapes"][0], shape)
+        self.assertEqual(updated_annotations["shapes"][1], annotations["shapes"][1])
+        self.assertEqual(updated_annotations["tags"], annotations["tags"])
+
+        # the existing attribute rows are reused
+        self.assertEqual(self._get_attribute_rows(shape["id"]), attribute_rows)
+
+    def test_can_update_skeleton_elements_in_place(self):
+        annotations = self._create_annotations()
+        skeleton = annotations["shapes"][1]
+        skeleton["elements"][1]["points"] = [5.0, 6.0]
+        skeleton["elements"][1]["outside"] = True
+
+        response = self._patch_annotations("update", {"shapes": [skeleton]})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        updated_annotations = self._get_annotations()
+        self.assertEqual(updated_annotations["shapes"][1], skeleton)
+
+    def test_can_update_skeleton_with_changed_elements(self):
+        annotations = self._create_annotations()
+        skeleton = annotations["shapes"][1]
+        removed_element = skeleton["elements"].pop(1)
+
+        response = self._patch_annotations("update", {"shapes": [skeleton]})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        updated_annotations = self._get_annotations()
+        self.assertEqual(updated_annotations["shapes"][1], skeleton)
+        self.assertFalse(LabeledShape.objects.filter(id=removed_element["id"]).exists())
+
+    def test_unchanged_annotations_are_not_updated(self):
+        annotations = self._create_annotations()
+        updated_date = Job.objects.get(id=self.job_id).updated_date
+
+        with mock.patch(
+            "cvat.apps.dataset_manager.task.handle_annotations_change"
+        ) as mock_handle_annotations_change:
+            response = self._patch_annotations("update", annotations)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertEqual(response.json()["version"], annotations["version"])
+        self.assertEqual(Job.objects.get(id=self.job_id).updated_date, updated_date)
+
+        mock_handle_annotations_change.assert_called_once()
+        reported_annotations = mock_handle_annotations_change.call_args.args[1]
+        for kind in ["tags", "shapes", "tracks", "intervals"]:
+            self.assertEqual(reported_annotations[kind], [])
+
+    def test_only_changed_annotations_are_reported(self):
+        annotations = self._create_annotations()
+        annotations["tags"][0]["frame"] = 1
+
+        with mock.patch(
+            "cvat.apps.dataset_manager.task.handle_annotations_change"
+        ) as mock_handle_annotations_change:
+            response = self._patch_annotations("update", annotations)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        reported_annotations = mock_handle_annotations_change.call_args.args[1]
+        self.assertEqual(reported_annotations["tags"], [annotations["tags"][0]])
+        self.assertEqual(reported_annotations["shapes"], [])
+
+        self.assertGreater(response.json()["version"], annotations["version"])
+
+    def test_can_update_annotations_with_matching_version(self):
+        annotations = self._create_annotations()
+        annotations["shapes"][0]["z_order"] = 1
+
+        response = self._patch_annotations(
+            "update", annotations, headers={"If-Match": f'"{annotations["version"]}"'}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        updated_annotations = self._get_annotations()
+        self.assertEqual(updated_annotations["shapes"][0]["z_order"], 1)
+        self.assertEqual(response["ETag"], f'"{updated_annotations["version"]}"')
+
+    def test_cannot_update_annotations_with_outdated_version(self):
+        annotations = self._create_annotations()
+        outdated_version = annotations["version"]
+
+        annotations["shapes"][0]["z_order"] = 1
+        response = self._patch_annotations("update", annotations)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        current_version = response.json()["version"]
+
+        annotations["shapes"][0]["z_order"] = 2
+        for request in [
+            lambda headers: self._patch_annotations("update", annotations, headers=headers),
+            lambda headers: self._put_annotations(
+                {"version": 0, "tags": [], "shapes": [], "tracks": []}, headers=headers
+            ),
+        ]:
+            response = request({"If-Match": f'"{outdated_version}"'})
+            self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+            self.assertEqual(response["ETag"], f'"{current_version}"')
+
+        self.assertEqual(self._get_annotations()["shapes"][0]["z_order"], 1)
+
+    def test_job_changes_do_not_change_annotations_version(self):
+        annotations = self._create_annotations()
+
+        with ForceLogin(self.admin, self.client):
+            response = self.client.patch(
+                f"/api/jobs/{self.job_id}", data={"stage": "validation"}, format="json"
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self._get_annotations()["version"], annotations["version"])
+
+        annotations["shapes"][0]["z_order"] = 1
+        response = self._patch_annotations(
+            "update", annotations, headers={"If-Match": f'"{annotations["version"]}"'}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertGreater(response.json()["version"], annotations["version"])
+
+    def test_annotations_version_is_changed_on_each_change(self):
+        annotations = self._create_annotations()
+
+        versions = [annotations["version"]]
+        for z_order in range(1, 4):
+            annotations["shapes"][0]["z_order"] = z_order
+            response = self._patch_annotations("update", annotations)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            versions.append(response.json()["version"])
+
+        self.assertEqual(versions, sorted(set(versions)))
+
+
+@override_settings(
+    ANNOTATIONS_RESPONSE_CACHE_TTL=600,
+    ANNOTATIONS_RESPONSE_CACHE_COMPRESSION=True,
+)
+class JobAnnotationsResponseCacheAPITestCase(ApiTestBase):
+    @classmethod
+    def setUpTestData(cls):
+        create_db_users(cls, primary=False, extra=False)
+
+    def setUp(self):
+        super().setUp()
+
+        with ForceLogin(self.admin, self.client):
+            response = self.client.post(
+                "/api/tasks",
+                data={"name": "cached annotations task", "labels": [{"name": "car"}]},
+                format="json",
+            )
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+            tid = response.data["id"]
+
+            response = self.client.post(
+                f"/api/tasks/{tid}/data",
+                data={
+                    "client_files[0]": generate_random_image_file("test_1.jpg")[1],
+                    "image_quality": 75,
+                },
+            )
+            self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+
+        db_task = Task.objects.get(id=tid)
+        self.job_id = db_task.segment_set.get().job_set.get().id
+        self.label_id = db_task.label_set.get().id
+
+    def _get_annotations(self, **kwargs):
+        with ForceLogin(self.admin, self.client):
+            return self.client.get(f"/api/jobs/{self.job_id}/annotations", **kwargs)
+
+    def _add_shape(self):
+        with ForceLogin(self.admin, self.client):
+            response = self.client.patch(
+                f"/api/jobs/{self.job_id}/annotations",
+                query_params={"action": "create"},
+                data={
+                    "version": 0,
+                    "tags": [],
+                    "shapes": [
+                        {
+                            "frame": 0,
+                            "label_id": self.label_id,
+                            "group": 0,
+                            "source": "manual",
+                            "type": "rectangle",
+                            "points": [1.0, 2.0, 10.0, 20.0],
+                            "occluded": False,
+                            "attributes": [],
+                        }
+                    ],
+                    "tracks": [],
+                },
+                format="json",
+            )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_can_get_annotations_with_etag(self):
+        response = self._get_annotations()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["ETag"], '"{}"'.format(response.json()["version"]))
+
+    def test_can_get_not_modified_annotations(self):
+        response = self._get_annotations()
+        etag = response["ETag"]
+
+        response = self._get_annotations(headers={"If-None-Match": etag})
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(response.content, b"")
+
+    def test_can_get_annotations_from_cache(self):
+        self._add_shape()
+        response = self._get_annotations()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        with mock.patch(
+            "cvat.apps.dataset_manager.task.get_job_data", side_effect=AssertionError
+        ) as mock_get_job_data:
+            cached_response = self._get_annotations()
+
+        mock_get_job_data.assert_not_called()
+        self.assertEqual(cached_response.status_code, status.HTTP_200_OK)
+        self.assertEqual(cached_response["ETag"], response["ETag"])
+        self.assertEqual(cached_response.content, response.content)
+        self.assertEqual(len(cached_response.json()["shapes"]), 1)
+
+    def test_can_get_compressed_annotations_from_cache(self):
+        self._add_shape()
+        response = self._get_annotations()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        cached_response = self._get_annotations(headers={"Accept-Encoding": "gzip, deflate"})
+
+        self.assertEqual(cached_response.status_code, status.HTTP_200_OK)
+        self.assertEqual(cached_response["Content-Encoding"], "gzip")
+        self.assertEqual(cached_response["ETag"], "W/" + response["ETag"])
+        self.assertEqual(gzip.decompress(cached_response.content), response.content)
+
+    def test_annotations_change_invalidates_cached_annotations(self):
+        response = self._get_annotations()
+        self.assertEqual(response.json()["shapes"], [])
+
+        self._add_shape()
+        updated_response = self._get_annotations(headers={"If-None-Match": response["ETag"]})
+
+        self.assertEqual(updated_response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(updated_response["ETag"], response["ETag"])
+        self.assertEqual(len(updated_response.json()["shapes"]), 1)
+
+
+class JobAnnotationsVersionAPITestCase(ApiTestBase):
+    @classmethod
+    def setUpTestData(cls):
+        create_db_users(cls, primary=False, extra=False)
+
+    def _create_task(self, *, validation_params: dict | None = None) -> int:
+        image_names = [f"annotations_version_{i}.jpg" for i in range(6)]
+        for image_name in image_names:
+            image_path = settings.SHARE_ROOT / image_name
+            image_path.write_bytes(generate_image_file(image_name).getvalue())
+            self.addCleanup(os.remove, image_path)
+
+        with ForceLogin(self.admin, self.client):
+            response = self.client.post(
+                "/api/tasks",
+                data={
+                    "name": "annotations version task",
+                    "segment_size": 2,
+                    "labels": [
+                        {
+                            "name": "car",
+                            "attributes": [
+                                {
+                                    "name": "color",
+                                    "mutable": False,
+                                    "input_type": "text",
+                                    "values": [""],
+                                    "default_value": "",
+                                }
+                            ],
+                        },
+                        {"name": "person"},
+                    ],
+                },
+                format="json",
+            )
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+            task_id = response.data["id"]
+
+            response = self.client.post(
+                f"/api/tasks/{task_id}/data",
+                data={
+                    "server_files": image_names,
+                    "image_quality": 75,
+                    **(
+                        {"validation_params": validation_params, "sorting_method": "random"}
+                        if validation_params
+                        else {}
+                    ),
+                },
+                format="json",
+            )
+            self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+            self._check_request_status(self.admin, response.data["rq_id"])
+
+        return task_id
+
+    def _add_shape(self, job_id: int, *, frame: int, label: Label, **kwargs):
+        with ForceLogin(self.admin, self.client):
+            response = self.client.patch(
+                f"/api/jobs/{job_id}/annotations",
+                query_params={"action": "create"},
+                data={
+                    "version": 0,
+                    "tags": [],
+                    "shapes": [
+                        {
+                            "frame": frame,
+                            "label_id": label.id,
+                            "group": 0,
+                            "source": "manual",
+                            "type": "rectangle",
+                            "points": [1.0, 2.0, 10.0, 20.0],
+                            "occluded": False,
+                            "attributes": [],
+                            **kwargs,
+                        }
+                    ],
+                    "tracks": [],
+                },
+                format="json",
+            )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def _get_annotations(self, job_id: int, **kwargs):
+        with ForceLogin(self.admin, self.client):
+            return self.client.get(f"/api/jobs/{job_id}/annotations", **kwargs)
+
+    def _check_annotations_changed(self, job_id: int, etag: str, *, expected_shapes: int):
+        response = self._get_annotations(job_id, headers={"If-None-Match": etag})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(len(response.json()["shapes"]), expected_shapes)
+
+    def _make_honeypot_task(self) -> tuple[int, int, int, int]:
+        """
+        Returns the task id, the annotated job id, its honeypot frame,
+        and another validation frame for this honeypot
+        """
+
+        task_id = self._create_task(
+            validation_params={
+                "mode": "gt_pool",
+                "frame_selection_method": "manual",
+                "frames": ["annotations_version_0.jpg", "annotations_version_1.jpg"],
+                "frames_per_job_count": 1,
+            }
+        )
+        db_job = (
+            Job.objects.filter(segment__task_id=task_id, type=JobType.ANNOTATION)
+            .order_by("id")
+            .first()
+        )
+
+        response = self._get_request(f"/api/jobs/{db_job.id}/validation_layout", self.admin)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        (honeypot_frame,) = response.json()["honeypot_frames"]
+        (honeypot_real_frame,) = response.json()["honeypot_real_frames"]
+
+        response = self._get_request(f"/api/tasks/{task_id}/validation_layout", self.admin)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        new_honeypot_real_frame = next(
+            frame for frame in response.json()["validation_frames"] if frame != honeypot_real_frame
+        )
+
+        # Add annotations on a regular frame and on the honeypot frame
+        db_label = Task.objects.get(id=task_id).label_set.get(name="car")
+        regular_frame = next(f for f in db_job.segment.frame_set if f != honeypot_frame)
+        self._add_shape(db_job.id, frame=honeypot_frame, label=db_label)
+        self._add_shape(db_job.id, frame=regular_frame, label=db_label)
+
+        return task_id, db_job.id, honeypot_frame, new_honeypot_real_frame
+
+    def test_honeypot_update_in_job_changes_annotations_version(self):
+        _, job_id, _, new_honeypot_real_frame = self._make_honeypot_task()
+        response = self._get_annotations(job_id)
+        self.assertEqual(len(response.json()["shapes"]), 2)
+        etag = response["ETag"]
+
+        response = self._patch_request(
+            f"/api/jobs/{job_id}/validation_layout",
+            self.admin,
+            data={
+                "frame_selection_method": "manual",
+                "honeypot_real_frames": [new_honeypot_real_frame],
+            },
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self._check_annotations_changed(job_id, etag, expected_shapes=1)
+
+    def test_honeypot_update_in_task_changes_annotations_version(self):
+        task_id, job_id, honeypot_frame, new_honeypot_real_frame = self._make_honeypot_task()
+        etag = self._get_annotations(job_id)["ETag"]
+
+        validation_layout = self._get_request(
+            f"/api/tasks/{task_id}/validation_layout", self.admin
+        ).json()
+        response = self._patch_request(
+            f"/api/tasks/{task_id}/validation_layout",
+            self.admin,
+            data={
+                "frame_selection_method": "manual",
+                "honeypot_real_frames": [
+                    new_honeypot_real_frame if frame == honeypot_frame else real_frame
+                    for frame, real_frame in zip(
+                        validation_layout["honeypot_frames"],
+                        validation_layout["honeypot_real_frames"],
+                    )
+                ],
+            },
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self._check_annotations_changed(job_id, etag, expected_shapes=1)
+
+    def test_label_deletion_changes_annotations_version(self):
+        task_id = self._create_task()
+        job_id = Job.objects.filter(segment__task_id=task_id).order_by("id").first().id
+        db_labels = Task.objects.get(id=task_id).label_set
+        self._add_shape(job_id, frame=0, label=db_labels.get(name="car"))
+        self._add_shape(job_id, frame=0, label=db_labels.get(name="person"))
+        etag = self._get_annotations(job_id)["ETag"]
+
+        response = self._delete_request(
+            f"/api/labels/{db_labels.get(name='person').id}", self.admin
+        )
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+        self._check_annotations_changed(job_id, etag, expected_shapes=1)
+
+    def test_attribute_deletion_changes_annotations_version(self):
+        task_id = self._create_task()
+        job_id = Job.objects.filter(segment__task_id=task_id).order_by("id").first().id
+        db_label = Task.objects.get(id=task_id).label_set.get(name="car")
+        db_attribute = db_label.attributespec_set.get()
+        self._add_shape(
+            job_id,
+            frame=0,
+            label=db_label,
+            attributes=[{"spec_id": db_attribute.id, "value": "red"}],
+        )
+        etag = self._get_annotations(job_id)["ETag"]
+
+        response = self._patch_request(
+            f"/api/labels/{db_label.id}",
+            self.admin,
+            data={"attributes": [{"id": db_attribute.id, "deleted": True}]},
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self._get_annotations(job_id, headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(response.json()["shapes"][0]["attributes"], [])
+
+
+class AnnotationsFrameRangeAPITestCase(ApiTestBase):
+    @classmethod
+    def setUpTestData(cls):
+        create_db_users(cls, primary=False, extra=False)
+
+    def setUp(self):
+        super().setUp()
+
+        with ForceLogin(self.admin, self.client):
+            response = self.client.post(
+                "/api/tasks",
+                data={
+                    "name": "frame range task",
+                    "overlap": 1,
+                    "segment_size": 3,
+                    "labels": [{"name": "car"}],
+                },
+                format="json",
+            )
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+            self.task_id = response.data["id"]
+
+            response = self.client.post(
+                f"/api/tasks/{self.task_id}/data",
+                data={
+                    **{
+                        f"client_files[{i}]": generate_random_image_file(f"test_{i}.jpg")[1]
+                        for i in range(6)
+                    },
+                    "image_quality": 75,
+                },
+            )
+            self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+
+        db_task = Task.objects.get(id=self.task_id)
+        self.job_ids = [
+            db_segment.job_set.get().id
+            for db_segment in db_task.segment_set.order_by("start_frame")
+        ]
+        label_id = db_task.label_set.get().id
+
+        def _make_shape(frame: int, **kwargs) -> dict:
+            return {
+                "frame": frame,
+                "type": "rectangle",
+                "points": [1.0, 2.0, 10.0, 20.0],
+                "occluded": False,
+                "outside": False,
+                "attributes": [],
+                **kwargs,
+            }
+
+        with ForceLogin(self.admin, self.client):
+            response = self.client.put(
+                f"/api/tasks/{self.task_id}/annotations",
+                data={
+                    "version": 0,
+                    "tags": [
+                        {"frame": 3, "label_id": label_id, "group": 0, "attributes": []},
+                    ],
+                    "shapes": [
+                        _make_shape(frame, label_id=label_id, group=0, source="manual")
+                        for frame in range(6)
+                    ],
+                    "tracks": [
+                        {
+                            "frame": 1,
+                            "label_id": label_id,
+                            "group": 0,
+                            "source": "manual",
+                            "attributes": [],
+                            "shapes": [_make_shape(1), _make_shape(4, outside=True)],
+                        }
+                    ],
+                },
+                format="json",
+            )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def _get_annotations(self, url: str, **query_params):
+        with ForceLogin(self.admin, self.client):
+            return self.client.get(url, query_params=query_params)
+
+    def test_can_get_task_annotations_in_frame_range(self):
+        response = self._get_annotations(
+            f"/api/tasks/{self.task_id}/annotations", start_frame=2, stop_frame=3
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        annotations = response.json()
+        self.assertEqual([tag["frame"] for tag in annotations["tags"]], [3])
+        self.assertEqual(sorted(shape["frame"] for shape in annotations["shapes"]), [2, 3])
+        self.assertEqual(len(annotations["tracks"]), 1)
+        self.assertEqual(annotations["tracks"][0]["frame"], 2)
+
+    def test_can_read_task_annotations_by_frame_ranges(self):
+        full_annotations = self._get_annotations(f"/api/tasks/{self.task_id}/annotations").json()
+
+        shape_frames = []
+        track_frames = []
+        for start_frame in range(0, 6, 2):
+            response = self._get_annotations(
+                f"/api/tasks/{self.task_id}/annotations",
+                start_frame=start_frame,
+                stop_frame=start_frame + 1,
+            )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+            annotations = response.json()
+            self.assertEqual(annotations["version"], full_annotations["version"])
+            shape_frames.extend(shape["frame"] for shape in annotations["shapes"])
+            track_frames.extend(track["frame"] for track in annotations["tracks"])
+
+        self.assertEqual(
+            sorted(shape_frames), sorted(shape["frame"] for shape in full_annotations["shapes"])
+        )
+        # the track is clipped to each range and is outside since the frame 4
+        self.assertEqual(track_frames, [1, 2])
+
+    def test_can_get_job_annotations_in_frame_range(self):
+        response = self._get_annotations(f"/api/jobs/{self.job_ids[1]}/annotations", start_frame=3)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        annotations = response.json()
+        self.assertEqual([tag["frame"] for tag in annotations["tags"]], [3])
+        self.assertEqual(sorted(shape["frame"] for shape in annotations["shapes"]), [3, 4])
+        self.assertEqual(len(annotations["tracks"]), 1)
+        self.assertEqual([shape["frame"] for shape in annotations["tracks"][0]["shapes"]], [3, 4])
+        self.assertIn("ETag", response)
+
+    def test_job_annotations_in_frame_range_skip_finished_tracks(self):
+        label_id = Task.objects.get(id=self.task_id).label_set.get().id
+        shape = {
+            "type": "rectangle",
+            "points": [1.0, 2.0, 10.0, 20.0],
+            "occluded": False,
+            "attributes": [],
+        }
+        with ForceLogin(self.admin, self.client):
+            response = self.client.patch(
+                f"/api/jobs/{self.job_ids[1]}/annotations",
+                query_params={"action": "create"},
+                data={
+                    "version": 0,
+                    "tags": [],
+                    "shapes": [],
+                    "tracks": [
+                        {
+                            "frame": 2,
+                            "label_id": label_id,
+                            "group": 0,
+                            "source": "manual",
+                            "attributes": [],
+                            "shapes": [
+                                {**shape, "frame": 2, "outside": False},
+                                {**shape, "frame": 3, "outside": True},
+                            ],
+                        }
+                    ],
+                },
+                format="json",
+            )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            finished_track_id = response.json()["tracks"][0]["id"]
+
+        read_track_ids = []
+
+        def _slice_tracks(annotations: AnnotationIR, start: int, stop: int) -> list[dict]:
+            read_track_ids.extend(track["id"] for track in annotations.tracks)
+            return original_slice_tracks(annotations, start, stop)
+
+        original_slice_tracks = AnnotationIR.slice_tracks
+        with mock.patch.object(AnnotationIR, "slice_tracks", _slice_tracks):
+            response = self._get_annotations(
+                f"/api/jobs/{self.job_ids[1]}/annotations", start_frame=4
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # the other track is outside on the start frame, so it's removed by slicing
+        self.assertEqual(response.json()["tracks"], [])
+
+        # the finished track is not read from the DB at all
+        full_annotations = self._get_annotations(f"/api/jobs/{self.job_ids[1]}/annotations").json()
+        self.assertEqual(
+            read_track_ids,
+            [
+                track["id"]
+                for track in full_annotations["tracks"]
+                if track["id"] != finished_track_id
+            ],
+        )
+
+    def test_cannot_get_annotations_in_invalid_frame_range(self):
+        for url in [
+            f"/api/tasks/{self.task_id}/annotations",
+            f"/api/jobs/{self.job_ids[0]}/annotations",
+        ]:
+            for query_params in [
+                {"start_frame": "a"},
+                {"stop_frame": "-1"},
+                {"start_frame": 2, "stop_frame": 1},
+            ]:
+                with self.subTest(url=url, query_params=query_params):
+                    response = self._get_annotations(url, **query_params)
+
+                    self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
 class TaskAnnotationAPITestCase(ExportApiTestBase, ImportApiTestBase, JobAnnotationAPITestCase):
     def _put_api_v2_tasks_id_annotations(self, pk, user, data):
         with ForceLogin(user, self.client):
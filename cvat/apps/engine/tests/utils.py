@@ -860,10 +860,13 @@ def check_annotation_response(
 
         return None
 
+    # Responses served from the annotations response cache are not DRF responses
+    response_data = response.data if isinstance(response, Response) else response.json()
+
     try:
         compare_objects(
             self,
-            response.data,
+            response_data,
             data,
             ignore_keys=ignore_keys,
             defaults=_key_defaults,
@@ -872,7 +875,7 @@ def check_annotation_response(
     except AssertionError as e:
         print(
             "Objects are not equal:",
-            pformat(response.data, compact=True),
+            pformat(response_data, compact=True),
             "!=",
             pformat(data, compact=True),
             sep="\n",
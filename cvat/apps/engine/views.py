@@ -3,6 +3,7 @@
 #
 # SPDX-License-Identifier: MIT
 
+import gzip
 import itertools
 import os
 import os.path as osp
@@ -24,7 +25,14 @@ from django.conf import settings
 from django.core.files.storage import storages
 from django.db import IntegrityError, transaction
 from django.db.models.query import Prefetch, prefetch_related_objects
-from django.http import HttpResponse, HttpResponseBadRequest, HttpResponseNotFound
+from django.http import (
+    HttpResponse,
+    HttpResponseBadRequest,
+    HttpResponseNotFound,
+    HttpResponseNotModified,
+)
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags, quote_etag
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import (
     OpenApiExample,
@@ -39,6 +47,7 @@ from rest_framework.decorators import action
 from rest_framework.exceptions import APIException, NotFound, PermissionDenied, ValidationError
 from rest_framework.parsers import MultiPartParser
 from rest_framework.permissions import SAFE_METHODS, IsAuthenticated
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 from rest_framework.settings import api_settings
 from rq.job import Job as RQJob
@@ -66,7 +75,11 @@ from cvat.apps.engine.media_io.frame_provider import (
     JobFrameProvider,
     TaskFrameProvider,
 )
-from cvat.apps.engine.media_io.media_provider import DataWithMeta, PreviewNotAvailable
+from cvat.apps.engine.media_io.media_provider import (
+    DataWithMeta,
+    IMediaProvider,
+    PreviewNotAvailable,
+)
 from cvat.apps.engine.mixins import BackupMixin, DatasetMixin, PartialUpdateModelMixin, UploadMixin
 from cvat.apps.engine.models import (
     AnnotationGuide,
@@ -704,6 +717,137 @@ def _parse_range_header(range_header: str | None) -> tuple[int | None, int | Non
     )
 
 
+def _parse_if_match_annotations_versions(request: ExtendedRequest) -> list[int] | None:
+    if_match = request.headers.get("If-Match")
+    if not if_match:
+        return None
+
+    etags = parse_etags(if_match)
+    if etags == ["*"]:
+        return None
+
+    versions = []
+    for etag in etags:
+        etag = etag.removeprefix("W/").strip('"')
+        if etag.isdigit():
+            versions.append(int(etag))
+
+    return versions
+
+
+def _is_annotations_version_not_modified(request: ExtendedRequest, version: int) -> bool:
+    if_none_match = request.headers.get("If-None-Match")
+    if not if_none_match:
+        return False
+
+    etags = parse_etags(if_none_match)
+    return etags == ["*"] or any(
+        etag.removeprefix("W/").strip('"') == str(version) for etag in etags
+    )
+
+
+_ACCEPTS_GZIP_PATTERN = re.compile(r"\bgzip\b")
+
+
+def _make_cached_annotations_response(
+    request: ExtendedRequest, content: bytes, encoding: str | None, version: int
+) -> HttpResponse:
+    etag = quote_etag(str(version))
+
+    if encoding == dm.task.JobAnnotationsResponseCache.GZIP_ENCODING:
+        if _ACCEPTS_GZIP_PATTERN.search(request.headers.get("Accept-Encoding", "")):
+            # The same as in the GZipMiddleware, the compressed content is not byte-equal
+            etag = "W/" + etag
+        else:
+            content = gzip.decompress(content)
+            encoding = None
+
+    response = HttpResponse(content, content_type=request.accepted_media_type)
+    if encoding:
+        response["Content-Encoding"] = encoding
+    response["ETag"] = etag
+    patch_vary_headers(response, ("Accept-Encoding",))
+    return response
+
+
+def _make_annotations_response(data: dict) -> Response:
+    response = Response(data)
+    response["ETag"] = quote_etag(str(data["version"]))
+    return response
+
+
+def _make_annotations_version_conflict_response(
+    error: dm.task.AnnotationsVersionConflictError,
+) -> Response:
+    response = Response(data=str(error), status=status.HTTP_412_PRECONDITION_FAILED)
+    response["ETag"] = quote_etag(str(error.current_version))
+    return response
+
+
+_ANNOTATIONS_IF_NONE_MATCH_PARAMETER = OpenApiParameter(
+    "If-None-Match",
+    type=OpenApiTypes.STR,
+    location=OpenApiParameter.HEADER,
+    required=False,
+    description="The annotations version known to the client, as returned in the ETag header. "
+    "If the job annotations have not been changed since, the 304 status is returned "
+    "without the annotations.",
+)
+
+_ANNOTATIONS_IF_MATCH_PARAMETER = OpenApiParameter(
+    "If-Match",
+    type=OpenApiTypes.STR,
+    location=OpenApiParameter.HEADER,
+    required=False,
+    description="The expected annotations version, as returned in the ETag header or "
+    "in the 'version' field of the annotations. If the job annotations have been changed "
+    "since, the request is rejected with the 412 status.",
+)
+
+
+_ANNOTATIONS_FRAME_RANGE_PARAMETERS = [
+    OpenApiParameter(
+        "start_frame",
+        type=OpenApiTypes.INT,
+        location=OpenApiParameter.QUERY,
+        required=False,
+        description="The first frame of the returned annotations. "
+        "Only the annotations on the frames in the [start_frame, stop_frame] range are returned. "
+        "Tracks are clipped to the range, intervals are selected by the start frame. "
+        "Large annotations can be read in parts by requesting consecutive frame ranges.",
+    ),
+    OpenApiParameter(
+        "stop_frame",
+        type=OpenApiTypes.INT,
+        location=OpenApiParameter.QUERY,
+        required=False,
+        description="The last frame of the returned annotations, inclusive",
+    ),
+]
+
+
+def _parse_annotations_frame_range(
+    request: ExtendedRequest, *, default_start: int, default_stop: int
+) -> tuple[int, int] | None:
+    if not {"start_frame", "stop_frame"} & request.query_params.keys():
+        return None
+
+    frame_range = []
+    for param, default in [("start_frame", default_start), ("stop_frame", default_stop)]:
+        value = request.query_params.get(param)
+        if value is None:
+            frame_range.append(default)
+        elif value.isdigit():
+            frame_range.append(int(value))
+        else:
+            raise ValidationError(f"Wrong {param} value")
+
+    if frame_range[0] > frame_range[1]:
+        raise ValidationError("The start_frame can't be greater than the stop_frame")
+
+    return tuple(frame_range)
+
+
 class _DataGetter(metaclass=ABCMeta):
     def __init__(
         self,
@@ -759,6 +903,7 @@ class _DataGetter(metaclass=ABCMeta):
         return start, min(end, content_size - 1)
 
     def _make_ranged_chunk_response(self, chunk_data: DataWithMeta) -> HttpResponse:
+        # getvalue() returns the buffer shared with the cached item, no copies are made here
         data = chunk_data.data.getvalue()
         content_size = len(data)
         chunk_headers = {
@@ -780,7 +925,8 @@ class _DataGetter(metaclass=ABCMeta):
                 },
             )
 
-        partial_data = data[start : end + 1]
+        # Only the requested part is copied into the response
+        partial_data = memoryview(data)[start : end + 1]
         return HttpResponse(
             partial_data,
             content_type=chunk_data.mime,
@@ -797,6 +943,7 @@ class _DataGetter(metaclass=ABCMeta):
 
         if self.type == "chunk":
             data = media_provider.get_chunk(self.number, quality=self.quality)
+            self._prefetch_chunks(media_provider, self.number)
             return self._make_ranged_chunk_response(data)
 
         elif self.type == "frame":
@@ -842,6 +989,13 @@ class _DataGetter(metaclass=ABCMeta):
                 data="unknown data type {}.".format(self.type), status=status.HTTP_400_BAD_REQUEST
             )
 
+    def _prefetch_chunks(self, media_provider: IMediaProvider, chunk_number: int):
+        try:
+            media_provider.prefetch_chunks(chunk_number, quality=self.quality)
+        except Exception:
+            # Prefetching is an optimization, it must not break the requested chunk response
+            slogger.glob.warning("Failed to enqueue chunk prefetching", exc_info=True)
+
     def __call__(self):
         try:
             return self._get_data_response()
@@ -875,7 +1029,8 @@ class _DataGetter(metaclass=ABCMeta):
     "The number of significant bytes from the chunk header, used for checksum computation"
 
     def _get_chunk_checksum(self, chunk_data: DataWithMeta) -> str:
-        data = chunk_data.data.getbuffer()
+        # getbuffer() would copy the data shared with the cached item
+        data = memoryview(chunk_data.data.getvalue())
         size_checksum = zlib.crc32(str(len(data)).encode())
         return str(zlib.crc32(data[: self._CHUNK_HEADER_BYTES_LENGTH], size_checksum))
 
@@ -989,6 +1144,7 @@ class _JobDataGetter(_DataGetter):
                 data = media_provider.get_chunk(
                     self.index, quality=self.quality, is_task_chunk=False
                 )
+                self._prefetch_chunks(media_provider, self.index)
             else:
                 data = media_provider.get_chunk(
                     self.number, quality=self.quality, is_task_chunk=True
@@ -1669,6 +1825,7 @@ class TaskViewSet(
     @extend_schema(
         methods=["GET"],
         summary="Get task annotations",
+        parameters=_ANNOTATIONS_FRAME_RANGE_PARAMETERS,
         responses={
             "200": OpenApiResponse(LabeledDataSerializer),
             "400": OpenApiResponse(description="Exporting without data is not allowed"),
@@ -1797,7 +1954,11 @@ class TaskViewSet(
                     "/api/tasks/id/dataset/export?save_images=False"
                 )
 
-            data = dm.task.get_task_data(self._object.pk)
+            frame_range = _parse_annotations_frame_range(
+                request, default_start=0, default_stop=self._object.data.size - 1
+            )
+
+            data = dm.task.get_task_data(self._object.pk, frame_range=frame_range)
             return Response(data)
 
         elif request.method == "POST" or request.method == "OPTIONS":
@@ -2384,9 +2545,12 @@ class JobViewSet(
                 required=False,
                 deprecated=True,
             ),
+            _ANNOTATIONS_IF_NONE_MATCH_PARAMETER,
+            *_ANNOTATIONS_FRAME_RANGE_PARAMETERS,
         ],
         responses={
             "200": OpenApiResponse(LabeledDataSerializer),
+            "304": OpenApiResponse(description="The annotations have not been changed"),
             "410": OpenApiResponse(
                 description="API endpoint no longer handles dataset exporting process"
             ),
@@ -2459,14 +2623,20 @@ class JobViewSet(
     @extend_schema(
         methods=["PUT"],
         summary="Replace job annotations",
+        parameters=[_ANNOTATIONS_IF_MATCH_PARAMETER],
         request=LabeledDataSerializer,
         responses={
             "200": OpenApiResponse(description="Annotations have been replaced"),
+            "412": OpenApiResponse(description="The annotations have been changed"),
         },
     )
     @extend_schema(
         methods=["PATCH"],
         summary="Update job annotations",
+        description=textwrap.dedent("""\
+            Only the changed annotations and their attributes are written
+            with the "update" action. The unchanged annotations are skipped.
+        """),
         parameters=[
             OpenApiParameter(
                 "action",
@@ -2474,11 +2644,13 @@ class JobViewSet(
                 type=OpenApiTypes.STR,
                 required=True,
                 enum=["create", "update", "delete"],
-            )
+            ),
+            _ANNOTATIONS_IF_MATCH_PARAMETER,
         ],
         request=LabeledDataSerializer,
         responses={
             "200": OpenApiResponse(description="Annotations successfully uploaded"),
+            "412": OpenApiResponse(description="The annotations have been changed"),
         },
     )
     @extend_schema(
@@ -2509,8 +2681,42 @@ class JobViewSet(
                     "/api/jobs/id/dataset/export?save_images=False"
                 )
 
-            annotations = dm.task.get_job_data(self._object.pk)
-            return Response(annotations)
+            frame_range = _parse_annotations_frame_range(
+                request,
+                default_start=self._object.segment.start_frame,
+                default_stop=self._object.segment.stop_frame,
+            )
+
+            version = dm.task.get_annotations_version(self._object)
+            if _is_annotations_version_not_modified(request, version):
+                response = HttpResponseNotModified()
+                response["ETag"] = quote_etag(str(version))
+                return response
+
+            response_cache = dm.task.JobAnnotationsResponseCache
+            renderer = request.accepted_renderer
+            renderer_context = self.get_renderer_context()
+            if (
+                frame_range is not None
+                or not response_cache.is_enabled()
+                or not isinstance(renderer, JSONRenderer)
+                or renderer.get_indent(request.accepted_media_type, renderer_context)
+            ):
+                return _make_annotations_response(
+                    dm.task.get_job_data(self._object.pk, frame_range=frame_range)
+                )
+
+            cached_response = response_cache.get(self._object.pk, version)
+            if not cached_response:
+                annotations = dm.task.get_job_data(self._object.pk)
+                version = annotations["version"]
+                cached_response = response_cache.set(
+                    self._object.pk,
+                    version,
+                    renderer.render(annotations, request.accepted_media_type, renderer_context),
+                )
+
+            return _make_cached_annotations_response(request, *cached_response, version)
 
         elif request.method == "POST" or request.method == "OPTIONS":
             return self.upload_data(request, append_url_name="append-annotations-chunk")
@@ -2524,10 +2730,16 @@ class JobViewSet(
             )
             if serializer.is_valid(raise_exception=True):
                 try:
-                    data = dm.task.put_job_data(pk, serializer.validated_data)
+                    data = dm.task.put_job_data(
+                        pk,
+                        serializer.validated_data,
+                        expected_versions=_parse_if_match_annotations_versions(request),
+                    )
                 except (AttributeError, IntegrityError) as e:
                     return Response(data=str(e), status=status.HTTP_400_BAD_REQUEST)
-                return Response(data)
+                except dm.task.AnnotationsVersionConflictError as e:
+                    return _make_annotations_version_conflict_response(e)
+                return _make_annotations_response(data)
         elif request.method == "DELETE":
             dm.task.delete_job_data(pk)
             return Response(status=status.HTTP_204_NO_CONTENT)
@@ -2542,10 +2754,17 @@ class JobViewSet(
             )
             if serializer.is_valid(raise_exception=True):
                 try:
-                    data = dm.task.patch_job_data(pk, serializer.validated_data, action)
+                    data = dm.task.patch_job_data(
+                        pk,
+                        serializer.validated_data,
+                        action,
+                        expected_versions=_parse_if_match_annotations_versions(request),
+                    )
                 except (AttributeError, IntegrityError) as e:
                     return Response(data=str(e), status=status.HTTP_400_BAD_REQUEST)
-                return Response(data)
+                except dm.task.AnnotationsVersionConflictError as e:
+                    return _make_annotations_version_conflict_response(e)
+                return _make_annotations_response(data)
 
     @tus_chunk_action(detail=True, suffix_base="annotations")
     def append_annotations_chunk(self, request: ExtendedRequest, pk: int, file_id: str):
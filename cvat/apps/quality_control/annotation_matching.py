@@ -28,6 +28,9 @@ _ShapeT2 = TypeVar("_ShapeT2")
 ShapeSimilarityFunction: TypeAlias = Callable[
     [_ShapeT1, _ShapeT2], float
 ]  # (shape1, shape2) -> [0; 1], returns 0 for mismatches, 1 for matches
+ShapeSimilarityMatrixFunction: TypeAlias = Callable[
+    [Sequence[_ShapeT1], Sequence[_ShapeT2]], np.ndarray
+]  # (shapes1, shapes2) -> (len(shapes1), len(shapes2)) array of ShapeSimilarityFunction values
 LabelEqualityFunction: TypeAlias = Callable[[_ShapeT1, _ShapeT2], bool]
 SegmentMatchingResult: TypeAlias = tuple[
     list[tuple[_ShapeT1, _ShapeT2]],  # matches
@@ -248,6 +251,143 @@ def segment_iou(a: dm.Annotation, b: dm.Annotation, *, img_h: int, img_w: int) -
     return float(mask_utils.iou(b, a, [0]))
 
 
+def _decode_rle_counts(counts: bytes | str) -> list[int]:
+    # The compressed RLE format of pycocotools, see rleFrString() in maskApi.c
+    if isinstance(counts, str):
+        counts = counts.encode()
+
+    decoded = []
+    pos = 0
+    while pos < len(counts):
+        value = 0
+        shift = 0
+        more = True
+        while more:
+            c = counts[pos] - 48
+            value |= (c & 0x1F) << shift
+            more = c & 0x20
+            pos += 1
+            shift += 5
+            if not more and (c & 0x10):
+                value |= -1 << shift
+
+        if len(decoded) > 2:
+            value += decoded[-2]
+
+        decoded.append(value)
+
+    return decoded
+
+
+def rle_complement(rle: dict) -> dict:
+    """
+    Returns the RLE of the pixels not included in the RLE-encoded segment.
+    The segment is not decoded into a dense mask.
+    """
+
+    from pycocotools import mask as mask_utils
+
+    h, w = rle["size"]
+    counts = rle["counts"]
+    if not isinstance(counts, list):
+        counts = _decode_rle_counts(counts)
+
+    # The counts alternate the background and foreground runs, starting with the background
+    if counts and counts[0] == 0:
+        counts = counts[1:]
+    else:
+        counts = [0] + counts
+
+    return mask_utils.frPyObjects({"size": [h, w], "counts": counts}, h, w)
+
+
+def get_visible_segments(segment_rles: Sequence[dict], *, z_orders: Sequence[int]) -> list[dict]:
+    """
+    Returns the visible parts of the RLE-encoded segments, drawn in the z_order order.
+    Like in dm.CompiledMask, the segments with the same z_order are drawn in the input order.
+    The visible parts are computed with RLE operations, so memory use doesn't depend
+    on the frame size.
+    """
+
+    from pycocotools import mask as mask_utils
+
+    if not segment_rles:
+        return []
+
+    draw_order = sorted(range(len(segment_rles)), key=lambda i: z_orders[i])
+    rles = [segment_rles[i] for i in draw_order]
+
+    # Only the segments with intersecting bboxes can cover each other
+    bboxes = np.reshape(mask_utils.toBbox(rles), (-1, 4))
+    x0, y0 = bboxes[:, 0], bboxes[:, 1]
+    x1, y1 = x0 + bboxes[:, 2], y0 + bboxes[:, 3]
+
+    complements = {}
+    visible_rles = [None] * len(rles)
+    for i, rle in enumerate(rles):
+        top_ids = (
+            i
+            + 1
+            + np.flatnonzero(
+                (x0[i + 1 :] < x1[i])
+                & (x0[i] < x1[i + 1 :])
+                & (y0[i + 1 :] < y1[i])
+                & (y0[i] < y1[i + 1 :])
+            )
+        )
+
+        if len(top_ids):
+            for top_id in top_ids:
+                if top_id not in complements:
+                    complements[top_id] = rle_complement(rles[top_id])
+
+            rle = mask_utils.merge(
+                [rle] + [complements[top_id] for top_id in top_ids], intersect=True
+            )
+
+        visible_rles[draw_order[i]] = rle
+
+    return visible_rles
+
+
+def segment_iou_matrix(a_rles: Sequence, b_rles: Sequence) -> np.ndarray:
+    """
+    Computes IoU for all the pairs of RLE-encoded segments in a single call.
+    Returns a (len(a), len(b)) array with the values in [0; 1]
+    """
+
+    from pycocotools import mask as mask_utils
+
+    if not a_rles or not b_rles:
+        return np.zeros((len(a_rles), len(b_rles)))
+
+    # Note that mask_utils.iou expects (dt, gt). Check this if the 3rd param is True
+    ious = mask_utils.iou(list(b_rles), list(a_rles), [0] * len(a_rles))
+    return np.asarray(ious, dtype=float).reshape(len(b_rles), len(a_rles)).T
+
+
+def bbox_iou_matrix(a_bboxes: np.ndarray, b_bboxes: np.ndarray) -> np.ndarray:
+    """
+    Computes IoU for all the pairs of axis-aligned boxes, given as [x, y, w, h] rows.
+    Returns a (len(a), len(b)) array. Like in datumaro.util.annotation_util.bbox_iou(),
+    the value is -1 for the boxes without intersection.
+    """
+
+    a_bboxes = np.reshape(a_bboxes, (-1, 4)).astype(float)
+    b_bboxes = np.reshape(b_bboxes, (-1, 4)).astype(float)
+
+    a_x, a_y, a_w, a_h = (v[:, np.newaxis] for v in a_bboxes.T)
+    b_x, b_y, b_w, b_h = (v[np.newaxis, :] for v in b_bboxes.T)
+
+    in_w = np.maximum(0, np.minimum(a_x + a_w, b_x + b_w) - np.maximum(a_x, b_x))
+    in_h = np.maximum(0, np.minimum(a_y + a_h, b_y + b_h) - np.maximum(a_y, b_y))
+    intersection = in_w * in_h
+    union = a_w * a_h + b_w * b_h - intersection
+
+    has_intersection = intersection != 0
+    return np.where(has_intersection, intersection / np.where(has_intersection, union, 1), -1.0)
+
+
 @define(kw_only=True)
 class LineMatcher(datumaro.components.annotations.matcher.LineMatcher):
     EPSILON = 1e-7
@@ -535,7 +675,8 @@ class DistanceComparator(datumaro.components.comparator.DistanceComparator):
         item_a: dm.DatasetItem,
         item_b: dm.DatasetItem,
         *,
-        distance: ShapeSimilarityFunction[_ShapeT1, _ShapeT2],
+        distance: ShapeSimilarityFunction[_ShapeT1, _ShapeT2] | None = None,
+        similarity_matrix: ShapeSimilarityMatrixFunction[_ShapeT1, _ShapeT2] | None = None,
         label_matcher: LabelEqualityFunction[_ShapeT1, _ShapeT2] | None = None,
         a_objs: Sequence[_ShapeT1] | None = None,
         b_objs: Sequence[_ShapeT2] | None = None,
@@ -556,8 +697,27 @@ class DistanceComparator(datumaro.components.comparator.DistanceComparator):
         if b_annotations_getter is None:
             b_annotations_getter = self._as_annotation_sequence
 
+        skip_non_overlapping = False
+        if similarity_matrix is not None:
+            # Dense frames can have hundreds of objects,
+            # computing the similarities for all the pairs at once is much faster
+            distance = self._make_similarity_lookup(
+                similarity_matrix(a_objs, b_objs), a_objs=a_objs, b_objs=b_objs
+            )
+
+            # Most of the pairs on such frames don't overlap. Such shapes can't be matched,
+            # and they are only reported as unmatched, so there is no need to compare attributes
+            skip_non_overlapping = not direction_distance
+        assert callable(distance), distance
+
         def _compare(a: _ShapeT1, b: _ShapeT2) -> _PairwiseComparison:
             base_geometry_similarity = distance(a, b)
+            if skip_non_overlapping and base_geometry_similarity <= 0:
+                return _PairwiseComparison(
+                    geometry_similarity=base_geometry_similarity,
+                    base_geometry_similarity=base_geometry_similarity,
+                )
+
             geometry_similarity = (
                 direction_distance(a, b) if direction_distance else base_geometry_similarity
             )
@@ -611,32 +771,65 @@ class DistanceComparator(datumaro.components.comparator.DistanceComparator):
         return returned_values
 
     def match_boxes(self, item_a: dm.DatasetItem, item_b: dm.DatasetItem):
-        def _bbox_iou(a: dm.Bbox, b: dm.Bbox, *, img_w: int, img_h: int) -> float:
-            if a.attributes.get("rotation", 0) == b.attributes.get("rotation", 0):
-                return datumaro.util.annotation_util.bbox_iou(a, b)
-            else:
-                return segment_iou(self.to_polygon(a), self.to_polygon(b), img_h=img_h, img_w=img_w)
+        def _bbox_iou_matrix(
+            a_boxes: Sequence[dm.Bbox], b_boxes: Sequence[dm.Bbox], *, img_w: int, img_h: int
+        ) -> np.ndarray:
+            similarities = bbox_iou_matrix(
+                [a.get_bbox() for a in a_boxes], [b.get_bbox() for b in b_boxes]
+            )
+
+            # Boxes with different rotations are compared as polygons
+            a_rotations = np.array([a.attributes.get("rotation", 0) for a in a_boxes])
+            b_rotations = np.array([b.attributes.get("rotation", 0) for b in b_boxes])
+            rotation_mismatches = a_rotations[:, np.newaxis] != b_rotations[np.newaxis, :]
+            if rotation_mismatches.any():
+                a_ids = np.flatnonzero(rotation_mismatches.any(axis=1))
+                b_ids = np.flatnonzero(rotation_mismatches.any(axis=0))
+                polygon_similarities = segment_iou_matrix(
+                    [self._to_polygon_rle(a_boxes[i], img_h=img_h, img_w=img_w) for i in a_ids],
+                    [self._to_polygon_rle(b_boxes[i], img_h=img_h, img_w=img_w) for i in b_ids],
+                )
+
+                pair_ids = np.ix_(a_ids, b_ids)
+                similarities[pair_ids] = np.where(
+                    rotation_mismatches[pair_ids], polygon_similarities, similarities[pair_ids]
+                )
+
+            return similarities
 
         img_h, img_w = item_a.media_as(dm.Image).size
         return self.match_segments(
             dm.AnnotationType.bbox,
             item_a,
             item_b,
-            distance=partial(_bbox_iou, img_h=img_h, img_w=img_w),
+            similarity_matrix=partial(_bbox_iou_matrix, img_h=img_h, img_w=img_w),
         )
 
     def match_ellipses(self, item_a: dm.DatasetItem, item_b: dm.DatasetItem):
-        def _ellipse_iou(a: dm.Ellipse, b: dm.Ellipse, *, img_w: int, img_h: int) -> float:
-            return segment_iou(self.to_polygon(a), self.to_polygon(b), img_h=img_h, img_w=img_w)
+        def _ellipse_iou_matrix(
+            a_ellipses: Sequence[dm.Ellipse],
+            b_ellipses: Sequence[dm.Ellipse],
+            *,
+            img_w: int,
+            img_h: int,
+        ) -> np.ndarray:
+            return segment_iou_matrix(
+                [self._to_polygon_rle(a, img_h=img_h, img_w=img_w) for a in a_ellipses],
+                [self._to_polygon_rle(b, img_h=img_h, img_w=img_w) for b in b_ellipses],
+            )
 
         img_h, img_w = item_a.media_as(dm.Image).size
         return self.match_segments(
             dm.AnnotationType.ellipse,
             item_a,
             item_b,
-            distance=partial(_ellipse_iou, img_h=img_h, img_w=img_w),
+            similarity_matrix=partial(_ellipse_iou_matrix, img_h=img_h, img_w=img_w),
         )
 
+    def _to_polygon_rle(self, ann: dm.Bbox | dm.Ellipse, *, img_h: int, img_w: int):
+        (rle,) = to_rle(self.to_polygon(ann), img_h=img_h, img_w=img_w)
+        return rle
+
     def match_segmentations(self, item_a: dm.DatasetItem, item_b: dm.DatasetItem):
         def _get_segmentations(item):
             return self._get_ann_type(dm.AnnotationType.polygon, item) + self._get_ann_type(
@@ -668,87 +861,39 @@ class DistanceComparator(datumaro.components.comparator.DistanceComparator):
 
             return instances, instance_map
 
-        def _get_compiled_mask(
-            anns: Sequence[dm.Annotation], *, instance_ids: dict[int, int]
-        ) -> dm.CompiledMask:
-            if not anns:
-                return None
-
+        def _get_instance_segments(instances: list[list[dm.Annotation]]) -> list[dict]:
             from pycocotools import mask as mask_utils
 
-            # Merge instance groups
-            object_rle_groups = [to_rle(ann, img_h=img_h, img_w=img_w) for ann in anns]
-            object_rles = [mask_utils.merge(g) for g in object_rle_groups]
-
-            # Mask materialization can consume a lot of memory,
-            # avoid storing all the masks simultaneously
-            def _make_lazy_decode(i: int):
-                def _lazy_decode() -> dm.BinaryMaskImage:
-                    return mask_utils.decode([object_rles[i]])[:, :, 0]
-
-                return _lazy_decode
-
-            return dm.CompiledMask.from_instance_masks(
-                # need to increment labels and instance ids by 1 to avoid confusion with background
-                instance_masks=(
-                    dm.Mask(image=_make_lazy_decode(i), z_order=ann.z_order, label=ann.label + 1)
-                    for i, ann in enumerate(anns)
-                ),
-                instance_ids=(iid + 1 for iid in instance_ids),
-            )
-
-        a_instances, a_instance_map = _find_instances(_get_segmentations(item_a))
-        b_instances, b_instance_map = _find_instances(_get_segmentations(item_b))
-
-        if self.panoptic_comparison:
-            a_compiled_mask = _get_compiled_mask(
-                list(itertools.chain.from_iterable(a_instances)),
-                instance_ids=[
-                    a_instance_map[id(ann)] for ann in itertools.chain.from_iterable(a_instances)
-                ],
-            )
-            b_compiled_mask = _get_compiled_mask(
-                list(itertools.chain.from_iterable(b_instances)),
-                instance_ids=[
-                    b_instance_map[id(ann)] for ann in itertools.chain.from_iterable(b_instances)
-                ],
-            )
-        else:
-            a_compiled_mask = None
-            b_compiled_mask = None
-
-        segment_cache = {}
-
-        def _get_segment(obj_id: int, *, compiled_mask: dm.CompiledMask | None = None, instances):
-            key = (id(instances), obj_id)
-            rle = segment_cache.get(key)
-
-            if rle is None:
-                from pycocotools import mask as mask_utils
-
-                if compiled_mask is not None:
-                    mask = compiled_mask.extract(obj_id + 1)
-
-                    rle = mask_utils.encode(mask)
-                else:
-                    # Create merged RLE for the instance shapes
-                    object_anns = instances[obj_id]
-                    object_rle_groups = [
-                        to_rle(ann, img_h=img_h, img_w=img_w) for ann in object_anns
-                    ]
-                    rle = mask_utils.merge(list(itertools.chain.from_iterable(object_rle_groups)))
+            instance_rles = [
+                [mask_utils.merge(to_rle(ann, img_h=img_h, img_w=img_w)) for ann in instance_anns]
+                for instance_anns in instances
+            ]
 
-                segment_cache[key] = rle
+            if self.panoptic_comparison:
+                # Only the visible parts of the shapes are compared
+                visible_rles = iter(
+                    get_visible_segments(
+                        list(itertools.chain.from_iterable(instance_rles)),
+                        z_orders=[ann.z_order for ann in itertools.chain.from_iterable(instances)],
+                    )
+                )
+                instance_rles = [[next(visible_rles) for _ in rles] for rles in instance_rles]
 
-            return rle
+            # Create merged RLE for the instance shapes
+            return [mask_utils.merge(rles) for rles in instance_rles]
 
-        def _segment_comparator(a_inst_id: int, b_inst_id: int) -> float:
-            a_segm = _get_segment(a_inst_id, compiled_mask=a_compiled_mask, instances=a_instances)
-            b_segm = _get_segment(b_inst_id, compiled_mask=b_compiled_mask, instances=b_instances)
+        a_instances, _ = _find_instances(_get_segmentations(item_a))
+        b_instances, _ = _find_instances(_get_segmentations(item_b))
 
-            from pycocotools import mask as mask_utils
+        def _segment_iou_matrix(a_inst_ids: Sequence[int], b_inst_ids: Sequence[int]) -> np.ndarray:
+            if not a_inst_ids or not b_inst_ids:
+                return np.zeros((len(a_inst_ids), len(b_inst_ids)))
 
-            return float(mask_utils.iou([b_segm], [a_segm], [0])[0])
+            a_segments = _get_instance_segments(a_instances)
+            b_segments = _get_instance_segments(b_instances)
+            return segment_iou_matrix(
+                [a_segments[i] for i in a_inst_ids], [b_segments[i] for i in b_inst_ids]
+            )
 
         def _label_matcher(a_inst_id: int, b_inst_id: int) -> bool:
             # labels are the same in the instance annotations
@@ -763,7 +908,7 @@ class DistanceComparator(datumaro.components.comparator.DistanceComparator):
             item_b,
             a_objs=range(len(a_instances)),
             b_objs=range(len(b_instances)),
-            distance=_segment_comparator,
+            similarity_matrix=_segment_iou_matrix,
             label_matcher=_label_matcher,
             a_annotations_getter=lambda instance_id: a_instances[instance_id],
             b_annotations_getter=lambda instance_id: b_instances[instance_id],
@@ -1050,6 +1195,23 @@ class DistanceComparator(datumaro.components.comparator.DistanceComparator):
 
         return []
 
+    @staticmethod
+    def _make_similarity_lookup(
+        similarities: np.ndarray, *, a_objs: Sequence[Any], b_objs: Sequence[Any]
+    ) -> ShapeSimilarityFunction[Any, Any]:
+        def _get_key(obj: Any) -> int:
+            # Instance ids are used as is, other objects are identified by id()
+            return obj if isinstance(obj, int) else id(obj)
+
+        a_indices = {_get_key(a): i for i, a in enumerate(a_objs)}
+        b_indices = {_get_key(b): i for i, b in enumerate(b_objs)}
+        rows = similarities.tolist()  # python floats are faster to access
+
+        def similarity_lookup(a: Any, b: Any) -> float:
+            return rows[a_indices[_get_key(a)]][b_indices[_get_key(b)]]
+
+        return similarity_lookup
+
     @classmethod
     def _make_memoizing_comparison(
         cls,
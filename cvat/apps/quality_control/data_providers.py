@@ -4,11 +4,18 @@
 
 from __future__ import annotations
 
-from collections.abc import Hashable, Sequence
+import hashlib
+import os
+import pickle  # nosec
+import tempfile
+from collections.abc import Hashable, Iterator, Sequence
+from contextlib import suppress
 from functools import cached_property
+from pathlib import Path
 from typing import Any
 
 import datumaro as dm
+from django.conf import settings
 from django.db import transaction
 
 from cvat.apps.dataset_manager.bindings import (
@@ -18,8 +25,12 @@ from cvat.apps.dataset_manager.bindings import (
     JobData,
     match_dm_item,
 )
-from cvat.apps.dataset_manager.task import JobAnnotation
+from cvat.apps.dataset_manager.task import JobAnnotation, get_annotations_version
+from cvat.apps.engine.log import ServerLogManager
 from cvat.apps.engine.models import (
+    AttributeSpec,
+    Job,
+    Label,
     Project,
     Task,
 )
@@ -28,6 +39,8 @@ from cvat.apps.quality_control.attribute_comparison import CVAT_ATTRIBUTE_SPEC_I
 from cvat.apps.quality_control.comparison_report import AnnotationId
 from cvat.apps.quality_control.models import AnnotationType
 
+slogger = ServerLogManager(__name__)
+
 # For backwards compatibility, don't break old reports when requirements are changed
 
 
@@ -38,6 +51,7 @@ class _MemoizingAnnotationConverterFactory:
     ) -> None:
         self._annotation_mapping = {}  # dm annotation -> cvat annotation
         self._attribute_spec_ids_by_label = attribute_spec_ids_by_label or {}
+        self._loaded_frame_annotations: dict[int, list[dm.Annotation]] = {}
 
     def remember_conversion(self, cvat_ann: Any, dm_anns: Sequence[dm.Annotation]) -> None:
         for dm_ann in dm_anns:
@@ -63,11 +77,52 @@ class _MemoizingAnnotationConverterFactory:
         "Retrieve the original CVAT annotation for a Datumaro annotation"
         return self._annotation_mapping[self._make_key(dm_ann)]
 
+    def _iter_remembered_annotations(
+        self, dm_anns: Sequence[dm.Annotation]
+    ) -> Iterator[tuple[dm.Annotation, Any]]:
+        for dm_ann in dm_anns:
+            key = self._make_key(dm_ann)
+            if key in self._annotation_mapping:
+                yield dm_ann, self._annotation_mapping[key]
+
+            if isinstance(dm_ann, dm.Skeleton):
+                yield from self._iter_remembered_annotations(dm_ann.elements)
+
+    def dump_conversions(self, frame_annotations: dict[int, list[dm.Annotation]]) -> bytes:
+        "Serializes the converted frame annotations together with their source annotations"
+
+        # The annotations are pickled at once, so that the references between them are kept
+        return pickle.dumps(
+            (
+                frame_annotations,
+                [
+                    pair
+                    for dm_anns in frame_annotations.values()
+                    for pair in self._iter_remembered_annotations(dm_anns)
+                ],
+            ),
+            protocol=pickle.HIGHEST_PROTOCOL,
+        )
+
+    def load_conversions(self, dumped_conversions: bytes) -> None:
+        "Makes the converter return the previously converted annotations for the frames"
+
+        frame_annotations, remembered_annotations = pickle.loads(dumped_conversions)  # nosec
+        self._loaded_frame_annotations.update(frame_annotations)
+        for dm_ann, cvat_ann in remembered_annotations:
+            self._annotation_mapping[self._make_key(dm_ann)] = cvat_ann
+
     def clear(self):
         self._annotation_mapping.clear()
+        self._loaded_frame_annotations.clear()
+
+    def __call__(self, cvat_frame_anno: CommonData.Frame, *args, **kwargs) -> list[dm.Annotation]:
+        loaded_annotations = self._loaded_frame_annotations.pop(cvat_frame_anno.frame, None)
+        if loaded_annotations is not None:
+            return loaded_annotations
 
-    def __call__(self, *args, **kwargs) -> list[dm.Annotation]:
         converter = _MemoizingAnnotationConverter(
+            cvat_frame_anno,
             *args,
             factory=self,
             attribute_spec_ids_by_label=self._attribute_spec_ids_by_label,
@@ -156,6 +211,30 @@ class JobDataProvider:
     def get_label_type(self, name: str, *, parent: str = "") -> str:
         return self._label_types_by_name[(parent, name)]
 
+    def get_label_schema(self) -> list[dict]:
+        "Returns the label and attribute definitions used in the comparison"
+
+        return [
+            {
+                "id": db_label.id,
+                "name": db_label.name,
+                "parent": db_label.parent.name if db_label.parent else "",
+                "type": db_label.type,
+                "attributes": [
+                    {
+                        "id": db_attribute.id,
+                        "name": db_attribute.name,
+                        "mutable": db_attribute.mutable,
+                        "input_type": db_attribute.input_type,
+                        "default_value": db_attribute.default_value,
+                        "values": db_attribute.values,
+                    }
+                    for db_attribute in db_label.attributespec_set.all()
+                ],
+            }
+            for db_label in self.job_data._label_mapping.values()
+        ]
+
     @cached_property
     def dm_dataset(self):
         from cvat.apps.dataset_manager.formats.registry import dm_env
@@ -191,6 +270,177 @@ class JobDataProvider:
     def remember_dm_ann_alias(self, source_ann: dm.Annotation, alias_ann: dm.Annotation) -> None:
         self._annotation_memo.remember_annotation_alias(source_ann, alias_ann)
 
+    def dump_dm_annotations(self) -> bytes:
+        "Converts the dataset and returns the serialized dataset annotations"
+
+        return self._annotation_memo.dump_conversions(
+            {item.attributes["frame"]: item.annotations for item in self.dm_dataset}
+        )
+
+    def load_dm_annotations(self, dumped_annotations: bytes) -> None:
+        """
+        Makes the dataset use the annotations from dump_dm_annotations() instead of converting.
+        Must be called before the dataset is created.
+        """
+
+        assert "dm_dataset" not in self.__dict__
+        self._annotation_memo.load_conversions(dumped_annotations)
+
+
+class GtDatasetCache:
+    """
+    Keeps the converted annotations of the GT job datasets for the next quality reports.
+    The items are stored as files in the cache directory, so that they are available
+    in all the worker processes. The least recently used items are removed
+    when the total size of the files exceeds the QUALITY_GT_DATASET_CACHE_MAX_SIZE setting.
+    """
+
+    _DIR_NAME = "quality_gt_datasets"
+    _FILE_EXT = ".pickle"
+
+    @classmethod
+    def _get_root(cls) -> Path:
+        return Path(settings.CACHE_ROOT) / cls._DIR_NAME
+
+    @classmethod
+    def _get_path(cls, key: str) -> Path:
+        return cls._get_root() / f"{key}{cls._FILE_EXT}"
+
+    @classmethod
+    def is_enabled(cls) -> bool:
+        return settings.QUALITY_GT_DATASET_CACHE_MAX_SIZE > 0
+
+    @classmethod
+    def get(cls, key: str) -> bytes | None:
+        if not cls.is_enabled():
+            return None
+
+        path = cls._get_path(key)
+        try:
+            content = path.read_bytes()
+        except FileNotFoundError:
+            return None
+
+        # The file modification time is used as the last access time in the eviction
+        with suppress(FileNotFoundError):
+            os.utime(path)
+
+        return content
+
+    @classmethod
+    def set(cls, key: str, content: bytes) -> None:
+        if not cls.is_enabled() or settings.QUALITY_GT_DATASET_CACHE_MAX_SIZE < len(content):
+            return
+
+        root = cls._get_root()
+        root.mkdir(parents=True, exist_ok=True)
+
+        # The file is written under a temporary name, so that the readers never see a partial file
+        with tempfile.NamedTemporaryFile(dir=root, suffix=".tmp", delete=False) as tmp_file:
+            try:
+                tmp_file.write(content)
+            except BaseException:
+                os.unlink(tmp_file.name)
+                raise
+
+        os.replace(tmp_file.name, cls._get_path(key))
+
+        cls._evict()
+
+    @classmethod
+    def _evict(cls) -> None:
+        files = []
+        for path in cls._get_root().glob(f"*{cls._FILE_EXT}"):
+            with suppress(FileNotFoundError):
+                file_stat = path.stat()
+                files.append((file_stat.st_mtime, file_stat.st_size, path))
+
+        total_size = sum(file_size for _, file_size, _ in files)
+        for _, file_size, path in sorted(files):
+            if total_size <= settings.QUALITY_GT_DATASET_CACHE_MAX_SIZE:
+                break
+
+            # The file can be removed by another process at the same time
+            with suppress(FileNotFoundError):
+                path.unlink()
+
+            total_size -= file_size
+
+
+_GT_DATASET_CACHE_KEY_VERSION = 1
+"""
+The version of the stored GT dataset format in the GT dataset cache keys.
+Must be increased on any changes in the annotation conversion.
+"""
+
+
+def _make_gt_job_dataset_cache_key(db_gt_job: Job) -> str:
+    # The task frame and label changes don't change the GT job annotations version,
+    # but they affect the GT job dataset
+    db_segment = db_gt_job.segment
+    db_task = db_segment.task
+    db_data = db_task.data
+    validation_layout = getattr(db_data, "validation_layout", None)
+
+    label_owner = dict(project_id=db_task.project_id) if db_task.project_id else dict(task=db_task)
+    labels = Label.objects.filter(**label_owner).order_by("id")
+    attributes = AttributeSpec.objects.filter(
+        **{f"label__{k}": v for k, v in label_owner.items()}
+    ).order_by("id")
+
+    signature = hashlib.blake2b(digest_size=16)
+    signature.update(repr(sorted(db_segment.frame_set)).encode())
+    signature.update(repr(sorted(db_data.deleted_frames)).encode())
+    signature.update(
+        repr(sorted(validation_layout.disabled_frames) if validation_layout else None).encode()
+    )
+    signature.update(
+        repr(list(labels.values_list("id", "name", "type", "parent_id", "color"))).encode()
+    )
+    signature.update(
+        repr(
+            list(
+                attributes.values_list(
+                    "id", "name", "mutable", "input_type", "default_value", "values"
+                )
+            )
+        ).encode()
+    )
+
+    return "-".join(
+        [
+            f"v{_GT_DATASET_CACHE_KEY_VERSION}",
+            str(db_gt_job.id),
+            str(get_annotations_version(db_gt_job)),
+            signature.hexdigest(),
+        ]
+    )
+
+
+def get_gt_job_data_provider(db_gt_job: Job, *, queryset=None) -> JobDataProvider:
+    """
+    Returns the data provider for the GT job.
+    The converted GT dataset annotations are kept in the GT dataset cache and reused
+    in the next quality reports, while the GT job annotations, frames, and labels are not changed.
+    """
+
+    gt_job_data_provider = JobDataProvider(db_gt_job.id, queryset=queryset)
+    if not GtDatasetCache.is_enabled():
+        return gt_job_data_provider
+
+    key = _make_gt_job_dataset_cache_key(db_gt_job)
+    if dumped_annotations := GtDatasetCache.get(key):
+        try:
+            gt_job_data_provider.load_dm_annotations(dumped_annotations)
+            return gt_job_data_provider
+        except pickle.UnpicklingError:
+            slogger.glob.error(
+                f"Unable to load the GT dataset from cache: key {key}", exc_info=True
+            )
+
+    GtDatasetCache.set(key, gt_job_data_provider.dump_dm_annotations())
+    return gt_job_data_provider
+
 
 class QualitySettingsManager:
     def get_project_settings(self, project: Project) -> models.QualitySettings:
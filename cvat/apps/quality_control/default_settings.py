@@ -15,3 +15,27 @@ if MAX_QUALITY_REQUIREMENTS_PER_SETTINGS < 1:
         "MAX_QUALITY_REQUIREMENTS_PER_SETTINGS must be >= 1, "
         f"got {MAX_QUALITY_REQUIREMENTS_PER_SETTINGS}"
     )
+
+QUALITY_CHECK_CONCURRENCY = int(os.getenv("CVAT_QUALITY_CHECK_CONCURRENCY", 1))
+"""
+The maximum number of worker processes comparing task jobs with the GT job
+in a task quality report. 1 means that the jobs are compared in the report process.
+"""
+
+if QUALITY_CHECK_CONCURRENCY < 1:
+    raise ImproperlyConfigured(
+        f"QUALITY_CHECK_CONCURRENCY must be >= 1, got {QUALITY_CHECK_CONCURRENCY}"
+    )
+
+QUALITY_GT_DATASET_CACHE_MAX_SIZE = int(
+    os.getenv("CVAT_QUALITY_GT_DATASET_CACHE_MAX_SIZE", 512 * 1024 * 1024)
+)
+"""
+The maximum total size of the converted GT job datasets, in bytes,
+kept in the cache directory for the next quality reports. 0 disables the cache.
+"""
+
+if QUALITY_GT_DATASET_CACHE_MAX_SIZE < 0:
+    raise ImproperlyConfigured(
+        f"QUALITY_GT_DATASET_CACHE_MAX_SIZE must be >= 0, got {QUALITY_GT_DATASET_CACHE_MAX_SIZE}"
+    )
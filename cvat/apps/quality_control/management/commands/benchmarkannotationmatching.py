@@ -0,0 +1,146 @@
+# Copyright (C) CVAT.ai Corporation
+#
+# SPDX-License-Identifier: MIT
+
+import statistics
+import time
+
+import datumaro as dm
+import numpy as np
+from django.core.management.base import BaseCommand
+
+from cvat.apps.quality_control.annotation_matching import DistanceComparator
+
+
+class Command(BaseCommand):
+    help = (
+        "The command measures the time of annotation matching in quality checks "
+        "on synthetic frames with many objects"
+    )
+
+    SHAPE_TYPES = {
+        # shape type -> DistanceComparator method
+        "rectangle": "match_boxes",
+        "ellipse": "match_ellipses",
+        "polygon": "match_segmentations",
+    }
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--objects",
+            type=int,
+            nargs="+",
+            default=[100, 500],
+            help="The numbers of objects on the compared frames",
+        )
+        parser.add_argument(
+            "--shape-types",
+            nargs="+",
+            choices=list(self.SHAPE_TYPES),
+            default=list(self.SHAPE_TYPES),
+            help="The compared shape types",
+        )
+        parser.add_argument(
+            "--image-size",
+            type=int,
+            nargs=2,
+            default=[1920, 1080],
+            metavar=("WIDTH", "HEIGHT"),
+            help="The frame size",
+        )
+        parser.add_argument("--labels", type=int, default=5, help="The number of labels used")
+        parser.add_argument(
+            "--repeats", type=int, default=3, help="The number of measurements for each case"
+        )
+        parser.add_argument("--seed", type=int, default=0, help="The random seed")
+
+    def handle(self, *args, **options):
+        rng = np.random.default_rng(options["seed"])
+        img_w, img_h = options["image_size"]
+
+        comparator = DistanceComparator(
+            {
+                dm.AnnotationType.label: dm.LabelCategories.from_iterable(
+                    f"label_{i}" for i in range(options["labels"])
+                )
+            },
+            return_comparisons=True,
+        )
+
+        for shape_type in options["shape_types"]:
+            match = getattr(comparator, self.SHAPE_TYPES[shape_type])
+
+            for object_count in options["objects"]:
+                gt_item, ds_item = self._make_items(
+                    rng,
+                    shape_type=shape_type,
+                    object_count=object_count,
+                    label_count=options["labels"],
+                    img_w=img_w,
+                    img_h=img_h,
+                )
+
+                durations = []
+                for _ in range(options["repeats"]):
+                    time_before = time.perf_counter()
+                    matches = match(gt_item, ds_item)[0]
+                    durations.append(time.perf_counter() - time_before)
+
+                self.stdout.write(
+                    f"{shape_type}, {object_count} objects: {len(matches)} matches; "
+                    f"best {min(durations):.3f} s, mean {statistics.mean(durations):.3f} s"
+                )
+
+    @staticmethod
+    def _make_items(
+        rng: np.random.Generator,
+        *,
+        shape_type: str,
+        object_count: int,
+        label_count: int,
+        img_w: int,
+        img_h: int,
+    ) -> tuple[dm.DatasetItem, dm.DatasetItem]:
+        # The objects are 1-5% of the frame size, so that many of them overlap
+        sizes = rng.uniform(0.01, 0.05, (object_count, 2)) * (img_w, img_h)
+        positions = rng.uniform(0, 1, (object_count, 2)) * ((img_w, img_h) - sizes)
+        labels = rng.integers(0, label_count, object_count)
+
+        # The compared annotations are slightly shifted and resized
+        ds_sizes = sizes * rng.uniform(0.9, 1.1, sizes.shape)
+        ds_positions = positions + sizes * rng.uniform(-0.1, 0.1, sizes.shape)
+
+        def _make_annotation(position: np.ndarray, size: np.ndarray, label: int) -> dm.Annotation:
+            x, y = position.tolist()
+            w, h = size.tolist()
+
+            if shape_type == "rectangle":
+                return dm.Bbox(x, y, w, h, label=label)
+            elif shape_type == "ellipse":
+                return dm.Ellipse(x, y, x + w, y + h, label=label)
+            elif shape_type == "polygon":
+                angles = np.linspace(0, 2 * np.pi, 8, endpoint=False)
+                points = np.stack(
+                    [x + w / 2 * (1 + np.cos(angles)), y + h / 2 * (1 + np.sin(angles))], axis=1
+                )
+                return dm.Polygon(points.flatten().tolist(), label=label)
+            else:
+                assert False
+
+        def _make_item(
+            positions: np.ndarray, sizes: np.ndarray, labels: np.ndarray
+        ) -> dm.DatasetItem:
+            return dm.DatasetItem(
+                id="frame",
+                media=dm.Image.from_numpy(data=np.zeros((img_h, img_w, 3), dtype=np.uint8)),
+                annotations=[
+                    _make_annotation(position, size, int(label))
+                    for position, size, label in zip(positions, sizes, labels)
+                ],
+            )
+
+        ds_order = rng.permutation(object_count)
+        return (
+            _make_item(positions, sizes, labels),
+            _make_item(ds_positions[ds_order], ds_sizes[ds_order], labels[ds_order]),
+        )
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.14 on 2026-10-18 22:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("quality_control", "0012_qualityrequirement_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="qualityreport",
+            name="comparison_key",
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+    ]
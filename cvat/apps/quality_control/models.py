@@ -124,6 +124,12 @@ class QualityReport(models.Model):
 
     data = models.JSONField()
 
+    comparison_key = models.CharField(max_length=64, null=True, blank=True)
+    """
+    A hash of the job comparison inputs (annotation versions, parameters, labels, frames).
+    Job reports with the same key have the same data and can be reused in newer reports.
+    """
+
     conflicts: models.manager.RelatedManager[AnnotationConflict]
 
     class Meta:
@@ -4,14 +4,22 @@
 
 from __future__ import annotations
 
+import hashlib
 import itertools
+import json
+import multiprocessing
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from contextlib import suppress
 from copy import deepcopy
 
-from django.db import transaction
+import attrs
+from attrs import define
+from django.conf import settings
+from django.db import connections, transaction
 from django.db.models import OuterRef, Subquery, prefetch_related_objects
 
+from cvat.apps.dataset_manager.task import get_annotations_version
 from cvat.apps.engine.filters import JsonLogicFilter
 from cvat.apps.engine.media_io.frame_provider import TaskFrameProvider
 from cvat.apps.engine.models import (
@@ -37,7 +45,11 @@ from cvat.apps.quality_control.comparison_report import (
     ComparisonReportTaskStats,
     deduplicate_annotation_conflicts,
 )
-from cvat.apps.quality_control.data_providers import JobDataProvider, QualitySettingsManager
+from cvat.apps.quality_control.data_providers import (
+    JobDataProvider,
+    QualitySettingsManager,
+    get_gt_job_data_provider,
+)
 from cvat.apps.quality_control.quality_handlers import (
     DatasetQualityEstimator,
     EffectiveQualityRequirement,
@@ -63,6 +75,90 @@ def _all_enabled_requirements_completed(summary: ComparisonReportSummary) -> boo
     )
 
 
+@define(kw_only=True)
+class _JobComparisonContext:
+    job_data_providers: dict[int, JobDataProvider]
+    gt_job_data_provider: JobDataProvider
+    requirements: list[EffectiveQualityRequirement]
+    report_parameters: ComparisonReportParameters
+
+    def compare_job(self, job_id: int) -> ComparisonReport:
+        job_data_provider = self.job_data_providers[job_id]
+        comparator = DatasetQualityEstimator(
+            job_data_provider,
+            self.gt_job_data_provider,
+            requirements=self.requirements,
+            report_parameters=self.report_parameters,
+        )
+        report = comparator.generate_report()
+
+        # Release resources
+        del job_data_provider.dm_dataset
+
+        return report
+
+
+_job_comparison_context: _JobComparisonContext | None = None
+"The context of the running job comparison, available in the forked worker processes"
+
+_inherited_db_connections: list = []
+
+
+def _forbid_db_access(*args, **kwargs):
+    raise RuntimeError("The job comparison workers must not access the DB")
+
+
+def _init_job_comparison_worker():
+    # The DB connections and the transaction inherited from the parent process belong
+    # to the parent. The workers only use the job data loaded before forking,
+    # so any DB access is a bug. New connections are never opened from the worker.
+    # The inherited objects are kept referenced, so that they are not closed from the worker.
+    for alias in connections:
+        _inherited_db_connections.append(connections[alias])
+
+        worker_connection = connections.create_connection(alias)
+        worker_connection.ensure_connection = _forbid_db_access
+        connections[alias] = worker_connection
+
+
+def _compare_job(job_id: int) -> ComparisonReport:
+    return _job_comparison_context.compare_job(job_id)
+
+
+_COMPARISON_KEY_VERSION = 2
+"""
+The version of the job comparison logic in the job comparison keys.
+Must be increased on any changes affecting the comparison results for the same inputs,
+e.g. in the annotation matching, so that the previous job reports are not reused.
+"""
+
+
+def _make_job_comparison_key(
+    job: Job,
+    gt_job: Job,
+    *,
+    requirements: list[EffectiveQualityRequirement],
+    report_parameters: ComparisonReportParameters,
+    validation_frames: set[int],
+    honeypot_real_frames: dict[int, int],
+    label_schema: list[dict],
+) -> str:
+    # Includes everything the job comparison results depend on.
+    # The task updated date is not used, as it is changed on each job annotation change.
+    # The honeypot frames of the job define the GT frames used in the comparison.
+    key_data = {
+        "version": _COMPARISON_KEY_VERSION,
+        "job_version": get_annotations_version(job),
+        "gt_job_version": get_annotations_version(gt_job),
+        "parameters": report_parameters.to_dict(),
+        "requirements": [attrs.asdict(requirement) for requirement in requirements],
+        "validation_frames": sorted(validation_frames),
+        "honeypot_real_frames": sorted(honeypot_real_frames.items()),
+        "labels": label_schema,
+    }
+    return hashlib.sha256(json.dumps(key_data, sort_keys=True, default=str).encode()).hexdigest()
+
+
 class TaskQualityCalculator:
     # JSON filter lookups
     JOB_FILTER_LOOKUPS = {
@@ -118,11 +214,6 @@ class TaskQualityCalculator:
             else:
                 filtered_job_ids = set(all_job_ids)
 
-            # TODO: Probably, can be optimized to this:
-            # - task updated (the gt job, frame set or labels changed) -> everything is computed
-            # - job updated -> job report is computed
-            #   old reports can be reused in this case
-
             # Try to use a shared queryset to minimize DB requests
             job_queryset = Job.objects.select_related("segment").filter(segment__task=task)
 
@@ -136,8 +227,36 @@ class TaskQualityCalculator:
             for job in job_queryset:
                 job.segment.task = gt_job.segment.task  # put the prefetched object
 
-            gt_job_data_provider = JobDataProvider(gt_job.id, queryset=job_queryset)
-            active_validation_frames = self.get_active_validation_frames(task, gt_job_data_provider)
+            gt_job_data_provider = get_gt_job_data_provider(gt_job, queryset=job_queryset)
+            task_honeypot_real_frames = self._get_honeypot_real_frames(task)
+            active_validation_frames = self.get_active_validation_frames(
+                task, gt_job_data_provider, honeypot_real_frames=task_honeypot_real_frames
+            )
+
+            quality_requirements = resolve_effective_requirements(
+                list(quality_settings.requirements.select_related("parent").all())
+            )
+
+            label_schema = gt_job_data_provider.get_label_schema()
+            job_comparison_keys = {
+                job.id: _make_job_comparison_key(
+                    job,
+                    gt_job,
+                    requirements=quality_requirements,
+                    report_parameters=report_parameters,
+                    validation_frames=active_validation_frames,
+                    honeypot_real_frames={
+                        frame: task_honeypot_real_frames[frame]
+                        for frame in job.segment.frame_set
+                        if frame in task_honeypot_real_frames
+                    },
+                    label_schema=label_schema,
+                )
+                for job in jobs
+            }
+
+            # Only the jobs changed since the previous reports are compared again
+            reused_job_reports = self._get_reusable_job_reports(job_comparison_keys)
 
             job_data_providers = {
                 job.id: JobDataProvider(
@@ -146,28 +265,26 @@ class TaskQualityCalculator:
                     included_frames=active_validation_frames,
                 )
                 for job in jobs
+                if job.id not in reused_job_reports
             }
 
-            quality_requirements = resolve_effective_requirements(
-                list(quality_settings.requirements.select_related("parent").all())
-            )
-
-            job_comparison_reports: dict[int, ComparisonReport] = {}
-            for job in jobs:
-                if job.id not in filtered_job_ids:
-                    continue
-
-                job_data_provider = job_data_providers[job.id]
-                comparator = DatasetQualityEstimator(
-                    job_data_provider,
-                    gt_job_data_provider,
+            compared_job_reports = self._compare_jobs(
+                _JobComparisonContext(
+                    job_data_providers=job_data_providers,
+                    gt_job_data_provider=gt_job_data_provider,
                     requirements=quality_requirements,
                     report_parameters=report_parameters,
                 )
-                job_comparison_reports[job.id] = comparator.generate_report()
+            )
 
-                # Release resources
-                del job_data_provider.dm_dataset
+            job_comparison_reports: dict[int, ComparisonReport] = {
+                job.id: (
+                    compared_job_reports[job.id]
+                    if job.id in compared_job_reports
+                    else ComparisonReport.from_json(reused_job_reports[job.id])
+                )
+                for job in jobs
+            }
 
         task_comparison_report = self._compute_task_report(
             job_comparison_reports,
@@ -186,8 +303,9 @@ class TaskQualityCalculator:
                     gt_last_updated=gt_job.updated_date,
                     assignee_id=job.assignee_id,
                     assignee_last_updated=job.assignee_updated_date,
-                    data=job_comparison_report.to_json(),
+                    data=reused_job_reports.get(job.id) or job_comparison_report.to_json(),
                     conflicts=[c.to_dict() for c in job_comparison_report.get_conflicts()],
+                    comparison_key=job_comparison_keys[job.id],
                 )
 
                 job_quality_reports[job.id] = job_report
@@ -207,19 +325,110 @@ class TaskQualityCalculator:
 
         return task_report
 
-    def get_active_validation_frames(self, task: Task, gt_job_data_provider: JobDataProvider):
+    def _get_reusable_job_reports(self, job_comparison_keys: dict[int, str]) -> dict[int, str]:
+        "Returns the data of the existing job reports computed with the same comparison inputs"
+
+        # Only the newest report of a job can be reused. The key is only set for the reports
+        # in the current data format, so the older reports are not reused.
+        newest_job_report_ids = (
+            models.QualityReport.objects.filter(job_id=OuterRef("job_id"))
+            .order_by("-created_date", "-id")
+            .values("id")[:1]
+        )
+
+        reusable_reports: dict[int, str] = {}
+        for job_ids_chunk in take_by(job_comparison_keys, chunk_size=_DEFAULT_FETCH_CHUNK_SIZE):
+            reusable_report_ids = [
+                report_id
+                for report_id, job_id, comparison_key in models.QualityReport.objects.filter(
+                    job_id__in=job_ids_chunk, id=Subquery(newest_job_report_ids)
+                ).values_list("id", "job_id", "comparison_key")
+                if comparison_key == job_comparison_keys[job_id]
+            ]
+
+            reusable_reports.update(
+                models.QualityReport.objects.filter(id__in=reusable_report_ids)
+                .values_list("job_id", "data")
+                .iterator(chunk_size=_DEFAULT_FETCH_CHUNK_SIZE)
+            )
+
+        return reusable_reports
+
+    def _compare_jobs(self, context: _JobComparisonContext) -> dict[int, ComparisonReport]:
+        job_ids = list(context.job_data_providers)
+
+        if not job_ids:
+            return {}
+
+        # Convert the GT dataset once, so that it is reused in all the job comparisons
+        context.gt_job_data_provider.dm_dataset.init_cache()
+
+        concurrency = min(settings.QUALITY_CHECK_CONCURRENCY, len(job_ids))
+        if concurrency <= 1:
+            return {job_id: context.compare_job(job_id) for job_id in job_ids}
+
+        # The job data is passed to the workers by forking, so that the GT job data
+        # and the annotations are not copied or reloaded for each job.
+        # The workers can't use the DB connection and the transaction of the report process,
+        # so the job datasets are converted before forking. The jobs are compared in batches
+        # to keep only a few converted datasets in memory at once.
+        job_reports: dict[int, ComparisonReport] = {}
+
+        global _job_comparison_context
+        _job_comparison_context = context
+        try:
+            for job_ids_batch in take_by(job_ids, chunk_size=concurrency):
+                for job_id in job_ids_batch:
+                    context.job_data_providers[job_id].dm_dataset.init_cache()
+
+                with ProcessPoolExecutor(
+                    max_workers=len(job_ids_batch),
+                    mp_context=multiprocessing.get_context("fork"),
+                    initializer=_init_job_comparison_worker,
+                ) as executor:
+                    job_reports.update(
+                        zip(job_ids_batch, executor.map(_compare_job, job_ids_batch))
+                    )
+
+                # Release resources
+                for job_id in job_ids_batch:
+                    del context.job_data_providers[job_id].dm_dataset
+        finally:
+            _job_comparison_context = None
+
+        # the results are merged in the job order, the same as in the sequential comparison
+        return job_reports
+
+    def _get_honeypot_real_frames(self, task: Task) -> dict[int, int]:
+        "Returns the validation frames of the task honeypots, as absolute frame numbers"
+
+        if task.data.validation_layout.mode != ValidationMode.GT_POOL:
+            return {}
+
+        return dict(
+            Image.objects.filter(data=task.data, is_placeholder=True)
+            .values_list("frame", "real_frame")
+            .iterator(chunk_size=_DEFAULT_FETCH_CHUNK_SIZE)
+        )
+
+    def get_active_validation_frames(
+        self,
+        task: Task,
+        gt_job_data_provider: JobDataProvider,
+        *,
+        honeypot_real_frames: dict[int, int] | None = None,
+    ):
         active_validation_frames = gt_job_data_provider.job_data.get_included_frames()
 
         validation_layout = task.data.validation_layout
         if validation_layout.mode == ValidationMode.GT_POOL:
+            if honeypot_real_frames is None:
+                honeypot_real_frames = self._get_honeypot_real_frames(task)
+
             task_frame_provider = TaskFrameProvider(task)
             active_validation_frames = set(
                 task_frame_provider.get_rel_frame_number(abs_frame)
-                for abs_frame, abs_real_frame in (
-                    Image.objects.filter(data=task.data, is_placeholder=True)
-                    .values_list("frame", "real_frame")
-                    .iterator(chunk_size=_DEFAULT_FETCH_CHUNK_SIZE)
-                )
+                for abs_frame, abs_real_frame in honeypot_real_frames.items()
                 if task_frame_provider.get_rel_frame_number(abs_real_frame)
                 in active_validation_frames
             )
@@ -347,6 +556,7 @@ class TaskQualityCalculator:
                 assignee_id=job_report["assignee_id"],
                 assignee_last_updated=job_report["assignee_last_updated"],
                 data=job_report["data"],
+                comparison_key=job_report["comparison_key"],
             )
             db_job_reports.append(db_job_report)
 
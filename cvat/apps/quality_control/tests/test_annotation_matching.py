@@ -8,12 +8,15 @@ import unittest
 from typing import cast
 
 import datumaro as dm
+import datumaro.util.annotation_util
 import numpy as np
 
 from cvat.apps.quality_control.annotation_matching import (
     AttributeMatchingResult,
     Comparator,
     DistanceComparator,
+    get_visible_segments,
+    segment_iou,
 )
 from cvat.apps.quality_control.comparison_report import ComparisonParameters
 from cvat.apps.quality_control.models import PointSizeBase
@@ -63,6 +66,38 @@ def _match_attributes(
     )
 
 
+class TestVisibleSegments(unittest.TestCase):
+    def test_visible_segments_are_the_same_as_in_compiled_mask(self) -> None:
+        from pycocotools import mask as mask_utils
+
+        img_h, img_w = 50, 60
+        polygons = [
+            [5, 5, 40, 5, 40, 40, 5, 40],
+            [20, 20, 55, 20, 55, 45, 20, 45],
+            [0, 30, 30, 30, 15, 49],
+            [10, 10, 15, 10, 15, 15, 10, 15],
+            [50, 0, 59, 0, 59, 5],
+        ]
+        z_orders = [1, 0, 1, 2, 0]
+        rles = [mask_utils.frPyObjects([p], img_h, img_w)[0] for p in polygons]
+
+        visible_rles = get_visible_segments(rles, z_orders=z_orders)
+
+        compiled_mask = dm.CompiledMask.from_instance_masks(
+            [
+                dm.Mask(mask_utils.decode(rle), z_order=z_order, label=1)
+                for rle, z_order in zip(rles, z_orders)
+            ],
+            instance_ids=range(1, len(rles) + 1),
+        )
+        for i, visible_rle in enumerate(visible_rles):
+            self.assertTrue(
+                np.array_equal(
+                    mask_utils.decode(visible_rle).astype(bool), compiled_mask.extract(i + 1)
+                )
+            )
+
+
 class TestComparator(unittest.TestCase):
     @staticmethod
     def _make_comparator() -> Comparator:
@@ -134,6 +169,75 @@ class TestComparator(unittest.TestCase):
         self.assertIsInstance(distance, float)
         self.assertEqual(distance, 1)
 
+    def test_box_similarity_matrix_matches_pairwise_iou(self) -> None:
+        gt_anns = [
+            dm.Bbox(10, 10, 20, 20, label=0),
+            dm.Bbox(50, 50, 20, 20, label=0, attributes={"rotation": 30}),
+            dm.Bbox(0, 80, 10, 10, label=0),
+        ]
+        ds_anns = [
+            dm.Bbox(12, 10, 20, 20, label=0),
+            dm.Bbox(52, 50, 20, 20, label=0),
+            dm.Bbox(51, 50, 20, 20, label=0, attributes={"rotation": 30}),
+        ]
+        comparator = DistanceComparator(
+            {dm.AnnotationType.label: dm.LabelCategories.from_iterable(["car"])},
+            return_distances=True,
+        )
+
+        result = comparator.match_boxes(_make_image_item(*gt_anns), _make_image_item(*ds_anns))
+        distances = cast(dict[tuple[int, int], float], result[4])
+
+        for gt_ann in gt_anns:
+            for ds_ann in ds_anns:
+                if gt_ann.attributes.get("rotation", 0) == ds_ann.attributes.get("rotation", 0):
+                    expected_distance = datumaro.util.annotation_util.bbox_iou(gt_ann, ds_ann)
+                else:
+                    expected_distance = segment_iou(
+                        comparator.to_polygon(gt_ann),
+                        comparator.to_polygon(ds_ann),
+                        img_h=100,
+                        img_w=100,
+                    )
+
+                self.assertAlmostEqual(distances[(id(gt_ann), id(ds_ann))], expected_distance)
+
+        self.assertEqual(result[0], [(gt_anns[0], ds_anns[0]), (gt_anns[1], ds_anns[2])])
+
+    def test_attributes_are_compared_for_non_overlapping_pairs_without_similarity_matrix(
+        self,
+    ) -> None:
+        gt_ann = dm.Bbox(0, 0, 10, 10, label=0, attributes={"color": "red"})
+        ds_ann = dm.Bbox(50, 50, 10, 10, label=0, attributes={"color": "blue"})
+        comparator = DistanceComparator(
+            {dm.AnnotationType.label: dm.LabelCategories.from_iterable(["car"])},
+            return_comparisons=True,
+            attribute_matcher=_match_attributes,
+        )
+
+        for similarity_args, expected_conflicting_attribute_names in [
+            ({"distance": lambda a, b: 0.0}, ("color",)),
+            # only the batched comparisons skip attributes for non-overlapping pairs
+            (
+                {"similarity_matrix": lambda a_objs, b_objs: np.zeros((len(a_objs), len(b_objs)))},
+                (),
+            ),
+        ]:
+            with self.subTest(similarity_args=list(similarity_args)):
+                result = comparator.match_segments(
+                    dm.AnnotationType.bbox,
+                    _make_image_item(gt_ann),
+                    _make_image_item(ds_ann),
+                    **similarity_args,
+                )
+                comparison = result[4][(id(gt_ann), id(ds_ann))]
+
+                self.assertEqual(comparison.geometry_similarity, 0)
+                self.assertEqual(
+                    comparison.conflicting_attribute_names,
+                    expected_conflicting_attribute_names,
+                )
+
     def test_point_size_base_changes_grouped_point_matching(self) -> None:
         categories = {
             dm.AnnotationType.label: dm.LabelCategories.from_iterable(["first", "second"])
@@ -4,13 +4,35 @@
 
 from __future__ import annotations
 
+import os
+import tempfile
 import unittest
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest import mock
 
 import datumaro as dm
+from django.test import override_settings
+from rest_framework import status
 
 from cvat.apps.dataset_manager.bindings import CommonData
-from cvat.apps.engine.models import ShapeType
-from cvat.apps.quality_control.data_providers import _MemoizingAnnotationConverterFactory
+from cvat.apps.engine.models import Job, JobType, ShapeType, Task
+from cvat.apps.engine.tests.test_rest_api import create_db_users
+from cvat.apps.engine.tests.utils import ApiTestBase, ForceLogin, generate_image_file
+from cvat.apps.quality_control import models, quality_calculators
+from cvat.apps.quality_control.comparison_report import ComparisonReportParameters
+from cvat.apps.quality_control.data_providers import (
+    GtDatasetCache,
+    JobDataProvider,
+    _MemoizingAnnotationConverter,
+    _MemoizingAnnotationConverterFactory,
+)
+from cvat.apps.quality_control.quality_calculators import (
+    TaskQualityCalculator,
+    _JobComparisonContext,
+    _make_job_comparison_key,
+)
+from cvat.apps.quality_control.quality_handlers import EffectiveQualityRequirement
 
 
 class TestMemoizingAnnotationConverter(unittest.TestCase):
@@ -50,3 +72,368 @@ class TestMemoizingAnnotationConverter(unittest.TestCase):
 
         self.assertEqual(annotation_memo.get_source_ann(keypoint), keypoint_source)
         self.assertEqual(annotation_memo.get_source_ann(wrapped_keypoint), keypoint_source)
+
+    def test_can_load_dumped_conversions(self) -> None:
+        keypoint_source = CommonData.LabeledShape(
+            type=ShapeType.POINTS,
+            frame=0,
+            label=2,
+            points=[4, 5],
+            occluded=False,
+            attributes=[],
+            source=None,
+            id=20,
+        )
+        skeleton_source = CommonData.LabeledShape(
+            type=ShapeType.SKELETON,
+            frame=0,
+            label=1,
+            points=[],
+            occluded=False,
+            attributes=[],
+            source=None,
+            elements=[keypoint_source],
+            id=10,
+        )
+        skeleton = dm.Skeleton(
+            [dm.Points([4, 5], [dm.Points.Visibility.visible], label=2)], label=1
+        )
+        annotation_memo = _MemoizingAnnotationConverterFactory()
+        annotation_memo.remember_conversion(skeleton_source, [skeleton])
+
+        loaded_annotation_memo = _MemoizingAnnotationConverterFactory()
+        loaded_annotation_memo.load_conversions(annotation_memo.dump_conversions({0: [skeleton]}))
+
+        with mock.patch.object(_MemoizingAnnotationConverter, "convert") as mock_convert:
+            (loaded_skeleton,) = loaded_annotation_memo(SimpleNamespace(frame=0), {}, None)
+
+        mock_convert.assert_not_called()
+        self.assertEqual(loaded_skeleton, skeleton)
+        self.assertEqual(loaded_annotation_memo.get_source_ann(loaded_skeleton), skeleton_source)
+        self.assertEqual(
+            loaded_annotation_memo.get_source_ann(loaded_skeleton.elements[0]), keypoint_source
+        )
+
+
+class TestGtDatasetCache(unittest.TestCase):
+    def setUp(self) -> None:
+        cache_root = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_root.cleanup)
+
+        settings_override = override_settings(
+            CACHE_ROOT=cache_root.name, QUALITY_GT_DATASET_CACHE_MAX_SIZE=25
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def test_least_recently_used_items_are_evicted(self) -> None:
+        GtDatasetCache.set("a", b"a" * 10)
+        GtDatasetCache.set("b", b"b" * 10)
+
+        # make the file access order independent of the file system time resolution
+        for timestamp, key in enumerate(["a", "b"], start=1):
+            os.utime(GtDatasetCache._get_path(key), (timestamp, timestamp))
+
+        self.assertEqual(GtDatasetCache.get("a"), b"a" * 10)
+        GtDatasetCache.set("c", b"c" * 10)
+
+        self.assertEqual(GtDatasetCache.get("a"), b"a" * 10)
+        self.assertIsNone(GtDatasetCache.get("b"))
+        self.assertEqual(GtDatasetCache.get("c"), b"c" * 10)
+
+    def test_items_bigger_than_cache_are_not_stored(self) -> None:
+        GtDatasetCache.set("a", b"a" * 26)
+
+        self.assertIsNone(GtDatasetCache.get("a"))
+
+    @override_settings(QUALITY_GT_DATASET_CACHE_MAX_SIZE=0)
+    def test_can_disable_cache(self) -> None:
+        GtDatasetCache.set("a", b"a")
+
+        self.assertIsNone(GtDatasetCache.get("a"))
+        self.assertFalse(GtDatasetCache._get_root().exists())
+
+
+class TestTaskQualityCalculator(unittest.TestCase):
+    def test_can_compare_jobs_in_parallel(self) -> None:
+        context = mock.Mock(spec=_JobComparisonContext)
+        context.job_data_providers = {job_id: mock.MagicMock() for job_id in [5, 2, 7, 3, 4]}
+        context.compare_job.side_effect = lambda job_id: f"report {job_id}"
+
+        loaded_datasets_counts = []
+        dm_datasets = []
+        for job_data_provider in context.job_data_providers.values():
+            dm_datasets.append(job_data_provider.dm_dataset)
+            job_data_provider.dm_dataset.init_cache.side_effect = (
+                lambda: loaded_datasets_counts.append(
+                    sum(
+                        hasattr(p, "dm_dataset") and p.dm_dataset.init_cache.called
+                        for p in context.job_data_providers.values()
+                    )
+                )
+            )
+
+        with override_settings(QUALITY_CHECK_CONCURRENCY=2):
+            job_reports = TaskQualityCalculator()._compare_jobs(context)
+
+        # the comparisons are made in the workers, the data is loaded before forking
+        context.compare_job.assert_not_called()
+        context.gt_job_data_provider.dm_dataset.init_cache.assert_called_once()
+        for dm_dataset in dm_datasets:
+            dm_dataset.init_cache.assert_called_once()
+
+        # the jobs are compared in batches, the datasets are released after each batch
+        self.assertEqual(loaded_datasets_counts, [1, 2, 1, 2, 1])
+        for job_data_provider in context.job_data_providers.values():
+            self.assertFalse(hasattr(job_data_provider, "dm_dataset"))
+
+        self.assertEqual(
+            list(job_reports.items()),
+            [(job_id, f"report {job_id}") for job_id in [5, 2, 7, 3, 4]],
+        )
+
+    def test_job_comparison_workers_cannot_access_db(self) -> None:
+        context = mock.Mock(spec=_JobComparisonContext)
+        context.job_data_providers = {job_id: mock.MagicMock() for job_id in [1, 2]}
+        context.compare_job.side_effect = lambda job_id: Job.objects.count()
+
+        with (
+            override_settings(QUALITY_CHECK_CONCURRENCY=2),
+            self.assertRaisesRegex(RuntimeError, "must not access the DB"),
+        ):
+            TaskQualityCalculator()._compare_jobs(context)
+
+    def test_job_comparison_key_depends_on_comparison_inputs(self) -> None:
+        updated_date = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+        def _make_key(
+            *,
+            job_updated_date: datetime = updated_date,
+            iou_threshold: float = 0.4,
+            validation_frames: set[int] = frozenset({1, 3}),
+            honeypot_real_frames: dict[int, int] | None = None,
+        ) -> str:
+            return _make_job_comparison_key(
+                SimpleNamespace(updated_date=job_updated_date, annotations_updated_date=None),
+                SimpleNamespace(updated_date=updated_date, annotations_updated_date=None),
+                requirements=[
+                    EffectiveQualityRequirement(
+                        name="requirement",
+                        enabled=True,
+                        filter="",
+                        annotation_type="rectangle",
+                        target_metric="accuracy",
+                        target_metric_threshold=0.7,
+                        iou_threshold=iou_threshold,
+                    )
+                ],
+                report_parameters=ComparisonReportParameters(),
+                validation_frames=validation_frames,
+                honeypot_real_frames=honeypot_real_frames or {4: 1},
+                label_schema=[{"id": 1, "name": "car", "attributes": []}],
+            )
+
+        self.assertEqual(_make_key(), _make_key())
+        self.assertNotEqual(
+            _make_key(), _make_key(job_updated_date=updated_date + timedelta(seconds=1))
+        )
+        self.assertNotEqual(_make_key(), _make_key(iou_threshold=0.5))
+        self.assertNotEqual(_make_key(), _make_key(validation_frames={1, 2}))
+        self.assertNotEqual(_make_key(), _make_key(honeypot_real_frames={4: 3}))
+
+        key = _make_key()
+        with mock.patch.object(quality_calculators, "_COMPARISON_KEY_VERSION", -1):
+            self.assertNotEqual(key, _make_key())
+
+
+class TestTaskQualityReportComputation(ApiTestBase):
+    @classmethod
+    def setUpTestData(cls):
+        create_db_users(cls, primary=False, extra=False)
+
+    def setUp(self):
+        super().setUp()
+
+        with ForceLogin(self.admin, self.client):
+            response = self.client.post(
+                "/api/tasks",
+                data={"name": "quality task", "segment_size": 2, "labels": [{"name": "car"}]},
+                format="json",
+            )
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+            self.task_id = response.data["id"]
+
+            response = self.client.post(
+                f"/api/tasks/{self.task_id}/data",
+                data={
+                    **{
+                        f"client_files[{i}]": generate_image_file(f"test_{i}.jpg") for i in range(6)
+                    },
+                    "image_quality": 75,
+                },
+            )
+            self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+
+            response = self.client.post(
+                "/api/jobs",
+                data={
+                    "type": "ground_truth",
+                    "task_id": self.task_id,
+                    "frame_selection_method": "manual",
+                    "frames": [0, 2, 4, 5],
+                },
+                format="json",
+            )
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+            gt_job_id = response.data["id"]
+
+        label_id = Task.objects.get(id=self.task_id).label_set.get().id
+
+        def _make_shape(frame: int, x: float) -> dict:
+            return {
+                "frame": frame,
+                "label_id": label_id,
+                "group": 0,
+                "source": "manual",
+                "attributes": [],
+                "type": "rectangle",
+                "points": [x, 10.0, x + 40.0, 50.0],
+                "occluded": False,
+            }
+
+        # Each job has a matching shape, a shifted shape, a missing or an extra shape
+        self._put_annotations(
+            f"/api/jobs/{gt_job_id}/annotations",
+            [_make_shape(frame, 10.0) for frame in [0, 2, 4, 5]],
+        )
+        self._put_annotations(
+            f"/api/tasks/{self.task_id}/annotations",
+            [
+                _make_shape(0, 10.0),
+                _make_shape(1, 10.0),
+                _make_shape(2, 30.0),
+                _make_shape(4, 10.0),
+                _make_shape(4, 60.0),
+            ],
+        )
+
+    def _put_annotations(self, url: str, shapes: list[dict]):
+        with ForceLogin(self.admin, self.client):
+            response = self.client.put(
+                url,
+                data={"version": 0, "tags": [], "shapes": shapes, "tracks": []},
+                format="json",
+            )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def _compute_job_reports(self, *, reuse: bool = False) -> dict[int, tuple[dict, list]]:
+        if not reuse:
+            # Remove the previous reports, so that all the jobs are compared again
+            models.QualityReport.objects.all().delete()
+
+        task_report = TaskQualityCalculator().compute_report(self.task_id)
+        return {
+            db_job_report.job_id: (
+                db_job_report.data,
+                sorted(
+                    db_job_report.conflicts.values_list("type", "frame", "severity"),
+                ),
+            )
+            for db_job_report in task_report.children.all()
+        }
+
+    def test_parallel_job_comparison_matches_sequential(self):
+        with override_settings(QUALITY_CHECK_CONCURRENCY=1):
+            sequential_job_reports = self._compute_job_reports()
+
+        with override_settings(QUALITY_CHECK_CONCURRENCY=3):
+            parallel_job_reports = self._compute_job_reports()
+
+        self.assertEqual(
+            set(sequential_job_reports),
+            set(
+                Job.objects.filter(segment__task_id=self.task_id)
+                .exclude(type=JobType.GROUND_TRUTH)
+                .values_list("id", flat=True)
+            ),
+        )
+        self.assertTrue(any(conflicts for _, conflicts in sequential_job_reports.values()))
+        self.assertEqual(parallel_job_reports, sequential_job_reports)
+
+    def test_unchanged_job_reports_are_reused(self):
+        job_ids = sorted(
+            Job.objects.filter(segment__task_id=self.task_id)
+            .exclude(type=JobType.GROUND_TRUTH)
+            .values_list("id", flat=True)
+        )
+        first_job_reports = self._compute_job_reports()
+
+        changed_job_id = job_ids[0]
+        self._put_annotations(f"/api/jobs/{changed_job_id}/annotations", [])
+
+        compare_job = _JobComparisonContext.compare_job
+        with mock.patch.object(
+            _JobComparisonContext, "compare_job", autospec=True, side_effect=compare_job
+        ) as mock_compare_job:
+            second_job_reports = self._compute_job_reports(reuse=True)
+
+        self.assertEqual(
+            [call.args[1] for call in mock_compare_job.call_args_list], [changed_job_id]
+        )
+        self.assertNotEqual(second_job_reports[changed_job_id], first_job_reports[changed_job_id])
+        for job_id in job_ids[1:]:
+            self.assertEqual(second_job_reports[job_id], first_job_reports[job_id])
+
+    def test_only_newest_job_reports_are_reused(self):
+        job_ids = sorted(
+            Job.objects.filter(segment__task_id=self.task_id)
+            .exclude(type=JobType.GROUND_TRUTH)
+            .values_list("id", flat=True)
+        )
+        for job_id in job_ids:
+            for comparison_key in ["old key", "new key"]:
+                models.QualityReport.objects.create(
+                    job_id=job_id,
+                    target_last_updated=datetime.now(timezone.utc),
+                    data=f"report {job_id} {comparison_key}",
+                    comparison_key=comparison_key,
+                )
+
+        reusable_reports = TaskQualityCalculator()._get_reusable_job_reports(
+            {job_ids[0]: "old key", job_ids[1]: "new key", job_ids[2]: "unknown key"}
+        )
+
+        self.assertEqual(reusable_reports, {job_ids[1]: f"report {job_ids[1]} new key"})
+
+    def test_gt_dataset_is_reused_in_next_reports(self):
+        cache_root = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_root.cleanup)
+
+        convert = _MemoizingAnnotationConverter.convert
+        load_dm_annotations = JobDataProvider.load_dm_annotations
+
+        with override_settings(CACHE_ROOT=cache_root.name):
+            job_reports = []
+            converted_frame_counts = []
+            loaded_gt_dataset_counts = []
+            for _ in range(2):
+                with (
+                    mock.patch.object(
+                        _MemoizingAnnotationConverter, "convert", autospec=True, side_effect=convert
+                    ) as mock_convert,
+                    mock.patch.object(
+                        JobDataProvider,
+                        "load_dm_annotations",
+                        autospec=True,
+                        side_effect=load_dm_annotations,
+                    ) as mock_load_dm_annotations,
+                ):
+                    job_reports.append(self._compute_job_reports())
+
+                converted_frame_counts.append(mock_convert.call_count)
+                loaded_gt_dataset_counts.append(mock_load_dm_annotations.call_count)
+
+        # The GT dataset frames are only converted in the first report
+        self.assertEqual(loaded_gt_dataset_counts, [0, 1])
+        self.assertEqual(converted_frame_counts[0] - converted_frame_counts[1], 4)
+        self.assertEqual(job_reports[0], job_reports[1])
@@ -660,6 +660,7 @@ CORS_ALLOW_HEADERS = list(default_headers) + [
 
 CORS_EXPOSE_HEADERS = [
     "Content-Range",
+    "ETag",
 ]
 
 TUS_MAX_FILE_SIZE = 26843545600  # 25gb
@@ -66,6 +66,13 @@ for logger in LOGGING["loggers"].values():
 
 PASSWORD_HASHERS = ("django.contrib.auth.hashers.MD5PasswordHasher",)
 
+# Run the annotation API tests through the annotations response cache,
+# which is disabled by default
+ANNOTATIONS_RESPONSE_CACHE_TTL = 600
+
+# Unit tests run in DB transactions, which are not visible to other threads
+PROJECT_EXPORT_CONCURRENCY = 1
+
 # When you run ./manage.py test, Django looks at the TEST_RUNNER setting to
 # determine what to do. By default, TEST_RUNNER points to
 # 'django.test.runner.DiscoverRunner'. This class defines the default Django
@@ -27,8 +27,9 @@ from deepdiff import DeepDiff
 from PIL import Image
 from pytest_cases import parametrize
 
+from shared.fixtures.init import container_exec_cvat
 from shared.tasks.utils import parse_frame_step
-from shared.utils.config import get_method, make_api_client, patch_method
+from shared.utils.config import get_method, make_api_client, patch_method, put_method
 from shared.utils.helpers import generate_image_files
 
 from .utils import (
@@ -1395,6 +1396,177 @@ class TestPatchJobAnnotations:
         assert b"must be one of" in response.content
 
 
+@pytest.mark.usefixtures("restore_db_per_function")
+class TestPutManyJobAnnotations:
+    """
+    The big annotation batches can be written with the PostgreSQL COPY command
+    and the points can be stored in the packed format. These modes are disabled
+    on the test server, so the annotations are rewritten in the server container
+    with these settings enabled.
+    """
+
+    _OBJECTS_COUNT = 150
+    _COPY_THRESHOLD = 100
+
+    @pytest.fixture
+    def job(self, admin_user):
+        task_id, _ = create_task(
+            admin_user,
+            spec={
+                "name": "test task with many annotations",
+                "labels": [
+                    {
+                        "name": "car",
+                        "type": "rectangle",
+                        "attributes": [
+                            {
+                                "name": "color",
+                                "mutable": False,
+                                "input_type": "select",
+                                "default_value": "white",
+                                "values": ["white", "black"],
+                            },
+                            {
+                                "name": "moving",
+                                "mutable": True,
+                                "input_type": "checkbox",
+                                "default_value": "false",
+                                "values": ["false"],
+                            },
+                        ],
+                    }
+                ],
+            },
+            data={
+                "image_quality": 75,
+                "client_files": generate_image_files(3),
+            },
+        )
+
+        with make_api_client(admin_user) as api_client:
+            (job,) = get_paginated_collection(
+                api_client.jobs_api.list_endpoint, task_id=task_id, return_json=True
+            )
+
+        return job
+
+    def _rewrite_annotations_with_copy(self, request, job_id: int) -> list[str]:
+        """
+        Rewrites the job annotations with the COPY writer and the packed points format.
+        Returns the formats of the stored points.
+        """
+
+        output = container_exec_cvat(
+            request,
+            [
+                "./manage.py",
+                "shell",
+                "-c",
+                "from django.db.models.functions import Substr\n"
+                "from django.test import override_settings\n"
+                "from cvat.apps.dataset_manager import task as dm_task\n"
+                "from cvat.apps.engine.models import LabeledShape, TrackedShape\n"
+                "with override_settings(\n"
+                f"    ANNOTATION_DB_COPY_THRESHOLD={self._COPY_THRESHOLD},\n"
+                "    CVAT_ANNOTATION_POINTS_STORAGE_FORMAT='float64',\n"
+                "):\n"
+                f"    dm_task.put_job_data({job_id}, dm_task.get_job_data({job_id}))\n"
+                "prefixes = set()\n"
+                "for queryset in [\n"
+                f"    LabeledShape.objects.filter(job_id={job_id}),\n"
+                f"    TrackedShape.objects.filter(track__job_id={job_id}),\n"
+                "]:\n"
+                "    prefixes.update(queryset.values_list(Substr('points', 1, 3), flat=True))\n"
+                "print(*sorted(prefixes))",
+            ],
+        )
+        return output.split()
+
+    def test_can_write_and_read_many_annotations(self, admin_user, job, request):
+        with make_api_client(admin_user) as api_client:
+            (label,) = get_paginated_collection(
+                api_client.labels_api.list_endpoint, job_id=job["id"], return_json=True
+            )
+
+        color_attr, moving_attr = sorted(label["attributes"], key=lambda a: a["name"])
+
+        def _make_points(index: int) -> list[float]:
+            return [index / 3, index / 7, index / 3 + 10.1, index / 7 + 20.2]
+
+        def _get_all_points(annotations: dict) -> list[list[float]]:
+            return sorted(
+                [shape["points"] for shape in annotations["shapes"]]
+                + [shape["points"] for track in annotations["tracks"] for shape in track["shapes"]]
+            )
+
+        annotations = {
+            "shapes": [
+                {
+                    "type": "rectangle",
+                    "frame": i % 3,
+                    "label_id": label["id"],
+                    "points": _make_points(i),
+                    "attributes": [
+                        {"spec_id": color_attr["id"], "value": ["white", "black"][i % 2]},
+                        {"spec_id": moving_attr["id"], "value": ["false", "true"][i % 2]},
+                    ],
+                    "group": 0,
+                    "source": "manual",
+                    "score": 1.0,
+                    "occluded": bool(i % 2),
+                    "outside": False,
+                    "z_order": i % 5,
+                    "rotation": float(i % 360),
+                    "elements": [],
+                }
+                for i in range(self._OBJECTS_COUNT)
+            ],
+            "tracks": [
+                {
+                    "frame": 0,
+                    "label_id": label["id"],
+                    "group": 0,
+                    "source": "manual",
+                    "attributes": [
+                        {"spec_id": color_attr["id"], "value": ["white", "black"][i % 2]},
+                    ],
+                    "shapes": [
+                        {
+                            "type": "rectangle",
+                            "frame": frame,
+                            "points": _make_points(i + frame),
+                            "attributes": [
+                                {"spec_id": moving_attr["id"], "value": ["false", "true"][frame]},
+                            ],
+                            "occluded": False,
+                            "outside": bool(frame),
+                            "z_order": 0,
+                            "rotation": 0.0,
+                        }
+                        for frame in [0, 1]
+                    ],
+                    "elements": [],
+                }
+                for i in range(self._OBJECTS_COUNT)
+            ],
+            "tags": [],
+            "intervals": [],
+        }
+
+        response = put_method(admin_user, f"jobs/{job['id']}/annotations", annotations)
+        assert response.status_code == HTTPStatus.OK
+        assert compare_annotations(annotations, response.json()) == {}
+
+        assert self._rewrite_annotations_with_copy(request, job["id"]) == ["f8:"]
+
+        response = get_method(admin_user, f"jobs/{job['id']}/annotations")
+        assert response.status_code == HTTPStatus.OK
+        assert compare_annotations(annotations, response.json()) == {}
+
+        # the packed points are stored without precision loss
+        assert _get_all_points(response.json()) == _get_all_points(annotations)
+
+
 @pytest.mark.usefixtures("restore_db_per_function")
 class TestPatchJob:
     @pytest.fixture(scope="class")